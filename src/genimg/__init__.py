@@ -37,9 +37,10 @@ from genimg.core.prompt import (
     list_ollama_image_models,
     list_ollama_models,
     optimize_prompt,
+    optimize_prompts_batch,
     validate_prompt,
 )
-from genimg.core.reference import process_reference_image
+from genimg.core.reference import process_reference_image, process_reference_images
 from genimg.logging_config import configure_logging, set_verbosity
 from genimg.utils.cache import clear_cache, get_cache, get_cached_prompt
 from genimg.utils.exceptions import (
@@ -77,7 +78,9 @@ __all__ = [
     "list_ollama_image_models",
     "list_ollama_models",
     "optimize_prompt",
+    "optimize_prompts_batch",
     "process_reference_image",
+    "process_reference_images",
     "set_config",
     "set_verbosity",
     "validate_prompt",
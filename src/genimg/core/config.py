@@ -40,6 +40,8 @@ DEFAULT_DRAW_THINGS_PORT = 7859
 DEFAULT_DRAW_THINGS_PRESET = "z-image"
 DEFAULT_OPTIMIZE_FORMAT = "prose"
 KNOWN_OPTIMIZE_FORMATS = ("prose", "json")
+DEFAULT_REFERENCE_RESAMPLE = "auto"
+KNOWN_REFERENCE_RESAMPLE = ("auto", "lanczos", "bicubic", "bilinear")
 
 # Provider ids accepted by validate(); sourced from neutral provider_ids module.
 KNOWN_IMAGE_PROVIDERS = KNOWN_IMAGE_PROVIDER_IDS
@@ -90,6 +92,9 @@ class Config:
         1,
         1,
     )  # (width, height) ratio for output; images padded to match
+    # Reference downscale filter: "auto" picks bilinear/bicubic/lanczos by output size and
+    # scale; "lanczos", "bicubic" or "bilinear" always use that filter
+    reference_resample: str = DEFAULT_REFERENCE_RESAMPLE
 
     # Timeout Configuration (seconds)
     generation_timeout: int = 180  # 3 minutes
@@ -101,6 +106,10 @@ class Config:
     # Optimization output format: "prose" (structured labeled sections) or "json" (Ideogram 4 JSON caption, sent verbatim to the image model)
     optimize_format: str = DEFAULT_OPTIMIZE_FORMAT
 
+    # Fuzzy optimization cache: also key cached prompts on a normalized form (lowercase,
+    # collapsed whitespace, no trailing . ! ?) so near-duplicate prompts skip Ollama
+    fuzzy_cache_enabled: bool = True
+
     # Debug: log raw API payload/response with image data truncated
     debug_api: bool = False
 
@@ -120,7 +129,9 @@ class Config:
             GENIMG_OPTIMIZATION_MODEL: Optional default optimization model
             GENIMG_OPTIMIZE_THINKING: Optional enable LLM thinking during optimization (1/true/yes; default off)
             GENIMG_OPTIMIZE_FORMAT: Optional optimization output format ("prose" or "json"; default "prose")
+            GENIMG_FUZZY_CACHE: Optional reuse cached optimizations for near-duplicate prompts (default on)
             GENIMG_MIN_IMAGE_PIXELS: Optional minimum total pixels for reference images (default 2500)
+            GENIMG_REFERENCE_RESAMPLE: Optional reference downscale filter ("auto", "lanczos", "bicubic" or "bilinear"; default "auto")
 
         Returns:
             Config instance populated from environment
@@ -175,6 +186,8 @@ class Config:
         )
         optimize_format_env = os.getenv("GENIMG_OPTIMIZE_FORMAT", DEFAULT_OPTIMIZE_FORMAT).strip().lower()
         optimize_format = optimize_format_env if optimize_format_env in KNOWN_OPTIMIZE_FORMATS else DEFAULT_OPTIMIZE_FORMAT
+        reference_resample_env = os.getenv("GENIMG_REFERENCE_RESAMPLE", DEFAULT_REFERENCE_RESAMPLE).strip().lower()
+        reference_resample = reference_resample_env if reference_resample_env in KNOWN_REFERENCE_RESAMPLE else DEFAULT_REFERENCE_RESAMPLE
         default_image_provider = os.getenv("GENIMG_DEFAULT_IMAGE_PROVIDER", DEFAULT_IMAGE_PROVIDER)
         ollama_base_url = (
             os.getenv("OLLAMA_BASE_URL")
@@ -230,6 +243,8 @@ class Config:
             min_image_pixels=_int_env("GENIMG_MIN_IMAGE_PIXELS", 2500),
             optimize_thinking=optimize_thinking,
             optimize_format=optimize_format,
+            fuzzy_cache_enabled=_bool_env("GENIMG_FUZZY_CACHE", cls.fuzzy_cache_enabled),
+            reference_resample=reference_resample,
             debug_api=debug_api,
         )
 
@@ -262,6 +277,11 @@ class Config:
             raise ConfigurationError(
                 f"aspect_ratio components must be positive, got {self.aspect_ratio}."
             )
+        if self.reference_resample not in KNOWN_REFERENCE_RESAMPLE:
+            raise ConfigurationError(
+                f"Unknown reference_resample: {self.reference_resample!r}. "
+                f"Must be one of: {', '.join(KNOWN_REFERENCE_RESAMPLE)}."
+            )
 
         provider = self.default_image_provider
         if provider not in KNOWN_IMAGE_PROVIDERS:
@@ -10,7 +10,7 @@ from __future__ import annotations
 import io
 import json
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Literal
@@ -341,6 +341,8 @@ class GenerationResult:
     model_used: str  # Model that generated the image
     prompt_used: str  # Prompt that was used
     had_reference: bool  # Whether a reference image was used
+    # Encoded body exactly as the provider returned it (in ``_format``), when available
+    _raw_bytes: bytes | None = field(default=None, repr=False, compare=False)
 
     @property
     def format(self) -> str:
@@ -349,7 +351,12 @@ class GenerationResult:
 
     @property
     def image_data(self) -> bytes:
-        """Raw image bytes in the API's format (for backward compatibility)."""
+        """Raw image bytes in the API's format (for backward compatibility).
+
+        Returns the provider's original body when it was kept, otherwise re-encodes ``image``.
+        """
+        if self._raw_bytes is not None:
+            return self._raw_bytes
         buf = io.BytesIO()
         self.image.save(buf, format=self._format, **pillow_save_kwargs_for_format(self._format))
         return buf.getvalue()
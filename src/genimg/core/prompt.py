@@ -4,14 +4,18 @@ Prompt management and optimization for genimg.
 This module handles prompt validation, optimization via the Ollama HTTP API, and caching.
 """
 
+import atexit
+import functools
 import json
 import re
 import threading
 import time
 import warnings
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from genimg.core.config import DEFAULT_OLLAMA_BASE_URL, Config, get_config
 from genimg.core.prompts_loader import (
@@ -34,6 +38,24 @@ logger = get_logger(__name__)
 # Max prompt length for logging (large so prompts are effectively never truncated)
 _PROMPT_LOG_MAX = 50_000
 
+# (connect, read) timeouts in seconds for the check_ollama_available() probe.
+_AVAILABILITY_TIMEOUT = (0.5, 5)
+
+# Upper bound on concurrent /api/generate calls issued by optimize_prompts_batch().
+_BATCH_MAX_WORKERS = 4
+
+# Shared HTTP session: keeps the TCP connection to the Ollama server alive between
+# availability probes and /api/generate calls instead of reconnecting per request.
+# The pool holds one connection per optimize_prompts_batch() worker.
+_session = requests.Session()
+_session.mount(
+    "http://", HTTPAdapter(pool_connections=2, pool_maxsize=_BATCH_MAX_WORKERS, max_retries=0)
+)
+_session.mount(
+    "https://", HTTPAdapter(pool_connections=2, pool_maxsize=_BATCH_MAX_WORKERS, max_retries=0)
+)
+atexit.register(_session.close)
+
 # Loaded from prompts.yaml; kept as name for backward compatibility and tests
 OPTIMIZATION_TEMPLATE = get_optimization_template()
 
@@ -50,6 +72,43 @@ def _strip_ansi_terminal_sequences(text: str) -> str:
     return _ANSI_ESCAPE_RE.sub("", text)
 
 
+def _normalize_for_cache(prompt: str) -> str:
+    """Fuzzy cache form of a prompt: lowercase, whitespace collapsed, trailing . ! ? dropped."""
+    return " ".join(prompt.lower().split()).rstrip(".!?")
+
+
+def _cache_prompts(prompt: str, config: Config) -> tuple[str, ...]:
+    """
+    Prompt texts an optimization is looked up and stored under, exact form first.
+
+    With ``config.fuzzy_cache_enabled`` the normalized form is added, so prompts that differ
+    only in case, whitespace or trailing punctuation share one entry. The trade-off is
+    deliberate: such an edit reuses the earlier optimization instead of calling Ollama.
+    """
+    if not config.fuzzy_cache_enabled:
+        return (prompt,)
+    normalized = _normalize_for_cache(prompt)
+    if not normalized or normalized == prompt:
+        return (prompt,)
+    return (prompt, normalized)
+
+
+@functools.lru_cache(maxsize=16)
+def _split_template(template: str, placeholder: str) -> tuple[str, str]:
+    """
+    Split an optimization template around its single ``{placeholder}`` field.
+
+    ``{{``/``}}`` escapes are resolved the way ``str.format`` would, so filling the
+    template is plain concatenation instead of a format-string parse on every call.
+    """
+    head, _, tail = template.partition("{" + placeholder + "}")
+
+    def unescape(part: str) -> str:
+        return part.replace("{{", "{").replace("}}", "}")
+
+    return unescape(head), unescape(tail)
+
+
 def _format_json_caption(data: dict) -> str:
     """
     Return a normalized, pretty-printed structured JSON caption string.
@@ -158,10 +217,11 @@ def validate_prompt(prompt: str) -> None:
     Raises:
         ValidationError: If prompt is invalid
     """
-    if not prompt or not prompt.strip():
+    stripped_len = len(prompt.strip()) if prompt else 0
+    if not stripped_len:
         raise ValidationError("Prompt cannot be empty", field="prompt")
 
-    if len(prompt.strip()) < 3:
+    if stripped_len < 3:
         raise ValidationError(
             "Prompt is too short. Please provide at least 3 characters.",
             field="prompt",
@@ -179,15 +239,17 @@ def check_ollama_available(config: Config | None = None) -> bool:
     """
     Check if the Ollama HTTP API is reachable.
 
-    Uses GET ``/api/tags`` on the configured base URL (``OLLAMA_BASE_URL`` /
-    ``GENIMG_OLLAMA_BASE_URL``).
+    Uses GET ``/api/version`` on the configured base URL (``OLLAMA_BASE_URL`` /
+    ``GENIMG_OLLAMA_BASE_URL``): a constant-size reply, unlike ``/api/tags`` which
+    enumerates installed models. The connect timeout is short so an unreachable
+    server fails fast.
 
     Returns:
         True if Ollama responds successfully, False otherwise
     """
-    url = f"{_ollama_api_base(config)}/api/tags"
+    url = f"{_ollama_api_base(config)}/api/version"
     try:
-        response = requests.get(url, timeout=5)
+        response = _session.get(url, timeout=_AVAILABILITY_TIMEOUT)
         return response.status_code == 200
     except requests.RequestException:
         return False
@@ -207,7 +269,7 @@ def list_ollama_models(config: Config | None = None) -> list[str]:
 
     url = f"{_ollama_api_base(cfg)}/api/tags"
     try:
-        response = requests.get(url, timeout=5)
+        response = _session.get(url, timeout=5)
         if response.status_code != 200:
             return []
         data = response.json()
@@ -238,18 +300,24 @@ def list_ollama_models(config: Config | None = None) -> list[str]:
 _OLLAMA_IMAGE_NAMESPACES = ("x/", "my/")
 
 
-def list_ollama_image_models() -> list[str]:
+def list_ollama_image_models(installed: list[str] | None = None) -> list[str]:
     """
     List installed Ollama image-generation models.
 
     Filters all installed models to those whose name starts with a known
     image-generation namespace (``x/`` or ``my/``).
 
+    Args:
+        installed: Already fetched list_ollama_models() result to filter; if None,
+            queries Ollama.
+
     Returns:
         List of image model names. Returns empty list if Ollama is not available
         or no matching models are installed.
     """
-    return [m for m in list_ollama_models() if m.startswith(_OLLAMA_IMAGE_NAMESPACES)]
+    if installed is None:
+        installed = list_ollama_models()
+    return [m for m in installed if m.startswith(_OLLAMA_IMAGE_NAMESPACES)]
 
 
 def optimize_prompt_with_ollama(
@@ -261,6 +329,7 @@ def optimize_prompt_with_ollama(
     config: Config | None = None,
     cancel_check: Callable[[], bool] | None = None,
     force_refresh: bool = False,
+    _validated: bool = False,
 ) -> str:
     """
     Optimize a prompt using Ollama.
@@ -275,6 +344,7 @@ def optimize_prompt_with_ollama(
         cancel_check: Optional callable returning True to cancel; polled during the run.
             Should return quickly and not raise (exceptions are caught and ignored).
         force_refresh: If True, skip cache lookup and always run Ollama (result is still cached).
+        _validated: Internal; set by callers that already ran validate_prompt on ``prompt``.
 
     Returns:
         Optimized prompt
@@ -285,7 +355,8 @@ def optimize_prompt_with_ollama(
         RequestTimeoutError: If operation times out
         CancellationError: If cancel_check returned True
     """
-    validate_prompt(prompt)
+    if not _validated:
+        validate_prompt(prompt)
 
     config = config or get_config()
     if model is None:
@@ -299,19 +370,21 @@ def optimize_prompt_with_ollama(
     optimize_format = config.optimize_format
     # REQ-014: description-based path uses description_key (reference_hash or description id)
     description_key = reference_hash if reference_description else None
+    cache_prompts = _cache_prompts(prompt, config)
     if not force_refresh:
-        cached = cache.get(
-            prompt,
-            model,
-            reference_hash,
-            description_key=description_key,
-            use_thinking=use_thinking,
-            optimize_format=optimize_format,
-        )
-        if cached:
-            logger.debug("Cache hit for model=%s", model)
-            logger.info("Optimized (from cache) model=%s", model)
-            return cached
+        for cache_prompt in cache_prompts:
+            cached = cache.get(
+                cache_prompt,
+                model,
+                reference_hash,
+                description_key=description_key,
+                use_thinking=use_thinking,
+                optimize_format=optimize_format,
+            )
+            if cached:
+                logger.debug("Cache hit for model=%s", model)
+                logger.info("Optimized (from cache) model=%s", model)
+                return cached
 
     logger.debug("Cache miss for model=%s running Ollama timeout=%s", model, timeout)
     logger.info("Optimizing prompt model=%s", model)
@@ -328,26 +401,25 @@ def optimize_prompt_with_ollama(
         )
 
     # Prepare the optimization prompt: select template based on format and description presence
-    if optimize_format == "json":
-        if reference_description is not None:
-            system_part = get_optimization_template_with_description_json().format(
-                reference_description=reference_description
-            )
-        else:
-            reference_instruction = REFERENCE_IMAGE_INSTRUCTION if reference_hash else ""
-            system_part = get_optimization_template_json().format(
-                reference_image_instruction=reference_instruction
-            )
-    elif reference_description is not None:
-        system_part = get_optimization_template_with_description().format(
-            reference_description=reference_description
+    if reference_description is not None:
+        placeholder, fill = "reference_description", reference_description
+        template = (
+            get_optimization_template_with_description_json()
+            if optimize_format == "json"
+            else get_optimization_template_with_description()
         )
     else:
-        reference_instruction = REFERENCE_IMAGE_INSTRUCTION if reference_hash else ""
-        system_part = get_optimization_template().format(
-            reference_image_instruction=reference_instruction
+        placeholder = "reference_image_instruction"
+        fill = REFERENCE_IMAGE_INSTRUCTION if reference_hash else ""
+        template = (
+            get_optimization_template_json()
+            if optimize_format == "json"
+            else get_optimization_template()
         )
-    optimization_prompt = system_part + "\n\nOriginal prompt: " + prompt + "\n\nImproved prompt:"
+    head, tail = _split_template(template, placeholder)
+    optimization_prompt = "".join(
+        (head, fill, tail, "\n\nOriginal prompt: ", prompt, "\n\nImproved prompt:")
+    )
 
     start_time = time.time()
     if cancel_check is None:
@@ -357,15 +429,16 @@ def optimize_prompt_with_ollama(
         optimized = _post_process_ollama_response(raw, optimize_format)
         if not optimized:
             raise APIError("Ollama returned an empty response")
-        cache.set(
-            prompt,
-            model,
-            optimized,
-            reference_hash,
-            description_key=description_key,
-            use_thinking=use_thinking,
-            optimize_format=optimize_format,
-        )
+        for cache_prompt in cache_prompts:
+            cache.set(
+                cache_prompt,
+                model,
+                optimized,
+                reference_hash,
+                description_key=description_key,
+                use_thinking=use_thinking,
+                optimize_format=optimize_format,
+            )
         elapsed = time.time() - start_time
         logger.info("Optimized in %.1fs model=%s", elapsed, model)
         if log_prompts():
@@ -421,15 +494,16 @@ def optimize_prompt_with_ollama(
     optimized = _post_process_ollama_response(raw, optimize_format)
     if not optimized:
         raise APIError("Ollama returned an empty response")
-    cache.set(
-        prompt,
-        model,
-        optimized,
-        reference_hash,
-        description_key=description_key,
-        use_thinking=use_thinking,
-        optimize_format=optimize_format,
-    )
+    for cache_prompt in cache_prompts:
+        cache.set(
+            cache_prompt,
+            model,
+            optimized,
+            reference_hash,
+            description_key=description_key,
+            use_thinking=use_thinking,
+            optimize_format=optimize_format,
+        )
     elapsed = time.time() - start_time
     logger.info("Optimized in %.1fs model=%s", elapsed, model)
     if log_prompts():
@@ -495,7 +569,7 @@ def _call_ollama_generate_api(
     if optimize_format == "json":
         payload["format"] = "json"
     try:
-        response = requests.post(
+        response = _session.post(
             url,
             json=payload,
             timeout=timeout,
@@ -576,26 +650,8 @@ def optimize_prompt(
     if not config.optimization_enabled:
         return prompt
 
-    # Check cache if enabled
-    description_key = reference_hash if reference_description else None
-    if enable_cache:
-        cache = get_cache()
-        if model is None:
-            model = config.default_optimization_model
-        cached = cache.get(
-            prompt,
-            model,
-            reference_hash,
-            description_key=description_key,
-            use_thinking=config.optimize_thinking,
-            optimize_format=config.optimize_format,
-        )
-        if cached:
-            logger.debug("Cache hit for model=%s", model)
-            logger.info("Optimized (from cache) model=%s", model)
-            return cached
-
-    # Perform optimization (force_refresh when caller disabled cache for this request)
+    # The cache is consulted once, inside optimize_prompt_with_ollama
+    # (force_refresh skips it when the caller disabled cache for this request)
     return optimize_prompt_with_ollama(
         prompt,
         model,
@@ -604,4 +660,114 @@ def optimize_prompt(
         config=config,
         cancel_check=cancel_check,
         force_refresh=not enable_cache,
+        _validated=True,
     )
+
+
+def optimize_prompts_batch(
+    prompts: list[str],
+    model: str | None = None,
+    reference_hash: str | None = None,
+    reference_description: str | None = None,
+    enable_cache: bool = True,
+    config: Config | None = None,
+    cancel_check: Callable[[], bool] | None = None,
+    max_workers: int | None = None,
+) -> list[str]:
+    """
+    Optimize several prompts, sending the cache misses to Ollama concurrently.
+
+    Cached prompts are answered from the cache; the remaining distinct prompts are
+    optimized on a small thread pool sharing the module HTTP session, so K cold
+    prompts cost roughly one round-trip instead of K. The Ollama server only
+    processes them in parallel when ``OLLAMA_NUM_PARALLEL`` allows it; otherwise the
+    requests queue server-side and wall time approaches the sequential case.
+
+    Args:
+        prompts: Original prompts to optimize (duplicates are optimized once)
+        model: The optimization model to use (defaults to config)
+        reference_hash: Hash of reference image if present (applies to every prompt)
+        reference_description: When set, use description-based template (REQ-014)
+        enable_cache: Whether to use caching (default: True)
+        config: Optional config to use; if None, uses shared config from get_config()
+        cancel_check: Optional callable returning True to cancel; polled by every
+            in-flight optimization.
+        max_workers: Maximum concurrent Ollama requests (default and cap: 4, the size
+            of the shared session's connection pool)
+
+    Returns:
+        Optimized prompts in the same order as ``prompts``
+
+    Raises:
+        ValidationError: If any prompt is invalid
+        APIError: If optimization fails
+        RequestTimeoutError: If an operation times out
+        CancellationError: If cancel_check returned True
+    """
+    for prompt in prompts:
+        validate_prompt(prompt)
+
+    config = config or get_config()
+    if not config.optimization_enabled:
+        return list(prompts)
+    if model is None:
+        model = config.default_optimization_model
+
+    results: dict[str, str] = {}
+    misses: list[str] = []
+    description_key = reference_hash if reference_description else None
+    cache = get_cache()
+    for prompt in dict.fromkeys(prompts):
+        cached = None
+        if enable_cache:
+            for cache_prompt in _cache_prompts(prompt, config):
+                cached = cache.get(
+                    cache_prompt,
+                    model,
+                    reference_hash,
+                    description_key=description_key,
+                    use_thinking=config.optimize_thinking,
+                    optimize_format=config.optimize_format,
+                )
+                if cached:
+                    break
+        if cached:
+            results[prompt] = cached
+        else:
+            misses.append(prompt)
+
+    logger.info(
+        "Optimizing batch model=%s prompts=%d cached=%d",
+        model,
+        len(prompts),
+        len(results),
+    )
+    if misses:
+        # Never more workers than the session's connection pool holds.
+        workers = max(1, min(len(misses), max_workers or _BATCH_MAX_WORKERS, _BATCH_MAX_WORKERS))
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            # Cache was already consulted above, so each worker goes straight to Ollama.
+            futures = [
+                pool.submit(
+                    optimize_prompt_with_ollama,
+                    prompt,
+                    model,
+                    reference_hash,
+                    reference_description=reference_description,
+                    config=config,
+                    cancel_check=cancel_check,
+                    force_refresh=True,
+                    _validated=True,
+                )
+                for prompt in misses
+            ]
+            for prompt, future in zip(misses, futures, strict=True):
+                results[prompt] = future.result()
+        except BaseException:
+            # Fail fast: drop queued prompts and do not wait for in-flight requests.
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+
+    return [results[prompt] for prompt in prompts]
@@ -2,7 +2,9 @@
 Image generation providers: protocol, registry, and built-in implementations.
 
 Built-in providers are registered lazily on first get_registry() call to avoid
-circular imports with core.image_gen.
+circular imports with core.image_gen. Each is registered as a factory, so a
+provider's module (e.g. the gRPC stack behind Draw Things) is imported and the
+provider instantiated only when it is first requested.
 """
 
 from genimg.core.providers.base import ImageGenerationProvider as ImageGenerationProvider
@@ -24,18 +26,32 @@ KNOWN_IMAGE_PROVIDERS = KNOWN_IMAGE_PROVIDER_IDS
 _builtins_registered = False
 
 
+def _openrouter_provider() -> ImageGenerationProvider:
+    from genimg.core.providers.openrouter import OpenRouterProvider
+
+    return OpenRouterProvider()
+
+
+def _ollama_provider() -> ImageGenerationProvider:
+    from genimg.core.providers.ollama import OllamaProvider
+
+    return OllamaProvider()
+
+
+def _draw_things_provider() -> ImageGenerationProvider:
+    from genimg.core.providers.draw_things.provider import DrawThingsProvider
+
+    return DrawThingsProvider()
+
+
 def _register_builtins(reg: ProviderRegistry) -> None:
-    """Register built-in providers. Called once when registry is first used."""
+    """Register built-in provider factories. Called once when registry is first used."""
     global _builtins_registered
     if _builtins_registered:
         return
-    from genimg.core.providers.ollama import OllamaProvider
-    from genimg.core.providers.openrouter import OpenRouterProvider
-    from genimg.core.providers.draw_things.provider import DrawThingsProvider
-
-    reg.register(PROVIDER_OPENROUTER, OpenRouterProvider())
-    reg.register(PROVIDER_OLLAMA, OllamaProvider())
-    reg.register(PROVIDER_DRAW_THINGS, DrawThingsProvider())
+    reg.register_factory(PROVIDER_OPENROUTER, _openrouter_provider)
+    reg.register_factory(PROVIDER_OLLAMA, _ollama_provider)
+    reg.register_factory(PROVIDER_DRAW_THINGS, _draw_things_provider)
     _builtins_registered = True
 
 
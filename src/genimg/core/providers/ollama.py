@@ -5,14 +5,30 @@ Uses Ollama's /api/generate endpoint for image-capable models (e.g. flux, llava)
 Does not support reference images. Local deployment; no API key.
 """
 
-import base64
+import atexit
+import functools
 import io
+import re
 import threading
 import time
 from collections.abc import Callable
 
 import requests
 from PIL import Image
+from requests.adapters import HTTPAdapter
+
+try:
+    # Optional SIMD decoder (``pip install genimg[speedups]``); same API and errors.
+    from pybase64 import b64decode as _b64decode
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    from base64 import b64decode as _b64decode  # type: ignore[assignment,unused-ignore]
+
+try:
+    # Optional fast JSON parser (``genimg[speedups]``); parses bytes without a str decode.
+    # orjson.JSONDecodeError subclasses ValueError, so callers catch ValueError either way.
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    from json import loads as _json_loads  # type: ignore[assignment,unused-ignore]
 
 from genimg.core.config import DEFAULT_OLLAMA_BASE_URL, Config
 from genimg.core.image_gen import GenerationResult
@@ -27,12 +43,67 @@ from genimg.utils.exceptions import (
 
 logger = get_logger(__name__)
 
+# Read size for streamed binary image bodies.
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# How often a cancellable generate re-checks cancel_check while the worker runs.
+_CANCEL_POLL_INTERVAL = 0.05
+
+# Shared HTTP session so repeated generations reuse pooled keep-alive connections.
+# Usually one Ollama host; no transport retries (a retried generate would rerun the model).
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=0))
+_session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=0))
+atexit.register(_session.close)
+
+
+# Subtype of an image/* Content-Type, up to parameters (e.g. "image/PNG; q=1" -> "PNG").
+_IMAGE_SUBTYPE_RE = re.compile(r"\s*image/\s*([^;\s]*)", re.IGNORECASE)
+
 
 def _format_from_content_type(content_type: str) -> str:
     """Infer image format from Content-Type header (e.g. 'image/jpeg' -> 'jpeg')."""
-    if not content_type or not content_type.strip().lower().startswith("image/"):
-        return "png"
-    return content_type.split("/", 1)[1].lower().split(";")[0].strip() or "png"
+    match = _IMAGE_SUBTYPE_RE.match(content_type)
+    fmt = (match.group(1).lower() or "png") if match else "png"
+    # Non-standard "image/jpg" still names a JPEG (it must reach the no-re-encode path).
+    return "jpeg" if fmt == "jpg" else fmt
+
+
+@functools.lru_cache(maxsize=4)
+def _resolve_generate_url(base_url: str) -> str:
+    """Return the ``/api/generate`` URL for a configured base URL (memoized per string)."""
+    base = (base_url or DEFAULT_OLLAMA_BASE_URL).strip() or DEFAULT_OLLAMA_BASE_URL
+    return f"{base.rstrip('/')}/api/generate"
+
+
+def _read_body(response: requests.Response, abort: threading.Event | None = None) -> bytearray:
+    """Stream the response body into one buffer, preallocated from Content-Length.
+
+    Avoids the chunk list + join that ``response.content`` builds for large images.
+    The header is only a sizing hint: the buffer grows or is trimmed to what arrives.
+    When ``abort`` is set between chunks, stops reading and raises CancellationError.
+    """
+    try:
+        expected = int(response.headers.get("content-length") or 0)
+    except ValueError:
+        expected = 0
+    buf = bytearray(expected)
+    offset = 0
+    for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+        if abort is not None and abort.is_set():
+            raise CancellationError("Image generation was cancelled.")
+        end = offset + len(chunk)
+        buf[offset:end] = chunk
+        offset = end
+    del buf[offset:]
+    return buf
+
+
+def _open_image(image_data: bytes | bytearray) -> Image.Image:
+    """Decode image bytes once in place; avoids the extra full-pixel copy of ``.copy()``."""
+    image = Image.open(io.BytesIO(image_data))
+    image.load()
+    return image
 
 
 class OllamaProvider:
@@ -57,13 +128,15 @@ class OllamaProvider:
         model: str,
         prompt: str,
         generation_time: float,
+        abort: threading.Event | None = None,
     ) -> GenerationResult:
         """Parse Ollama response into GenerationResult. Raises APIError on failure."""
         content_type = response.headers.get("content-type", "")
         if content_type.startswith("image/"):
-            image_data = response.content
+            # One immutable copy of the streamed buffer serves both decoding and _raw_bytes.
+            data = bytes(_read_body(response, abort))
             fmt = _format_from_content_type(content_type)
-            pil_image = Image.open(io.BytesIO(image_data)).copy()
+            pil_image = _open_image(data)
             return GenerationResult(
                 image=pil_image,
                 _format=fmt,
@@ -71,9 +144,10 @@ class OllamaProvider:
                 model_used=model,
                 prompt_used=prompt,
                 had_reference=False,
+                _raw_bytes=data,
             )
         try:
-            data = response.json()
+            data = _json_loads(response.content)
         except ValueError as e:
             raise APIError(
                 f"Failed to parse Ollama response as JSON: {str(e)}",
@@ -91,13 +165,13 @@ class OllamaProvider:
                 response=str(data),
             )
         try:
-            image_data = base64.b64decode(image_b64)
+            image_data = _b64decode(image_b64, validate=False)
         except ValueError as e:
             raise APIError(
                 f"Invalid base64 image in Ollama response: {str(e)}",
                 response=str(data),
             ) from e
-        pil_image = Image.open(io.BytesIO(image_data)).copy()
+        pil_image = _open_image(image_data)
         return GenerationResult(
             image=pil_image,
             _format="png",
@@ -114,36 +188,46 @@ class OllamaProvider:
         timeout: int,
         model: str,
         prompt: str,
+        abort: threading.Event | None = None,
     ) -> GenerationResult:
-        """Perform HTTP POST and parse response. Maps status codes to exceptions."""
+        """Perform HTTP POST and parse response. Maps status codes to exceptions.
+
+        ``abort`` lets a cancelling caller stop a binary body mid-stream; the response
+        is closed either way so its connection is released rather than left reading.
+        """
         logger.debug("Ollama request url=%s model=%s timeout=%s", url, model, timeout)
         start_time = time.time()
-        response = requests.post(
+        # stream=True: binary image bodies are read straight into one buffer (_read_body).
+        response = _session.post(
             url,
             json=payload,
             timeout=timeout,
             headers={"Content-Type": "application/json"},
+            stream=True,
         )
-        generation_time = time.time() - start_time
-        logger.debug(
-            "Ollama response status=%s content_type=%s time=%.2fs",
-            response.status_code,
-            response.headers.get("content-type", ""),
-            generation_time,
-        )
-        if response.status_code >= 400:
-            raise APIError(
-                f"Ollama API error: {response.status_code}",
-                status_code=response.status_code,
-                response=response.text,
-            )
-        if response.status_code != 200:
-            raise APIError(
-                f"Ollama request failed with status {response.status_code}: {response.text}",
-                status_code=response.status_code,
-                response=response.text,
+        try:
+            generation_time = time.time() - start_time
+            logger.debug(
+                "Ollama response status=%s content_type=%s time=%.2fs",
+                response.status_code,
+                response.headers.get("content-type", ""),
+                generation_time,
             )
-        return self._parse_response(response, model, prompt, generation_time)
+            if response.status_code >= 400:
+                raise APIError(
+                    f"Ollama API error: {response.status_code}",
+                    status_code=response.status_code,
+                    response=response.text,
+                )
+            if response.status_code != 200:
+                raise APIError(
+                    f"Ollama request failed with status {response.status_code}: {response.text}",
+                    status_code=response.status_code,
+                    response=response.text,
+                )
+            return self._parse_response(response, model, prompt, generation_time, abort)
+        finally:
+            response.close()
 
     def generate(
         self,
@@ -168,10 +252,7 @@ class OllamaProvider:
                 field="reference_image",
             )
         self._validate_config(config)
-        base_url = (
-            config.ollama_base_url or DEFAULT_OLLAMA_BASE_URL
-        ).strip() or DEFAULT_OLLAMA_BASE_URL
-        url = f"{base_url.rstrip('/')}/api/generate"
+        url = _resolve_generate_url(config.ollama_base_url)
         payload = {"model": model, "prompt": prompt, "stream": False, "think": False}
 
         logger.info("Generating image via Ollama model=%s", model)
@@ -200,12 +281,17 @@ class OllamaProvider:
                     f"Network error during Ollama request: {str(e)}", original_error=e
                 ) from e
 
+        # Ollama sends nothing until generation finishes (stream: false), so the wait for
+        # headers cannot be split into short reads; it runs on a daemon thread while this
+        # thread polls cancel_check. On cancel, ``abort`` stops any body still streaming.
         result_holder: list[GenerationResult | None] = [None]
         exc_holder: list[BaseException | None] = [None]
+        done = threading.Event()
+        abort = threading.Event()
 
         def worker() -> None:
             try:
-                result_holder[0] = self._do_request(url, payload, timeout, model, prompt)
+                result_holder[0] = self._do_request(url, payload, timeout, model, prompt, abort)
             except requests.exceptions.Timeout as e:
                 err = RequestTimeoutError(
                     f"Request timed out after {timeout} seconds. "
@@ -224,16 +310,15 @@ class OllamaProvider:
                 )
             except BaseException as e:
                 exc_holder[0] = e
+            finally:
+                done.set()
 
         thread = threading.Thread(target=worker, daemon=True)
         thread.start()
-        poll_interval = 0.25
-        while True:
-            thread.join(timeout=poll_interval)
-            if not thread.is_alive():
-                break
+        while not done.wait(_CANCEL_POLL_INTERVAL):
             try:
                 if cancel_check():
+                    abort.set()
                     raise CancellationError("Image generation was cancelled.")
             except CancellationError:
                 raise
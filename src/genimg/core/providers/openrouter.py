@@ -5,16 +5,46 @@ Handles HTTP communication with the OpenRouter API for image generation
 with optional reference images.
 """
 
-import base64
+import atexit
 import io
 import json
+import logging
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
 from typing import Any
 
 import requests
 from PIL import Image
+from requests.adapters import HTTPAdapter
+
+try:
+    # Optional SIMD decoder (``pip install genimg[speedups]``); same API and errors.
+    from pybase64 import b64decode as _b64decode
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    from base64 import b64decode as _b64decode  # type: ignore[assignment,unused-ignore]
+
+try:
+    # Optional fast JSON codec (``genimg[speedups]``); parses bytes without a str decode.
+    # orjson.JSONDecodeError subclasses ValueError, so callers catch ValueError either way.
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps_body = orjson.dumps
+
+    def _json_dumps_for_log(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode()
+
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    _json_loads = json.loads  # type: ignore[assignment,unused-ignore]
+
+    def _json_dumps_body(obj: Any) -> bytes:  # type: ignore[misc,unused-ignore]
+        return json.dumps(obj, allow_nan=False).encode("utf-8")
+
+    def _json_dumps_for_log(obj: Any) -> str:
+        return json.dumps(obj, indent=2, default=str)
+
 
 from genimg.core.config import Config
 from genimg.core.image_gen import GenerationResult
@@ -33,28 +63,101 @@ logger = get_logger(__name__)
 _PROMPT_LOG_MAX = 50_000
 _DEBUG_TRUNCATE_THRESHOLD = 200
 _DEBUG_NEVER_TRUNCATE_KEYS = frozenset({"text", "message", "raw"})
+# How often a cancellable generate re-checks cancel_check while the worker runs.
+_CANCEL_POLL_INTERVAL = 0.05
+
+# Shared HTTP session so repeated generations reuse pooled keep-alive TLS connections.
+# No transport retries: a retried POST could bill a second generation.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+atexit.register(_session.close)
+
+
+def _truncated_placeholder(value: str, key: Any) -> str | None:
+    """Placeholder for a long base64/data URL string under ``key``, or None to keep it."""
+    if len(value) < _DEBUG_TRUNCATE_THRESHOLD or key in _DEBUG_NEVER_TRUNCATE_KEYS:
+        return None
+    if value.startswith("data:"):
+        return f"<data URL, {len(value)} chars>"
+    return f"<string, {len(value)} chars>"
 
 
 def _truncate_image_data_for_log(obj: Any, parent_key: str | None = None) -> Any:
-    """Recursively replace long base64/data URL strings with placeholders for safe logging."""
+    """Replace long base64/data URL strings with placeholders for safe logging.
+
+    ``obj`` is not modified: containers are copied only along paths that change, and
+    untouched subtrees (or ``obj`` itself, when nothing is truncated) are shared.
+    """
     if isinstance(obj, dict):
-        return {k: _truncate_image_data_for_log(v, k) for k, v in obj.items()}
+        out: dict[Any, Any] | None = None
+        for k, v in obj.items():
+            new = _truncate_image_data_for_log(v, k)
+            if new is not v:
+                if out is None:
+                    out = dict(obj)
+                out[k] = new
+        return obj if out is None else out
     if isinstance(obj, list):
-        return [_truncate_image_data_for_log(v, None) for v in obj]
-    if isinstance(obj, str) and len(obj) >= _DEBUG_TRUNCATE_THRESHOLD:
-        if parent_key in _DEBUG_NEVER_TRUNCATE_KEYS:
-            return obj
-        if obj.startswith("data:"):
-            return f"<data URL, {len(obj)} chars>"
-        return f"<string, {len(obj)} chars>"
+        out_list: list[Any] | None = None
+        for i, v in enumerate(obj):
+            new = _truncate_image_data_for_log(v, None)
+            if new is not v:
+                if out_list is None:
+                    out_list = list(obj)
+                out_list[i] = new
+        return obj if out_list is None else out_list
+    if isinstance(obj, str):
+        placeholder = _truncated_placeholder(obj, parent_key)
+        return obj if placeholder is None else placeholder
     return obj
 
 
+def _truncate_image_data_in_place(obj: Any) -> Any:
+    """Like _truncate_image_data_for_log, but rewrites ``obj`` in place with an iterative walk.
+
+    Only for structures the caller owns (e.g. a freshly parsed response body). Returns ``obj``.
+    """
+    if isinstance(obj, str):
+        return _truncated_placeholder(obj, None) or obj
+    if not isinstance(obj, dict | list):
+        return obj
+    stack: list[dict[Any, Any] | list[Any]] = [obj]
+    while stack:
+        container = stack.pop()
+        is_dict = isinstance(container, dict)
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, value in items:
+            if isinstance(value, dict | list):
+                stack.append(value)
+            elif isinstance(value, str):
+                placeholder = _truncated_placeholder(value, key if is_dict else None)
+                if placeholder is not None:
+                    container[key] = placeholder
+    return obj
+
+
+# Media types (parameters stripped, lowercased) seen in practice; others use the subtype.
+_FORMAT_BY_CONTENT_TYPE = {
+    "image/png": "png",
+    "image/jpeg": "jpeg",
+    "image/jpg": "jpeg",
+    "image/webp": "webp",
+    "image/gif": "gif",
+}
+
+
 def _format_from_content_type(content_type: str) -> str:
     """Infer image format from Content-Type header (e.g. 'image/jpeg' -> 'jpeg')."""
-    if not content_type or not content_type.strip().lower().startswith("image/"):
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    fmt = _FORMAT_BY_CONTENT_TYPE.get(media_type)
+    if fmt is not None:
+        return fmt
+    if not media_type.startswith("image/"):
         return "png"
-    return content_type.split("/", 1)[1].lower().split(";")[0].strip() or "png"
+    fmt = media_type[6:].strip() or "png"
+    # Non-standard "jpg" still names a JPEG (it must reach the no-re-encode path).
+    return "jpeg" if fmt == "jpg" else fmt
 
 
 def _image_url_from_part(part: Any) -> str:
@@ -119,6 +222,23 @@ class OpenRouterProvider:
 
     supports_reference_image: bool = True
 
+    def __init__(self) -> None:
+        # Last (base_url, api_key) -> (URL, read-only headers); one entry, so a key that is
+        # no longer in use is not kept alive.
+        self._endpoint: tuple[tuple[str, str], str, Mapping[str, str]] | None = None
+
+    def _resolve_endpoint(self, base_url: str, api_key: str) -> tuple[str, Mapping[str, str]]:
+        """Return the chat/completions URL and request headers, reused while unchanged."""
+        key = (base_url, api_key)
+        cached = self._endpoint
+        if cached is None or cached[0] != key:
+            headers = MappingProxyType(
+                {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+            )
+            cached = (key, f"{base_url}/chat/completions", headers)
+            self._endpoint = cached
+        return cached[1], cached[2]
+
     def _validate_config(self, config: Config, api_key_override: str | None) -> None:
         """Raise ValidationError if API key is missing."""
         api_key = api_key_override if api_key_override is not None else config.openrouter_api_key
@@ -152,24 +272,27 @@ class OpenRouterProvider:
         model: str,
         prompt: str,
         had_ref: bool,
+        generation_time: float,
     ) -> GenerationResult:
         """Parse OpenRouter response into GenerationResult. Raises APIError on failure."""
-        generation_time = time.time()  # caller sets start_time; we don't have it here
         content_type = response.headers.get("content-type", "")
         if content_type.startswith("image/"):
             image_data = response.content
             fmt = _format_from_content_type(content_type)
-            pil_image = Image.open(io.BytesIO(image_data)).copy()
+            # Decode in place (no .copy()) and keep the body so image_data needs no re-encode.
+            decoded = Image.open(io.BytesIO(image_data))
+            decoded.load()
             return GenerationResult(
-                image=pil_image,
+                image=decoded,
                 _format=fmt,
                 generation_time=generation_time,
                 model_used=model,
                 prompt_used=prompt,
                 had_reference=had_ref,
+                _raw_bytes=image_data,
             )
         try:
-            result = response.json()
+            result = _json_loads(response.content)
         except ValueError as e:
             raise APIError(
                 f"Failed to parse API response as JSON: {str(e)}",
@@ -183,13 +306,14 @@ class OpenRouterProvider:
                     response=str(result),
                 )
             if image_url.startswith("data:"):
-                base64_data = image_url.split(",", 1)[1]
-                image_data = base64.b64decode(base64_data)
+                # Slice after the first comma; index() raises ValueError if there is none.
+                image_data = _b64decode(image_url[image_url.index(",", 5) + 1 :])
             else:
-                image_data = base64.b64decode(image_url)
-            pil_image = Image.open(io.BytesIO(image_data)).copy()
+                image_data = _b64decode(image_url)
+            decoded = Image.open(io.BytesIO(image_data))
+            decoded.load()
             return GenerationResult(
-                image=pil_image,
+                image=decoded,
                 _format="png",
                 generation_time=generation_time,
                 model_used=model,
@@ -205,7 +329,7 @@ class OpenRouterProvider:
     def _do_request(
         self,
         url: str,
-        headers: dict[str, str],
+        headers: Mapping[str, str],
         payload: dict[str, Any],
         timeout: int,
         model: str,
@@ -215,14 +339,19 @@ class OpenRouterProvider:
     ) -> GenerationResult:
         """Perform HTTP POST and parse response. Maps status codes to exceptions."""
         logger.debug("API request url=%s model=%s timeout=%s", url, model, timeout)
+        # Truncating and serializing MB-sized payloads is wasted when INFO records are dropped.
+        debug = debug and logger.isEnabledFor(logging.INFO)
         if debug:
             truncated = _truncate_image_data_for_log(payload)
             logger.info(
                 "API request payload (image data truncated): %s",
-                json.dumps(truncated, indent=2, default=str),
+                _json_dumps_for_log(truncated),
             )
+        # Pre-serialized body: the base64 reference strings dominate request size, and
+        # orjson (when installed) encodes them far faster than requests' json= path.
+        body = _json_dumps_body(payload)
         start_time = time.time()
-        response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+        response = _session.post(url, headers=headers, data=body, timeout=timeout)
         generation_time = time.time() - start_time
         logger.debug(
             "API response status=%s content_type=%s time=%.2fs",
@@ -239,11 +368,11 @@ class OpenRouterProvider:
                 )
             else:
                 try:
-                    result = response.json()
-                    truncated = _truncate_image_data_for_log(result)
+                    # Freshly parsed and owned here, so truncate without copying.
+                    truncated = _truncate_image_data_in_place(_json_loads(response.content))
                     logger.info(
                         "API response (image data truncated): %s",
-                        json.dumps(truncated, indent=2, default=str),
+                        _json_dumps_for_log(truncated),
                     )
                 except ValueError:
                     text = response.text
@@ -283,16 +412,7 @@ class OpenRouterProvider:
             )
 
         had_ref = bool(reference_images_b64)
-        result = self._parse_response(response, model, prompt, had_ref)
-        # Replace generation_time with actual measured time
-        return GenerationResult(
-            image=result.image,
-            _format=result._format,
-            generation_time=generation_time,
-            model_used=result.model_used,
-            prompt_used=result.prompt_used,
-            had_reference=result.had_reference,
-        )
+        return self._parse_response(response, model, prompt, had_ref, generation_time)
 
     def generate(
         self,
@@ -310,11 +430,7 @@ class OpenRouterProvider:
         api_key = api_key_override if api_key_override is not None else config.openrouter_api_key
         debug_api = getattr(config, "debug_api", False)
 
-        url = f"{config.openrouter_base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
+        url, headers = self._resolve_endpoint(config.openrouter_base_url, api_key)
         payload = self._build_payload(prompt, model, reference_images_b64)
 
         has_ref = bool(reference_images_b64)
@@ -351,6 +467,7 @@ class OpenRouterProvider:
 
         result_holder: list[GenerationResult | None] = [None]
         exc_holder: list[BaseException | None] = [None]
+        done = threading.Event()
 
         def worker() -> None:
             try:
@@ -375,14 +492,12 @@ class OpenRouterProvider:
                 )
             except BaseException as e:
                 exc_holder[0] = e
+            finally:
+                done.set()
 
         thread = threading.Thread(target=worker, daemon=True)
         thread.start()
-        poll_interval = 0.25
-        while True:
-            thread.join(timeout=poll_interval)
-            if not thread.is_alive():
-                break
+        while not done.wait(_CANCEL_POLL_INTERVAL):
             try:
                 if cancel_check():
                     raise CancellationError("Image generation was cancelled.")
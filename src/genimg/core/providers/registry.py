@@ -2,28 +2,59 @@
 Registry for image generation providers.
 
 Maps provider ids (e.g. "openrouter", "ollama") to provider implementations.
+Implementations may be registered as zero-arg factories, instantiated on first get().
 """
 
+import threading
+from collections.abc import Callable
+
 from genimg.core.providers.base import ImageGenerationProvider
 
 
 class ProviderRegistry:
     """Registry mapping provider id to ImageGenerationProvider implementation."""
 
+    __slots__ = ("_impls", "_factories", "_lock")
+
     def __init__(self) -> None:
         self._impls: dict[str, ImageGenerationProvider] = {}
+        self._factories: dict[str, Callable[[], ImageGenerationProvider]] = {}
+        self._lock = threading.Lock()
 
     def register(self, provider_id: str, impl: ImageGenerationProvider) -> None:
         """Register a provider implementation. Idempotent for the same id."""
-        self._impls[provider_id] = impl
+        with self._lock:
+            self._factories.pop(provider_id, None)
+            self._impls[provider_id] = impl
+
+    def register_factory(
+        self, provider_id: str, factory: Callable[[], ImageGenerationProvider]
+    ) -> None:
+        """Register a zero-arg factory; it is called once, on the first get() for provider_id."""
+        with self._lock:
+            self._impls.pop(provider_id, None)
+            self._factories[provider_id] = factory
 
     def get(self, provider_id: str) -> ImageGenerationProvider | None:
         """Return the registered implementation for provider_id, or None if unknown."""
-        return self._impls.get(provider_id)
+        impl = self._impls.get(provider_id)
+        if impl is not None or provider_id not in self._factories:
+            return impl
+        with self._lock:
+            impl = self._impls.get(provider_id)
+            if impl is None:
+                factory = self._factories.get(provider_id)
+                if factory is None:
+                    return None
+                impl = factory()
+                self._impls[provider_id] = impl
+                del self._factories[provider_id]
+            return impl
 
     def provider_ids(self) -> list[str]:
-        """Return the list of registered provider ids."""
-        return list(self._impls.keys())
+        """Return the list of registered provider ids (including not yet instantiated ones)."""
+        with self._lock:
+            return list(dict.fromkeys([*self._impls, *self._factories]))
 
 
 _registry: ProviderRegistry | None = None
@@ -5,37 +5,104 @@ This module handles uploading, validating, processing, and encoding reference im
 for use with image generation APIs.
 """
 
-import base64
+import functools
 import hashlib
 import io
+import sys
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, cast
+from typing import IO, Any, cast
 
-from PIL import Image
+from PIL import ExifTags, Image, ImageOps
+
+try:
+    # Optional SIMD codec (``pip install genimg[speedups]``); same API and errors.
+    import pybase64 as _base64_codec
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    import base64 as _base64_codec  # type: ignore[no-redef,unused-ignore]
 
 from genimg.core.config import Config, get_config
 from genimg.core.image_gen import pillow_save_kwargs_for_format
 from genimg.logging_config import get_logger
 from genimg.utils.exceptions import ImageProcessingError, ValidationError
 
+# pybase64 is untyped; pin the aliases to the stdlib signatures they share.
+_b64decode: Callable[..., bytes] = _base64_codec.b64decode
+_b64encode: Callable[..., bytes] = _base64_codec.b64encode
+
 logger = get_logger(__name__)
 
 # Supported image formats
 SUPPORTED_FORMATS = {"PNG", "JPEG", "JPG", "WEBP", "HEIC", "HEIF"}
 
+# Large downscales first reduce() by an integer factor while the image stays at least
+# this many times the target size (Pillow's reducing_gap; 3.0 is visually lossless).
+_RESIZE_REDUCING_GAP = 3.0
+
+# Reference downscale filters by config name (Config.reference_resample).
+_RESAMPLE_FILTERS = {
+    "lanczos": Image.Resampling.LANCZOS,
+    "bicubic": Image.Resampling.BICUBIC,
+    "bilinear": Image.Resampling.BILINEAR,
+}
+# "auto" output-size tiers: below these pixel counts a cheaper kernel looks the same.
+_AUTO_BILINEAR_MAX_PIXELS = 64_000
+_AUTO_BICUBIC_MAX_PIXELS = 300_000
+
+# JPEG settings for encoded references: single-pass baseline 4:2:0 (no Huffman optimize
+# pass or progressive scans, which roughly double encode time for a few % of size).
+_JPEG_ENCODE_PARAMS: dict[str, Any] = {
+    "quality": 85,
+    "optimize": False,
+    "progressive": False,
+    "subsampling": 2,
+}
+
+# Read size when hashing files on Python < 3.11 (3.11+ uses hashlib.file_digest).
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# LRU of encoded in-memory references (bytes / data URLs) keyed by content digest and
+# resize settings: re-submitting the same upload skips decode, resize and JPEG encode.
+# File paths are cached separately by (path, mtime, size) in _process_reference_file.
+_BYTES_RESULTS: OrderedDict[tuple[str, str | None, int, int, tuple[int, int], str], str] = (
+    OrderedDict()
+)
+_BYTES_RESULTS_MAX = 16
+_bytes_results_lock = threading.Lock()
+
+# Worker threads for process_reference_images (Pillow releases the GIL while decoding,
+# resizing and encoding, so a few threads overlap well without oversubscribing cores).
+_BATCH_MAX_WORKERS = 4
+
+# Oversized JPEGs are DCT-scaled during decode (1/2, 1/4 or 1/8) to no less than this
+# many times the resize target, leaving the final downscale to resize_image.
+_DRAFT_REDUCING_GAP = 2.0
+
+
+# Magic-byte signatures keyed by first byte: (format, prefix). WEBP also needs "WEBP" at 8.
+_MAGIC_BY_FIRST_BYTE = {
+    0x89: ("PNG", b"\x89PNG\r\n\x1a\n"),
+    0xFF: ("JPEG", b"\xff\xd8"),
+    0x52: ("WEBP", b"RIFF"),
+}
+# HEIC starts with a box size, so it is matched on the ftyp box brand at offset 4.
+_HEIC_FTYP_BRANDS = frozenset({b"ftypheic", b"ftypheix", b"ftypmif1"})
+
 
 def _infer_format_from_magic(data: bytes) -> str | None:
     """Infer image format from magic bytes. Returns format name (e.g. PNG, JPEG) or None."""
     if len(data) < 12:
         return None
-    if data[:8] == b"\x89PNG\r\n\x1a\n":
-        return "PNG"
-    if data[:2] == b"\xff\xd8":
-        return "JPEG"
-    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
-        return "WEBP"
-    if data[4:12] in (b"ftypheic", b"ftypheix", b"ftypmif1"):
+    entry = _MAGIC_BY_FIRST_BYTE.get(data[0])
+    if entry is not None:
+        fmt, prefix = entry
+        if data.startswith(prefix) and (fmt != "WEBP" or data[8:12] == b"WEBP"):
+            return fmt
+    if data[4:12] in _HEIC_FTYP_BRANDS:
         return "HEIC"
     return None
 
@@ -67,7 +134,9 @@ def _parse_data_url(data_url: str) -> tuple[bytes, str | None]:
     if idx == -1:
         raise ValidationError("Data URL missing ;base64, part", field="image")
     try:
-        payload = base64.b64decode(data_url[idx + 8 :], validate=True)
+        # validate=True is pybase64's SIMD fast path (and stdlib's strict check); the str
+        # slice costs one memcpy, the same as encoding to bytes for a memoryview would.
+        payload = _b64decode(data_url[idx + 8 :], validate=True)
     except Exception as e:
         raise ValidationError(f"Invalid base64 in data URL: {e}") from e
     mime = data_url[5:idx].strip().lower()
@@ -75,9 +144,78 @@ def _parse_data_url(data_url: str) -> tuple[bytes, str | None]:
     return payload, _normalize_format(fmt) if fmt else None
 
 
+@functools.lru_cache(maxsize=1)
+def _ensure_heif_opener() -> bool:
+    """Register the HEIF/HEIC opener with Pillow on first use; False if unavailable."""
+    try:
+        from pillow_heif import register_heif_opener
+    except ImportError:  # pragma: no cover - HEIF support not available
+        return False
+    register_heif_opener()
+    return True
+
+
+def _fit_within_max_pixels(width: int, height: int, max_pixels: int) -> tuple[int, int]:
+    """Return (width, height) scaled down to at most max_pixels, aspect ratio preserved."""
+    current_pixels = width * height
+    if current_pixels <= max_pixels:
+        return width, height
+    scale_factor = (max_pixels / current_pixels) ** 0.5
+    min_dim = min(width, height)
+    if min_dim > 0:
+        scale_factor = max(scale_factor, 1.0 / min_dim)
+    return max(1, int(width * scale_factor)), max(1, int(height * scale_factor))
+
+
+def _draft_for_max_pixels(image: Image.Image, max_pixels: int | None) -> None:
+    """
+    Let the JPEG decoder scale down an unloaded image that exceeds max_pixels.
+
+    Picks the largest DCT scale (1/8, 1/4, 1/2) that keeps the decoded image at least
+    _DRAFT_REDUCING_GAP times the resize target and for which resize_image computes the
+    same target size as it would from the full-resolution image, so output is unchanged.
+    """
+    if max_pixels is None or image.format != "JPEG":
+        return
+    width, height = image.size
+    if width * height <= max_pixels:
+        return
+    target = _fit_within_max_pixels(width, height, max_pixels)
+    for scale in (8, 4, 2):
+        # Pillow decodes at the largest scale s <= min(width // w, height // h), rounding
+        # the decoded size up; request a size that selects exactly this scale.
+        request = (width // scale, height // scale)
+        if min(request) < 1:
+            continue
+        picked = min(width // request[0], height // request[1])
+        if picked < scale or (scale < 8 and picked >= 2 * scale):
+            continue
+        decoded = (-(-width // scale), -(-height // scale))
+        if (
+            decoded[0] >= target[0] * _DRAFT_REDUCING_GAP
+            and decoded[1] >= target[1] * _DRAFT_REDUCING_GAP
+            and _fit_within_max_pixels(*decoded, max_pixels) == target
+        ):
+            image.draft(image.mode, request)  # same mode: only the DCT scale changes
+            return
+
+
+def _apply_exif_orientation(image: Image.Image) -> Image.Image:
+    """
+    Rotate/flip a loaded image upright per its EXIF Orientation tag.
+
+    Camera and phone photos often store pixels sideways plus a tag; the tag does not
+    survive re-encoding, so it is applied here. Untagged images are returned as-is.
+    """
+    if image.getexif().get(ExifTags.Base.Orientation, 1) in (0, 1):
+        return image
+    return ImageOps.exif_transpose(image)
+
+
 def _load_image_source(
     source: str | Path | bytes,
     format_hint: str | None = None,
+    max_pixels: int | None = None,
 ) -> tuple[Image.Image, str]:
     """
     Load an image from a file path or in-memory bytes.
@@ -85,6 +223,7 @@ def _load_image_source(
     Args:
         source: Path to image file (str or Path) or raw image bytes
         format_hint: Optional format/MIME hint when source is bytes (e.g. 'PNG', 'image/jpeg')
+        max_pixels: Optional resize target; larger JPEGs are decoded at a reduced scale
 
     Returns:
         Tuple of (PIL Image, normalized format name for encoding)
@@ -106,23 +245,30 @@ def _load_image_source(
                 "Pass format_hint (e.g. 'PNG', 'JPEG', 'image/jpeg').",
                 field="image_format",
             )
+        _ensure_heif_opener()
         try:
-            try:
-                from pillow_heif import register_heif_opener
-
-                register_heif_opener()
-            except ImportError:
-                pass
             image = Image.open(io.BytesIO(source))
+            _draft_for_max_pixels(image, max_pixels)
             image.load()
-            return image, fmt
+            return _apply_exif_orientation(image), fmt
         except Exception as e:
             raise ImageProcessingError(f"Failed to load image from bytes: {str(e)}") from e
 
     path = Path(source)
+    suffix = _path_format(path)
+    image = load_image(str(path), max_pixels=max_pixels)
+    return image, suffix
+
+
+def _path_format(path: Path) -> str:
+    """Return the normalized format for an image file from its suffix, validating both."""
     if not path.exists():
         raise FileNotFoundError(f"Image file not found: {path}")
+    return _suffix_format(path)
+
 
+def _suffix_format(path: Path) -> str:
+    """Return the normalized format for an image path's suffix (no filesystem access)."""
     suffix = path.suffix.upper().lstrip(".")
     if suffix == "JPG":
         suffix = "JPEG"
@@ -132,8 +278,7 @@ def _load_image_source(
             f"Supported formats: {', '.join(sorted(SUPPORTED_FORMATS))}",
             field="image_format",
         )
-    image = load_image(str(path))
-    return image, suffix
+    return suffix
 
 
 def load_image_to_rgb_pil(
@@ -190,32 +335,28 @@ def validate_image_format(image_path: str) -> None:
         )
 
 
-def load_image(image_path: str) -> Image.Image:
+def load_image(image_path: str, max_pixels: int | None = None) -> Image.Image:
     """
     Load an image from file.
 
     Args:
         image_path: Path to the image file
+        max_pixels: Optional resize target. JPEGs larger than this are decoded at a
+            reduced DCT scale that stays at least twice the target size.
 
     Returns:
-        PIL Image object
+        PIL Image object, turned upright per its EXIF Orientation tag
 
     Raises:
         ImageProcessingError: If image cannot be loaded
     """
+    _ensure_heif_opener()
     try:
-        # Try to register HEIF opener if available
-        try:
-            from pillow_heif import register_heif_opener
-
-            register_heif_opener()
-        except ImportError:
-            pass  # HEIF support not available
-
         image = Image.open(image_path)
+        _draft_for_max_pixels(image, max_pixels)
         # Load the image data
         image.load()
-        return image
+        return _apply_exif_orientation(image)
 
     except Exception as e:
         raise ImageProcessingError(f"Failed to load image: {str(e)}", image_path=image_path) from e
@@ -260,6 +401,8 @@ def resize_image(
     max_pixels: int | None = None,
     min_pixels: int | None = None,
     aspect_ratio: tuple[int, int] | None = None,
+    resample: str | None = None,
+    config: Config | None = None,
 ) -> Image.Image:
     """
     Resize an image to fit within a maximum pixel count while maintaining aspect ratio,
@@ -274,6 +417,9 @@ def resize_image(
             If the image (after any resize) would have fewer pixels, ValidationError is raised.
         aspect_ratio: (width, height) ratio for final image; images are padded to match.
             If None, uses config default.
+        resample: Downscale filter name ("auto", "lanczos", "bicubic" or "bilinear").
+            If None, uses config default.
+        config: Config supplying any of the above left as None; if None, uses get_config().
 
     Returns:
         Resized (and optionally padded) PIL Image
@@ -281,21 +427,22 @@ def resize_image(
     Raises:
         ValidationError: If the resulting image would have fewer than min_pixels
     """
-    if max_pixels is None or min_pixels is None or aspect_ratio is None:
-        config = get_config()
+    if max_pixels is None or min_pixels is None or aspect_ratio is None or resample is None:
+        config = config or get_config()
         if max_pixels is None:
             max_pixels = config.max_image_pixels
         if min_pixels is None:
             min_pixels = config.min_image_pixels
         if aspect_ratio is None:
             aspect_ratio = config.aspect_ratio
+        if resample is None:
+            resample = config.reference_resample
 
     width, height = image.size
-    current_pixels = width * height
 
     # Compute target dimensions (within max_pixels, aspect ratio preserved)
-    if current_pixels <= max_pixels:
-        out_w, out_h = width, height
+    out_w, out_h = _fit_within_max_pixels(width, height, max_pixels)
+    if (out_w, out_h) == (width, height):
         logger.debug(
             "Reference image no resize needed dimensions=%dx%d max_pixels=%s",
             width,
@@ -303,12 +450,6 @@ def resize_image(
             max_pixels,
         )
     else:
-        scale_factor = (max_pixels / current_pixels) ** 0.5
-        min_dim = min(width, height)
-        if min_dim > 0:
-            scale_factor = max(scale_factor, 1.0 / min_dim)
-        out_w = max(1, int(width * scale_factor))
-        out_h = max(1, int(height * scale_factor))
         logger.debug(
             "Reference image resizing %dx%d -> %dx%d max_pixels=%s",
             width,
@@ -327,11 +468,40 @@ def resize_image(
         )
 
     if (out_w, out_h) != (width, height):
-        image = image.resize((out_w, out_h), Image.Resampling.LANCZOS)
+        image = image.resize(
+            (out_w, out_h),
+            _pick_resample_filter(resample, width, out_w, out_pixels),
+            reducing_gap=_RESIZE_REDUCING_GAP,
+        )
 
+    # Already at the target ratio (exact integer check): nothing to pad.
+    if out_w * aspect_ratio[1] == out_h * aspect_ratio[0]:
+        return image
     return _pad_to_aspect(image, aspect_ratio)
 
 
+def _pick_resample_filter(
+    resample: str, width: int, out_w: int, out_pixels: int
+) -> Image.Resampling:
+    """Return the Pillow filter for a downscale from width to out_w (out_pixels total)."""
+    if resample != "auto":
+        try:
+            return _RESAMPLE_FILTERS[resample]
+        except KeyError:
+            raise ValidationError(
+                f"Unknown resample filter: {resample!r}. "
+                f"Must be one of: auto, {', '.join(_RESAMPLE_FILTERS)}.",
+                field="resample",
+            ) from None
+    # Mild downscales (under 2x) and thumbnail-sized outputs: bilinear is several times
+    # cheaper and indistinguishable there. Lanczos is kept for large, detailed outputs.
+    if out_w * 2 > width or out_pixels < _AUTO_BILINEAR_MAX_PIXELS:
+        return Image.Resampling.BILINEAR
+    if out_pixels < _AUTO_BICUBIC_MAX_PIXELS:
+        return Image.Resampling.BICUBIC
+    return Image.Resampling.LANCZOS
+
+
 def convert_to_rgb(image: Image.Image) -> Image.Image:
     """
     Convert an image to RGB mode if it's not already.
@@ -345,17 +515,62 @@ def convert_to_rgb(image: Image.Image) -> Image.Image:
     if image.mode != "RGB":
         # Handle transparency by compositing on white background
         if image.mode == "RGBA" or image.mode == "LA":
-            background = Image.new("RGB", image.size, (255, 255, 255))
-            if image.mode == "RGBA":
-                background.paste(image, mask=image.split()[3])  # Use alpha channel
-            else:
-                background.paste(image, mask=image.split()[1])  # Use alpha channel
-            return background
+            # Fully opaque alpha (common for exported PNGs): dropping it is the composite.
+            if image.getchannel("A").getextrema() == (255, 255):
+                return image.convert("RGB")
+            return _composite_on_white(image)
         else:
             return image.convert("RGB")
     return image
 
 
+def _composite_on_white(image: Image.Image) -> Image.Image:
+    """
+    Alpha-composite an RGBA or LA image onto white as RGB in one vectorized pass.
+
+    Integer math with rounding, matching ``paste(image, mask=alpha)`` onto a white
+    canvas without splitting the image into per-band copies.
+    """
+    import numpy as np  # deferred so importing reference stays light
+
+    arr = np.asarray(image)
+    alpha = arr[..., -1:].astype(np.uint16)
+    # color * a + 255 * (255 - a) + 127 peaks at 65152, so uint16 never overflows; the
+    # in-place updates keep it to one working buffer the size of the colour bands.
+    acc = arr[..., :-1].astype(np.uint16)
+    acc *= alpha
+    np.subtract(255, alpha, out=alpha)
+    alpha *= 255
+    acc += alpha
+    acc += 127
+    acc //= 255
+    rgb = acc.astype(np.uint8)
+    if rgb.shape[-1] == 1:  # LA: replicate luminance into R, G, B
+        rgb = np.repeat(rgb, 3, axis=-1)
+    return Image.fromarray(rgb)
+
+
+class _Base64Sink:
+    """Write-only file object that base64-encodes what an encoder writes, as it arrives."""
+
+    def __init__(self) -> None:
+        self._out = bytearray()
+        self._pending = b""
+
+    def write(self, data: bytes) -> int:
+        chunk = self._pending + data if self._pending else bytes(data)
+        whole = len(chunk) - len(chunk) % 3
+        self._out += _b64encode(chunk[:whole])
+        self._pending = chunk[whole:]
+        return len(data)
+
+    def getvalue(self) -> str:
+        if self._pending:
+            self._out += _b64encode(self._pending)
+            self._pending = b""
+        return self._out.decode("ascii")
+
+
 def encode_image_base64(image: Image.Image, format: str = "PNG") -> str:
     """
     Encode a PIL Image to base64 string.
@@ -371,11 +586,17 @@ def encode_image_base64(image: Image.Image, format: str = "PNG") -> str:
         ImageProcessingError: If encoding fails
     """
     try:
+        if format.strip().upper() in ("JPEG", "JPG"):
+            # The JPEG encoder only appends, so its output is base64-encoded chunk by chunk
+            # and the full binary JPEG is never held in memory.
+            sink = _Base64Sink()
+            image.save(cast(IO[bytes], sink), format="JPEG", **_JPEG_ENCODE_PARAMS)
+            return sink.getvalue()
         buffer = io.BytesIO()
         image.save(buffer, format=format, **pillow_save_kwargs_for_format(format))
-        buffer.seek(0)
-        encoded = base64.b64encode(buffer.read()).decode("utf-8")
-        return encoded
+        # Encode straight from the BytesIO's internal buffer (no intermediate bytes copy).
+        with buffer.getbuffer() as view:
+            return _b64encode(view).decode("ascii")
 
     except Exception as e:
         raise ImageProcessingError(f"Failed to encode image: {str(e)}") from e
@@ -399,12 +620,19 @@ def get_image_hash(image_path: str) -> str:
     if not path.exists():
         raise FileNotFoundError(f"Image file not found: {image_path}")
 
+    # Stream the file through the digest instead of reading it into memory at once.
     with path.open("rb") as f:
-        return hashlib.sha256(f.read()).hexdigest()
+        if sys.version_info >= (3, 11):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        view = memoryview(bytearray(_HASH_CHUNK_SIZE))
+        while n := f.readinto(view):
+            digest.update(view[:n])
+        return digest.hexdigest()
 
 
 def process_reference_image(
-    source: str | Path | bytes,
+    source: str | Path | bytes | Image.Image,
     format_hint: str | None = None,
     max_pixels: int | None = None,
     config: Config | None = None,
@@ -414,19 +642,25 @@ def process_reference_image(
 
     This function:
     1. Validates the image format
-    2. Loads the image (from file path or in-memory bytes)
+    2. Loads the image (from file path or in-memory bytes; PIL images are used as-is)
     3. Resizes if needed (resize_image enforces config max/min pixels)
     4. Converts to RGB
     5. Encodes to base64
 
+    Results for file paths are cached while the file's mtime and size are unchanged;
+    bytes and data URLs are cached by content hash.
+
     Args:
-        source: Path to the image file (str or Path) or raw image bytes
+        source: Path to the image file (str or Path), raw image bytes, or an already
+            decoded PIL image (e.g. ``Image.fromarray(array)`` for NumPy pixels)
         format_hint: Optional format when source is bytes (e.g. 'PNG', 'JPEG', 'image/jpeg')
         max_pixels: Maximum number of pixels (defaults to config value)
-        config: Optional config for max_pixels and min_image_pixels; if None, uses get_config()
+        config: Optional config for max_pixels, min_image_pixels, aspect_ratio and
+            reference_resample; if None, uses get_config()
 
     Returns:
-        Tuple of (base64_encoded_image, image_hash)
+        Tuple of (base64_encoded_image, image_hash). For a PIL image the hash covers its
+        mode, size and pixel data rather than encoded file bytes.
 
     Raises:
         ValidationError: If image format is invalid or image has fewer pixels than config.min_image_pixels
@@ -436,9 +670,13 @@ def process_reference_image(
     cfg = config or get_config()
     if max_pixels is None:
         max_pixels = cfg.max_image_pixels
+    min_pixels = cfg.min_image_pixels
+    # Resolved from cfg once here: they are part of the file cache key and are passed to
+    # resize_image explicitly, so it never falls back to get_config().
+    aspect_ratio = cfg.aspect_ratio
+    resample = cfg.reference_resample
 
     logger.info("Processing reference image max_pixels=%s", max_pixels)
-    start_time = time.time()
 
     # Normalize data URL to bytes so loading and hashing work
     if isinstance(source, str) and source.strip().startswith("data:"):
@@ -446,20 +684,165 @@ def process_reference_image(
         if format_hint is None:
             format_hint = parsed_fmt
 
-    # Load image (validates format for path; for bytes uses format_hint or magic)
-    image, _loaded_fmt = _load_image_source(source, format_hint)
-
-    # Hash: from file or from bytes
     if isinstance(source, bytes):
-        image_hash = hashlib.sha256(source).hexdigest()
+        return _process_reference_bytes(
+            source, format_hint, max_pixels, min_pixels, aspect_ratio, resample
+        )
+    if isinstance(source, Image.Image):
+        return _process_reference(
+            source, format_hint, max_pixels, min_pixels, aspect_ratio, resample
+        )
+
+    # Files are cached by (path, mtime, size): reusing an unchanged reference skips the
+    # hash, decode, resize and JPEG encode.
+    path = Path(source)
+    try:
+        st = path.stat()
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Image file not found: {path}") from e
+    return _process_reference_file(
+        str(path), st.st_mtime_ns, st.st_size, max_pixels, min_pixels, aspect_ratio, resample
+    )
+
+
+def process_reference_images(
+    sources: list[str | Path | bytes | Image.Image],
+    max_pixels: int | None = None,
+    config: Config | None = None,
+    max_workers: int | None = None,
+) -> list[tuple[str, str]]:
+    """
+    Process several reference images concurrently.
+
+    Each source goes through process_reference_image on a small thread pool. Decode,
+    resize and JPEG encode run in Pillow's C code with the GIL released, so the images
+    overlap, and the workers share the per-file result cache.
+
+    Args:
+        sources: Paths (str or Path), raw image bytes, data URLs or PIL images
+        max_pixels: Maximum number of pixels (defaults to config value)
+        config: Optional config shared by every image; if None, uses get_config()
+        max_workers: Maximum images processed at once (default: up to 4)
+
+    Returns:
+        (base64_encoded_image, image_hash) tuples in the same order as ``sources``
+
+    Raises:
+        ValidationError: If any image format is invalid or an image is too small
+        ImageProcessingError: If processing any image fails
+        FileNotFoundError: If a path source doesn't exist
+    """
+    cfg = config or get_config()
+    if len(sources) <= 1:
+        return [process_reference_image(s, max_pixels=max_pixels, config=cfg) for s in sources]
+
+    workers = max(1, min(len(sources), max_workers or _BATCH_MAX_WORKERS))
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            pool.submit(process_reference_image, s, max_pixels=max_pixels, config=cfg)
+            for s in sources
+        ]
+        results = [future.result() for future in futures]
+    except BaseException:
+        # Fail fast: drop queued images and do not wait for the ones being processed.
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return results
+
+
+@functools.lru_cache(maxsize=16)
+def _process_reference_file(
+    path: str,
+    mtime_ns: int,
+    size: int,
+    max_pixels: int,
+    min_pixels: int,
+    aspect_ratio: tuple[int, int],
+    resample: str,
+) -> tuple[str, str]:
+    """Cached process_reference_image for files; mtime_ns and size only invalidate the key."""
+    return _process_reference(Path(path), None, max_pixels, min_pixels, aspect_ratio, resample)
+
+
+def _process_reference_bytes(
+    data: bytes,
+    format_hint: str | None,
+    max_pixels: int,
+    min_pixels: int,
+    aspect_ratio: tuple[int, int],
+    resample: str,
+) -> tuple[str, str]:
+    """process_reference_image for bytes, memoized in _BYTES_RESULTS by content hash."""
+    image_hash = hashlib.sha256(data).hexdigest()
+    key = (
+        image_hash,
+        _normalize_format(format_hint),
+        max_pixels,
+        min_pixels,
+        aspect_ratio,
+        resample,
+    )
+    with _bytes_results_lock:
+        encoded = _BYTES_RESULTS.get(key)
+        if encoded is not None:
+            _BYTES_RESULTS.move_to_end(key)
+            return encoded, image_hash
+    encoded, _ = _process_reference(
+        data, format_hint, max_pixels, min_pixels, aspect_ratio, resample, image_hash
+    )
+    with _bytes_results_lock:
+        _BYTES_RESULTS[key] = encoded
+        while len(_BYTES_RESULTS) > _BYTES_RESULTS_MAX:
+            _BYTES_RESULTS.popitem(last=False)
+    return encoded, image_hash
+
+
+def _process_reference(
+    source: Path | bytes | Image.Image,
+    format_hint: str | None,
+    max_pixels: int,
+    min_pixels: int,
+    aspect_ratio: tuple[int, int],
+    resample: str,
+    image_hash: str | None = None,
+) -> tuple[str, str]:
+    """Load, hash, resize, convert and encode one reference image (see process_reference_image)."""
+    start_time = time.time()
+
+    # Read a file once: the same bytes are hashed and decoded (same hash as get_image_hash).
+    # process_reference_image has already stat'ed the path, so there is no exists() check.
+    if isinstance(source, Path):
+        path = source
+        format_hint = _suffix_format(path)
+        try:
+            source = path.read_bytes()
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Image file not found: {path}") from e
+        except OSError as e:
+            raise ImageProcessingError(f"Failed to read image: {e}", image_path=str(path)) from e
+
+    if isinstance(source, Image.Image):
+        # Already decoded in-process: skip the encode/decode round trip and hash the pixels.
+        image = source
+        hasher = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode())
+        hasher.update(image.tobytes())
+        image_hash = hasher.hexdigest()
     else:
-        path = Path(source)
-        if not path.exists():
-            raise FileNotFoundError(f"Image file not found: {path}")
-        image_hash = get_image_hash(str(path))
+        # Load image (format from the file suffix, or format_hint / magic bytes)
+        image, _loaded_fmt = _load_image_source(source, format_hint, max_pixels=max_pixels)
+        if image_hash is None:
+            image_hash = hashlib.sha256(source).hexdigest()
 
     # Resize if needed (enforces max and min pixels from config)
-    image = resize_image(image, max_pixels=max_pixels, min_pixels=cfg.min_image_pixels)
+    image = resize_image(
+        image,
+        max_pixels=max_pixels,
+        min_pixels=min_pixels,
+        aspect_ratio=aspect_ratio,
+        resample=resample,
+    )
 
     # Convert to RGB
     image = convert_to_rgb(image)
@@ -506,7 +889,7 @@ def merge_jpeg_base64_references_horizontally(
                 field="reference_image",
             )
         try:
-            raw = base64.b64decode(enc, validate=True)
+            raw = _b64decode(enc, validate=True)
         except Exception as e:
             raise ImageProcessingError(
                 f"Invalid base64 for merged reference at index {i}: {e}"
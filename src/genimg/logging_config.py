@@ -15,11 +15,13 @@ GENIMG_VERBOSITY env (0/1/2) is read when CLI runs or when configure_logging
 is called; CLI flags override env.
 """
 
+import functools
 import logging
 import os
 
 LOG_FORMAT = "%(levelname)s [%(name)s] %(message)s"
 ROOT_LOGGER_NAME = "genimg"
+_ROOT_PREFIX = ROOT_LOGGER_NAME + "."
 
 _log_prompts: bool = False
 _configured: bool = False
@@ -98,11 +100,12 @@ def get_verbosity_from_env() -> int:
     return 0
 
 
+@functools.lru_cache(maxsize=256)
 def get_logger(name: str) -> logging.Logger:
-    """Return a child logger under genimg (e.g. genimg.core.image_gen)."""
-    if name.startswith(ROOT_LOGGER_NAME + ".") or name == ROOT_LOGGER_NAME:
+    """Return a child logger under genimg (e.g. genimg.core.image_gen). Memoized per name."""
+    if name.startswith(_ROOT_PREFIX) or name == ROOT_LOGGER_NAME:
         return logging.getLogger(name)
-    return logging.getLogger(ROOT_LOGGER_NAME + "." + name)
+    return logging.getLogger(_ROOT_PREFIX + name)
 
 
 __all__ = [
@@ -10,8 +10,12 @@ import argparse
 import atexit
 import base64
 import contextlib
+import functools
+import html
 import importlib.resources
+import itertools
 import json
+import logging
 import os
 import tempfile
 import threading
@@ -21,12 +25,14 @@ from pathlib import Path
 from typing import Any, cast
 
 import gradio as gr
+from PIL import Image
 
 from genimg import (
     APIError,
     CancellationError,
     Config,
     ConfigurationError,
+    GenerationResult,
     GenimgError,
     ImageProcessingError,
     NetworkError,
@@ -76,6 +82,11 @@ _UI_PROMPT_LOG_MAX = 50_000
 DEFAULT_UI_PORT = 7860
 DEFAULT_UI_HOST = "127.0.0.1"
 
+# Output JPG quality; overridable via GENIMG_UI_JPEG_QUALITY (1-95)
+DEFAULT_UI_JPEG_QUALITY = 90
+# Encoder options shared by every output save: baseline, no extra Huffman pass, 4:2:0 chroma
+_OUTPUT_JPEG_PARAMS: dict[str, Any] = {"optimize": False, "progressive": False, "subsampling": 2}
+
 # Base page title (browser tab); status prefixes are prepended during optimize/generate
 BASE_PAGE_TITLE = "genimg – AI image generation"
 
@@ -87,6 +98,15 @@ _GRADIO_IMAGE_PROVIDER_CHOICES: tuple[str, ...] = (
 )
 
 
+def _log_prompt(prompt: str) -> None:
+    """Log the prompt at INFO when prompt logging is on, truncated to _UI_PROMPT_LOG_MAX."""
+    if not (log_prompts() and logger.isEnabledFor(logging.INFO)):
+        return
+    if len(prompt) > _UI_PROMPT_LOG_MAX:
+        prompt = prompt[:_UI_PROMPT_LOG_MAX] + "..."
+    logger.info("Prompt: %s", prompt)
+
+
 def _page_title_with_status(status_tag: str) -> str:
     """Return full page title with optional status prefix for tab."""
     if not status_tag:
@@ -103,33 +123,43 @@ OPTIMIZED_FOR_REF_HASH = "ref_hash"
 OPTIMIZED_FOR_FORMAT = "format"
 DEFAULT_OPTIMIZED_FOR_FORMAT = "prose"
 
-# Temp paths we create (favicon, reference images, output JPGs); cleaned on process exit
+# Temp paths we create (favicon copy for zip installs, output JPGs); cleaned on process exit
 _temp_paths: set[str] = set()
-# Temp image paths (reference + output JPGs); cleaned each time Generate is clicked
+# Temp image paths (output JPGs); cleaned each time Generate is clicked
 _temp_image_paths: set[str] = set()
+# Guards both sets: handlers run on Gradio worker threads and cleanup iterates them
+_temp_paths_lock = threading.Lock()
 
 
 def _register_temp_path(path: str) -> None:
-    _temp_paths.add(path)
+    with _temp_paths_lock:
+        _temp_paths.add(path)
 
 
 def _register_temp_image_path(path: str) -> None:
-    """Register a temp path that is an image (ref or output); cleaned on each Generate click."""
-    _temp_paths.add(path)
-    _temp_image_paths.add(path)
+    """Register a temp path that is an image (output JPG); cleaned on each Generate click."""
+    with _temp_paths_lock:
+        _temp_paths.add(path)
+        _temp_image_paths.add(path)
 
 
 def _cleanup_temp_images() -> None:
-    """Delete all temp images (reference and output JPGs). Called when Generate is clicked."""
-    for path in _temp_image_paths:
+    """Delete all temp images (output JPGs). Called when Generate is clicked."""
+    # Take the paths under the lock, unlink outside it so file I/O never blocks registration.
+    with _temp_paths_lock:
+        paths = list(_temp_image_paths)
+        _temp_image_paths.clear()
+        _temp_paths.difference_update(paths)
+    for path in paths:
         with contextlib.suppress(OSError):
             Path(path).unlink(missing_ok=True)
-        _temp_paths.discard(path)
-    _temp_image_paths.clear()
 
 
 def _cleanup_temp_paths() -> None:
-    for path in _temp_paths:
+    with _temp_paths_lock:
+        paths = list(_temp_paths)
+        _temp_paths.clear()
+    for path in paths:
         with contextlib.suppress(OSError):
             Path(path).unlink(missing_ok=True)
 
@@ -179,29 +209,28 @@ def _normalize_prompt(s: str | None) -> str:
     return (s or "").strip()
 
 
-# Logo assets (package data); populated on first use
-_logo_favicon_path: str | None = None
-
-
+@functools.lru_cache(maxsize=1)
 def _get_favicon_path() -> str | None:
-    """Return a path to the package favicon for Gradio. Uses a temp copy so it works from zip installs."""
-    global _logo_favicon_path
-    if _logo_favicon_path is not None:
-        return _logo_favicon_path
+    """
+    Return a path to the package favicon for Gradio.
+
+    Regular installs use the packaged file in place; zip installs get a temp copy.
+    """
+    ref = (
+        importlib.resources.files("genimg")
+        .joinpath("assets")
+        .joinpath("logo")
+        .joinpath("favicon.ico")
+    )
+    if isinstance(ref, Path):
+        return str(ref) if ref.is_file() else None
     try:
-        ref = (
-            importlib.resources.files("genimg")
-            .joinpath("assets")
-            .joinpath("logo")
-            .joinpath("favicon.ico")
-        )
         data = ref.read_bytes()
     except FileNotFoundError:
         return None
     fd, path = tempfile.mkstemp(suffix=".ico", prefix="genimg_favicon_")
     os.close(fd)
     Path(path).write_bytes(data)
-    _logo_favicon_path = path
     _register_temp_path(path)
     return path
 
@@ -221,6 +250,7 @@ def get_logo_path(size: int = 128) -> str | None:
         return None
 
 
+@functools.lru_cache(maxsize=8)
 def _logo_data_url(size: int = 64) -> str | None:
     """Return a data URL for the logo PNG (for embedding in HTML), or None if missing."""
     try:
@@ -237,6 +267,61 @@ def _logo_data_url(size: int = 64) -> str | None:
     return f"data:image/png;base64,{b64}"
 
 
+@functools.lru_cache(maxsize=1)
+def _header_html() -> str:
+    """Return the page header HTML (logo + title); built once per process."""
+    logo_img = ""
+    logo_url = _logo_data_url(64)
+    if logo_url:
+        logo_img = f'<img src="{logo_url}" alt="genimg" width="64" height="64" style="display: block; flex-shrink: 0;" />'
+
+    return f"""
+<div style="display: flex; align-items: center; gap: 32px; margin: 16px 0 24px 0; flex-wrap: wrap;">
+    <div style="flex-shrink: 0; display: flex; align-items: center; gap: 16px;">
+        {logo_img}
+        <h1 style="
+            font-size: 2.5em;
+            font-weight: 700;
+            margin: 0;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            background-clip: text;
+            letter-spacing: -0.02em;
+        ">genimg</h1>
+    </div>
+    <div style="flex: 1; min-width: 200px;">
+        <p style="font-size: 1.1em; color: #6b7280; margin: 0 0 4px 0; font-weight: 400;">AI-powered image generation with intelligent prompt optimization</p>
+        <p style="font-size: 0.9em; color: #9ca3af; margin: 0; font-weight: 400;">Ollama prompt enhancement • OpenRouter/Draw Things image models • Reference images for supported providers</p>
+    </div>
+</div>
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _footer_html() -> str:
+    """Return the page footer HTML (version + repository link); built once per process."""
+    return f"""
+<div style="text-align: center; margin: 40px 0 20px 0; padding-top: 20px; border-top: 1px solid #e5e7eb;">
+    <p style="
+        font-size: 0.9em;
+        color: #9ca3af;
+        margin: 0 0 5px 0;
+    ">genimg v{__version__}</p>
+    <p style="
+        font-size: 0.9em;
+        color: #9ca3af;
+        margin: 0;
+    "><a href="https://github.com/codeprimate/genimg" target="_blank" style="
+        color: #667eea;
+        text-decoration: none;
+        font-weight: 500;
+        transition: color 0.2s;
+    " onmouseover="this.style.color='#764ba2'" onmouseout="this.style.color='#667eea'">GitHub Repository ↗</a></p>
+</div>
+"""
+
+
 def _provider_supports_reference(provider_id: str | None) -> bool:
     """Return whether provider supports reference images (unknown -> False)."""
     if provider_id is None or not isinstance(provider_id, str):
@@ -373,6 +458,23 @@ def _empty_lora_slots() -> tuple[list[str], list[float]]:
     )
 
 
+# Installed Ollama models are fetched at most once per window: the UI build and the
+# page-load dropdown refresh share one /api/tags result instead of querying Ollama each time.
+_OLLAMA_MODELS_TTL_SECONDS = 30
+
+
+def _installed_ollama_models(config: Config) -> list[str]:
+    """Installed Ollama models for config's server, cached for _OLLAMA_MODELS_TTL_SECONDS."""
+    epoch = int(time.monotonic() // _OLLAMA_MODELS_TTL_SECONDS)
+    return list(_installed_ollama_models_cached(config.ollama_base_url, epoch))
+
+
+@functools.lru_cache(maxsize=1)
+def _installed_ollama_models_cached(ollama_base_url: str, epoch: int) -> tuple[str, ...]:
+    """Cached list_ollama_models; ``epoch`` only expires the entry."""
+    return tuple(list_ollama_models(Config(ollama_base_url=ollama_base_url)))
+
+
 def _load_model_choices() -> tuple[
     list[str],
     list[str],
@@ -392,16 +494,17 @@ def _load_model_choices() -> tuple[
     config = Config.from_env()
     default_image_yaml = config.default_image_model
     if default_image_yaml and default_image_yaml not in image_models:
-        image_models = [default_image_yaml] + [m for m in image_models if m != default_image_yaml]
+        image_models.insert(0, default_image_yaml)
 
-    ollama_image_models: list[str] = list_ollama_image_models()
+    # One Ollama query serves both the image-model and optimization-model dropdowns.
+    installed = _installed_ollama_models(config)
+    ollama_image_models: list[str] = list_ollama_image_models(installed)
     default_ollama = config.default_ollama_image_model
-    if default_ollama and default_ollama not in ollama_image_models:
-        ollama_image_models = [default_ollama] + ollama_image_models
-    elif default_ollama and ollama_image_models:
-        ollama_image_models = [default_ollama] + [
-            m for m in ollama_image_models if m != default_ollama
-        ]
+    if default_ollama:
+        # Default first, whether or not it is installed
+        with contextlib.suppress(ValueError):
+            ollama_image_models.remove(default_ollama)
+        ollama_image_models.insert(0, default_ollama)
 
     default_image_provider: str = config.default_image_provider
 
@@ -415,7 +518,7 @@ def _load_model_choices() -> tuple[
     default_opt: str = config.default_optimization_model
     opt_models = merge_optimization_model_choices(
         default=default_opt,
-        installed=list_ollama_models(config),
+        installed=installed,
     )
 
     return (
@@ -475,76 +578,116 @@ def _exception_to_message(exc: BaseException) -> str:
     return str(exc) if exc.args else "An unexpected error occurred."
 
 
+# Status box styles: (icon, text/border color, background color).
+_STATUS_STYLES: dict[str, tuple[str, str, str]] = {
+    "success": ("✅", "#10b981", "#d1fae5"),  # green-500 / green-100
+    "error": ("❌", "#ef4444", "#fee2e2"),  # red-500 / red-100
+    "warning": ("⚠️", "#f59e0b", "#fef3c7"),  # amber-500 / amber-100
+    "info": ("ℹ️", "#3b82f6", "#dbeafe"),  # blue-500 / blue-100
+}
+
+# Status HTML up to the message, per status_type; built once since _format_status runs on
+# every streamed update. Inline styles for reliability across themes.
+_STATUS_PREFIX: dict[str, str] = {
+    status_type: f"""<div style="padding: 12px 16px; border-radius: 8px; background-color: {bg_color}; border-left: 4px solid {color}; margin: 8px 0;">
+    <span style="font-size: 16px; margin-right: 8px;">{icon}</span>
+    <span style="color: {color}; font-weight: 500;">"""
+    for status_type, (icon, color, bg_color) in _STATUS_STYLES.items()
+}
+_STATUS_SUFFIX = "</span>\n</div>"
+
+
 def _format_status(message: str, status_type: str = "info") -> str:
     """
     Format a status message with color and icon for better UX.
 
     Args:
-        message: The status message text.
+        message: The status message text (HTML-escaped, since it may carry exception text).
         status_type: One of "info", "success", "error", "warning", "idle".
 
     Returns:
-        HTML-formatted status string.
+        HTML-formatted status string ("" for idle).
     """
-    if status_type == "success":
-        icon = "✅"
-        color = "#10b981"  # green-500
-        bg_color = "#d1fae5"  # green-100
-    elif status_type == "error":
-        icon = "❌"
-        color = "#ef4444"  # red-500
-        bg_color = "#fee2e2"  # red-100
-    elif status_type == "warning":
-        icon = "⚠️"
-        color = "#f59e0b"  # amber-500
-        bg_color = "#fef3c7"  # amber-100
-    elif status_type == "info":
-        icon = "ℹ️"
-        color = "#3b82f6"  # blue-500
-        bg_color = "#dbeafe"  # blue-100
-    else:  # idle
+    prefix = _STATUS_PREFIX.get(status_type)
+    if prefix is None:  # idle
         return ""
-
-    # Use inline styles for reliability across themes
-    return f"""<div style="padding: 12px 16px; border-radius: 8px; background-color: {bg_color}; border-left: 4px solid {color}; margin: 8px 0;">
-    <span style="font-size: 16px; margin-right: 8px;">{icon}</span>
-    <span style="color: {color}; font-weight: 500;">{message}</span>
-</div>"""
+    return prefix + html.escape(message, quote=False) + _STATUS_SUFFIX
 
 
-def _reference_source_for_process(value: Any) -> str | None:
+def _reference_source_for_process(value: Any) -> str | Image.Image | None:
     """
     Get a source suitable for process_reference_image from Gradio Image value.
 
     Gradio can return: path str, dict with 'path' or 'url' (data URL), or PIL Image.
-    We normalize to a path (str), data URL (str), or PIL for temp-file save.
+    We normalize to a path (str) or data URL (str); PIL images are passed through as-is
+    (process_reference_image and the describe functions take them without a temp file).
     """
+    # Most common first: the reference component uses type="filepath"
+    if isinstance(value, str):
+        return value if value.strip() else None
     if value is None:
         return None
-    # PIL Image (e.g. Gradio type="pil" or some versions): save to temp file and return path
-    if hasattr(value, "size") and hasattr(value, "save"):
-        try:
-            fd, path = tempfile.mkstemp(suffix=".png", prefix="genimg_ref_")
-            os.close(fd)
-            value.save(path, "PNG")
-            _register_temp_image_path(path)
-            return path
-        except Exception:
-            return None
-    if isinstance(value, str) and not value.strip():
-        return None
     if isinstance(value, dict):
-        path_val = value.get("path")
-        url_val = value.get("url")
-        if path_val and isinstance(path_val, str) and path_val.strip():
-            return cast(str, path_val)
-        if url_val and isinstance(url_val, str) and url_val.strip():
-            return cast(str, url_val)  # data URL or blob; reference module handles data URL
+        for key in ("path", "url"):  # url: data URL or blob; reference module handles data URL
+            val = value.get(key)
+            if isinstance(val, str) and val.strip():
+                return val
         return None
-    # str path or Path
+    if isinstance(value, Image.Image):
+        return value
+    # Path
     return str(value)
 
 
+# Output JPGs go to the temp dir (resolved once) as <unix time>_<n>.jpg: the counter keeps
+# generations finishing in the same second from overwriting each other's files.
+_OUTPUT_DIR = Path(tempfile.gettempdir())
+_output_counter = itertools.count(1)
+
+
+def _output_jpeg_quality() -> int:
+    """JPEG quality for UI output: GENIMG_UI_JPEG_QUALITY when valid (1-95), else 90."""
+    try:
+        quality = int(os.getenv("GENIMG_UI_JPEG_QUALITY", str(DEFAULT_UI_JPEG_QUALITY)))
+    except ValueError:
+        return DEFAULT_UI_JPEG_QUALITY
+    return quality if 1 <= quality <= 95 else DEFAULT_UI_JPEG_QUALITY
+
+
+def _save_output_jpeg(result: GenerationResult) -> str:
+    """
+    Save a generation result as the UI output JPG (timestamp filename).
+
+    JPEG results are written as the provider returned them instead of being decoded and
+    re-encoded; other formats go through Pillow's encoder (libjpeg-turbo in its wheels).
+    The file is created exclusively, so another process's output is never overwritten.
+
+    Returns:
+        Path of the temp file, registered for cleanup on the next Generate.
+    """
+    while True:
+        out_path = _OUTPUT_DIR / f"{int(time.time())}_{next(_output_counter)}.jpg"
+        try:
+            out_file = out_path.open("xb")
+        except FileExistsError:
+            continue
+        break
+    try:
+        with out_file:
+            if result.format == "jpeg":
+                out_file.write(result.image_data)
+            else:
+                result.image.save(
+                    out_file, "JPEG", quality=_output_jpeg_quality(), **_OUTPUT_JPEG_PARAMS
+                )
+    except BaseException:
+        # Not registered yet, so no cleanup would ever see an empty or partial file.
+        out_path.unlink(missing_ok=True)
+        raise
+    _register_temp_image_path(str(out_path))
+    return str(out_path)
+
+
 def _run_generate(
     prompt: str,
     optimize: bool,
@@ -632,13 +775,9 @@ def _run_generate(
     ) as e:
         return None, None, _exception_to_message(e)
 
-    # Output: JPG quality 90, timestamp filename (per plan)
     elapsed = result.generation_time
-    ts = int(time.time())
-    out_path = Path(tempfile.gettempdir()) / f"{ts}.jpg"
-    result.image.save(str(out_path), "JPEG", quality=90)
-    _register_temp_image_path(str(out_path))
-    return f"Done in {elapsed:.1f}s", str(out_path), f"Done in {elapsed:.1f}s"
+    out_path = _save_output_jpeg(result)
+    return f"Done in {elapsed:.1f}s", out_path, f"Done in {elapsed:.1f}s"
 
 
 def _run_generate_stream(
@@ -682,11 +821,7 @@ def _run_generate_stream(
         )
         return
     logger.info("Generate requested")
-    if log_prompts():
-        truncated = (
-            prompt if len(prompt) <= _UI_PROMPT_LOG_MAX else prompt[:_UI_PROMPT_LOG_MAX] + "..."
-        )
-        logger.info("Prompt: %s", truncated)
+    _log_prompt(prompt)
     config = Config.from_env()
     provider_eff = _effective_provider_for_ui(provider, config)
     config.optimize_thinking = optimize_thinking
@@ -737,29 +872,6 @@ def _run_generate_stream(
                 _notification_body("Generation failed: ", _exception_to_message(e)),
             )
             return
-    description: str | None = None
-    if use_description and ref_source is not None:
-        try:
-            description = get_description(
-                ref_source,
-                ref_hash,
-                method=description_method,
-                verbosity=description_verbosity or "detailed",
-            )
-            if provider_eff == PROVIDER_OLLAMA:
-                unload_describe_models()
-        except Exception as e:
-            yield (
-                _format_status(_exception_to_message(e), "error"),
-                None,
-                True,
-                False,
-                box_value,
-                state,
-                BASE_PAGE_TITLE,
-                _notification_body("Generation failed: ", _exception_to_message(e)),
-            )
-            return
     ref_b64_to_send = _reference_b64_for_generate(provider_eff, ref_b64)
     # Use optimized box only if it was produced for this exact (prompt, ref_hash).
     # Normalize prompt so whitespace differences don't trigger re-optimize and overwrite user edits.
@@ -768,53 +880,35 @@ def _run_generate_stream(
         and state.get(OPTIMIZED_FOR_REF_HASH) == ref_hash
         and (state.get(OPTIMIZED_FOR_FORMAT) or DEFAULT_OPTIMIZED_FOR_FORMAT) == optimize_format
     )
-    if has_box_content and state_matches and optimize:
+    if optimize and has_box_content and state_matches:
         # Use current box content (may be user-edited); do not run optimize or overwrite box
         effective_prompt = box_value
-    elif has_box_content and not state_matches and optimize:
-        # Prompt or ref changed; re-optimize for current prompt
-        config.optimization_enabled = True
-        yield (
-            _format_status("Optimizing…", "info"),
-            None,
-            False,
-            True,
-            box_value,
-            state,
-            _page_title_with_status("[Optimizing]"),
-            "",
-        )
-        try:
-            effective_prompt = optimize_prompt(
-                prompt,
-                model=optimization_model,
-                reference_hash=ref_hash,
-                reference_description=description if (use_description and description) else None,
-                config=config,
-                cancel_check=cancel_check,
-            )
-            box_value = effective_prompt
-            state = {
-                OPTIMIZED_FOR_PROMPT: _normalize_prompt(prompt),
-                OPTIMIZED_FOR_REF_HASH: ref_hash,
-                OPTIMIZED_FOR_FORMAT: optimize_format,
-            }
-        except (ValidationError, APIError, RequestTimeoutError, CancellationError) as e:
-            yield (
-                _format_status(_exception_to_message(e), "error"),
-                None,
-                True,
-                False,
-                box_value,
-                state,
-                BASE_PAGE_TITLE,
-                _generate_notify_msg_on_error(e),
-            )
-            return
-    elif has_box_content and not state_matches and not optimize:
-        # Stale box from different prompt/ref; user has optimization off so use raw prompt
-        effective_prompt = prompt
     elif optimize:
+        # Box empty, or produced for another prompt/ref/format: optimize for the current one.
+        # The description only feeds optimization, so it is computed on this path alone.
+        description: str | None = None
+        if use_description and ref_source is not None:
+            try:
+                description = get_description(
+                    ref_source,
+                    ref_hash,
+                    method=description_method,
+                    verbosity=description_verbosity or "detailed",
+                )
+                if provider_eff == PROVIDER_OLLAMA:
+                    unload_describe_models()
+            except Exception as e:
+                yield (
+                    _format_status(_exception_to_message(e), "error"),
+                    None,
+                    True,
+                    False,
+                    box_value,
+                    state,
+                    BASE_PAGE_TITLE,
+                    _notification_body("Generation failed: ", _exception_to_message(e)),
+                )
+                return
         config.optimization_enabled = True
         yield (
             _format_status("Optimizing…", "info"),
@@ -854,6 +948,7 @@ def _run_generate_stream(
             )
             return
     else:
+        # Optimization off: use the raw prompt (any stale box content is left untouched)
         effective_prompt = prompt
     yield (
         _format_status("Generating…", "info"),
@@ -904,13 +999,10 @@ def _run_generate_stream(
         )
         return
     elapsed = result.generation_time
-    ts = int(time.time())
-    out_path = Path(tempfile.gettempdir()) / f"{ts}.jpg"
-    result.image.save(str(out_path), "JPEG", quality=90)
-    _register_temp_image_path(str(out_path))
+    out_path = _save_output_jpeg(result)
     yield (
         _format_status(f"Done in {elapsed:.1f}s", "success"),
-        str(out_path),
+        out_path,
         True,
         False,
         gr.skip(),  # preserve user edits made during generation
@@ -920,6 +1012,20 @@ def _run_generate_stream(
     )
 
 
+# Description method dropdown label -> describe_image/get_description method
+_DESCRIPTION_METHOD_BY_UI = {"Prose (Florence)": "prose", "Tags (JoyTag)": "tags"}
+
+# Button enable/disable updates, built once and reused on every streamed yield. Safe to
+# share: Gradio only pops "value" and None-valued keys from update dicts, and these have neither.
+_UPDATE_ENABLED = gr.update(interactive=True)
+_UPDATE_DISABLED = gr.update(interactive=False)
+
+
+def _interactive_update(enabled: bool) -> Any:
+    """Return the shared gr.update(interactive=enabled)."""
+    return _UPDATE_ENABLED if enabled else _UPDATE_DISABLED
+
+
 def _generate_click_handler(
     p: str,
     opt: bool,
@@ -946,8 +1052,7 @@ def _generate_click_handler(
     _cleanup_temp_images()
     _cancel_event.clear()
     state = _coerce_optimized_for_state(optimized_for_state)
-    ui_to_method = {"Prose (Florence)": "prose", "Tags (JoyTag)": "tags"}
-    description_method = ui_to_method.get(desc_method_ui, "prose")
+    description_method = _DESCRIPTION_METHOD_BY_UI.get(desc_method_ui, "prose")
     optimize_format = _ui_optimize_format(optimize_format_ui)
     try:
         for (
@@ -967,7 +1072,7 @@ def _generate_click_handler(
             provider,
             mod,
             optimization_model=opt_mod,
-            cancel_check=lambda: _cancel_event.is_set(),
+            cancel_check=_cancel_event.is_set,
             optimized_for_state=state,
             use_description=use_description,
             description_method=description_method,
@@ -981,8 +1086,8 @@ def _generate_click_handler(
             yield (
                 status_msg,
                 img_path,
-                gr.update(interactive=gen_on),
-                gr.update(interactive=stop_on),
+                _interactive_update(gen_on),
+                _interactive_update(stop_on),
                 box_val,
                 state,
                 page_title,
@@ -992,8 +1097,8 @@ def _generate_click_handler(
         yield (
             _format_status(_exception_to_message(e), "error"),
             None,
-            gr.update(interactive=True),
-            gr.update(interactive=False),
+            _UPDATE_ENABLED,
+            _UPDATE_DISABLED,
             opt_text,
             state,
             BASE_PAGE_TITLE,
@@ -1003,8 +1108,8 @@ def _generate_click_handler(
         yield (
             _format_status(str(e), "error"),
             None,
-            gr.update(interactive=True),
-            gr.update(interactive=False),
+            _UPDATE_ENABLED,
+            _UPDATE_DISABLED,
             opt_text,
             state,
             BASE_PAGE_TITLE,
@@ -1028,8 +1133,7 @@ def _optimize_click_handler(
     logger.debug("Optimize clicked")
     _cancel_event.clear()
     state = _coerce_optimized_for_state(optimized_for_state)
-    ui_to_method = {"Prose (Florence)": "prose", "Tags (JoyTag)": "tags"}
-    description_method = ui_to_method.get(desc_method_ui, "prose")
+    description_method = _DESCRIPTION_METHOD_BY_UI.get(desc_method_ui, "prose")
     optimize_format = _ui_optimize_format(optimize_format_ui)
     try:
         for (
@@ -1045,7 +1149,7 @@ def _optimize_click_handler(
             p,
             ref,
             optimization_model=opt_mod,
-            cancel_check=lambda: _cancel_event.is_set(),
+            cancel_check=_cancel_event.is_set,
             use_description=use_description,
             description_method=description_method,
             description_verbosity=desc_verbosity or "detailed",
@@ -1058,9 +1162,9 @@ def _optimize_click_handler(
             yield (
                 status_msg,
                 opt_text,
-                gr.update(interactive=opt_on),
-                gr.update(interactive=stop_on),
-                gr.update(interactive=gen_on),
+                _interactive_update(opt_on),
+                _interactive_update(stop_on),
+                _interactive_update(gen_on),
                 state,
                 page_title,
                 notify_msg,
@@ -1069,9 +1173,9 @@ def _optimize_click_handler(
         yield (
             _format_status(_exception_to_message(e), "error"),
             "",
-            gr.update(interactive=True),
-            gr.update(interactive=False),
-            gr.update(interactive=True),
+            _UPDATE_ENABLED,
+            _UPDATE_DISABLED,
+            _UPDATE_ENABLED,
             state,
             BASE_PAGE_TITLE,
             _optimize_notify_msg_on_error(e),
@@ -1080,9 +1184,9 @@ def _optimize_click_handler(
         yield (
             _format_status(str(e), "error"),
             "",
-            gr.update(interactive=True),
-            gr.update(interactive=False),
-            gr.update(interactive=True),
+            _UPDATE_ENABLED,
+            _UPDATE_DISABLED,
+            _UPDATE_ENABLED,
             state,
             BASE_PAGE_TITLE,
             _notification_body("Optimization failed: ", str(e)),
@@ -1094,8 +1198,8 @@ def _stop_click_handler() -> tuple[Any, Any, Any, str]:
     _cancel_event.set()
     return (
         _format_status("Stopped.", "info"),
-        gr.update(interactive=True),
-        gr.update(interactive=False),
+        _UPDATE_ENABLED,
+        _UPDATE_DISABLED,
         BASE_PAGE_TITLE,
     )
 
@@ -1103,7 +1207,7 @@ def _stop_click_handler() -> tuple[Any, Any, Any, str]:
 def _prompt_change_handler(text: str) -> tuple[Any, Any]:
     """Prompt change: enable Generate and Optimize when prompt is non-empty."""
     enabled = bool(text and text.strip())
-    return gr.update(interactive=enabled), gr.update(interactive=enabled)
+    return _interactive_update(enabled), _interactive_update(enabled)
 
 
 def _optimize_checkbox_handler(enabled: bool) -> Any:
@@ -1142,11 +1246,7 @@ def _run_optimize_only_stream(
         )
         return
     logger.info("Optimize requested")
-    if log_prompts():
-        truncated = (
-            prompt if len(prompt) <= _UI_PROMPT_LOG_MAX else prompt[:_UI_PROMPT_LOG_MAX] + "..."
-        )
-        logger.info("Prompt: %s", truncated)
+    _log_prompt(prompt)
     config = Config.from_env()
     provider_eff = _effective_provider_for_ui(provider, config)
     config.optimize_thinking = optimize_thinking
@@ -1270,6 +1370,7 @@ def _run_optimize_only_stream(
 
 # Message shown when provider does not support reference images
 _REF_NOT_SUPPORTED_MSG = "Reference images are not supported for this provider."
+_REF_NOT_SUPPORTED_HTML = _format_status(_REF_NOT_SUPPORTED_MSG, "warning")
 
 
 def _build_blocks() -> gr.Blocks:
@@ -1283,6 +1384,12 @@ def _build_blocks() -> gr.Blocks:
         opt_models,
         default_opt,
     ) = _load_model_choices()
+    # Provider-switch default for OpenRouter; resolved once per build like the choices above.
+    openrouter_default = resolve_default_image_model(
+        provider_id=PROVIDER_OPENROUTER, config=Config.from_env()
+    )
+    if not openrouter_default and image_models:
+        openrouter_default = image_models[0]
 
     # LoRA catalog is fetched when Draw Things is selected (not at UI build time).
     lora_dd_choices = _lora_ui_dropdown_choices([])
@@ -1290,35 +1397,8 @@ def _build_blocks() -> gr.Blocks:
     initial_lora_files, initial_lora_weights = _empty_lora_slots()
     initial_lora_visible = default_image_provider == PROVIDER_DRAW_THINGS
 
-    logo_img = ""
-    logo_url = _logo_data_url(64)
-    if logo_url:
-        logo_img = f'<img src="{logo_url}" alt="genimg" width="64" height="64" style="display: block; flex-shrink: 0;" />'
-
-    header_html = f"""
-<div style="display: flex; align-items: center; gap: 32px; margin: 16px 0 24px 0; flex-wrap: wrap;">
-    <div style="flex-shrink: 0; display: flex; align-items: center; gap: 16px;">
-        {logo_img}
-        <h1 style="
-            font-size: 2.5em;
-            font-weight: 700;
-            margin: 0;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-            letter-spacing: -0.02em;
-        ">genimg</h1>
-    </div>
-    <div style="flex: 1; min-width: 200px;">
-        <p style="font-size: 1.1em; color: #6b7280; margin: 0 0 4px 0; font-weight: 400;">AI-powered image generation with intelligent prompt optimization</p>
-        <p style="font-size: 0.9em; color: #9ca3af; margin: 0; font-weight: 400;">Ollama prompt enhancement • OpenRouter/Draw Things image models • Reference images for supported providers</p>
-    </div>
-</div>
-"""
-
     with gr.Blocks(title=BASE_PAGE_TITLE) as app:
-        gr.HTML(header_html)
+        gr.HTML(_header_html())
         status_html = gr.HTML(value="", visible=True)
         page_title = gr.Textbox(value=BASE_PAGE_TITLE, visible=False, elem_id="genimg-page-title")
         notify_msg = gr.Textbox(value="", visible=False, elem_id="genimg-notify-msg")
@@ -1372,6 +1452,10 @@ def _build_blocks() -> gr.Blocks:
                         ref_image = gr.Image(
                             label="Reference image",
                             type="filepath",
+                            # Hand over the uploaded file untouched; any other mode makes Gradio
+                            # decode, convert and re-save it on every event that reads it.
+                            # RGB conversion (alpha on white) happens in the core pipeline.
+                            image_mode=None,
                             sources=["upload", "clipboard"],
                             visible=True,
                         )
@@ -1436,7 +1520,7 @@ def _build_blocks() -> gr.Blocks:
                     ),
                 )
                 ref_message = gr.HTML(
-                    value=_format_status(_REF_NOT_SUPPORTED_MSG, "warning"),
+                    value=_REF_NOT_SUPPORTED_HTML,
                     visible=(not _provider_supports_reference(default_image_provider)),
                 )
 
@@ -1518,16 +1602,9 @@ def _build_blocks() -> gr.Blocks:
 
         def _on_provider_change(provider: str) -> tuple[Any, ...]:
             if provider == PROVIDER_OLLAMA:
-                config = Config.from_env()
                 return (
-                    gr.update(
-                        choices=ollama_image_models,
-                        value=config.default_ollama_image_model,
-                    ),
-                    gr.update(
-                        visible=True,
-                        value=_format_status(_REF_NOT_SUPPORTED_MSG, "warning"),
-                    ),
+                    gr.update(choices=ollama_image_models, value=default_ollama),
+                    gr.update(visible=True, value=_REF_NOT_SUPPORTED_HTML),
                     *_lora_slot_updates(visible=False, pairs=[]),
                 )
             if provider == PROVIDER_DRAW_THINGS:
@@ -1538,12 +1615,6 @@ def _build_blocks() -> gr.Blocks:
                     gr.update(visible=False),
                     *_lora_slot_updates(visible=True, pairs=lora_pairs, hint=hint),
                 )
-            config = Config.from_env()
-            openrouter_default = resolve_default_image_model(
-                provider_id=PROVIDER_OPENROUTER, config=config
-            )
-            if not openrouter_default and image_models:
-                openrouter_default = image_models[0]
             return (
                 gr.update(choices=image_models, value=openrouter_default),
                 gr.update(visible=False),
@@ -1581,7 +1652,7 @@ def _build_blocks() -> gr.Blocks:
             default_opt = config.default_optimization_model
             choices = merge_optimization_model_choices(
                 default=default_opt,
-                installed=list_ollama_models(config),
+                installed=_installed_ollama_models(config),
             )
             value = default_opt if default_opt in choices else (choices[0] if choices else "")
             return gr.update(choices=choices, value=value)
@@ -1605,6 +1676,7 @@ def _build_blocks() -> gr.Blocks:
             fn=_on_desc_method_change,
             inputs=[desc_method_dd],
             outputs=[desc_verbosity_dd],
+            queue=False,  # instant, UI-only toggles skip the event queue
         )
 
         def _ref_image_change(ref_value: Any) -> tuple[Any, ...]:
@@ -1626,14 +1698,14 @@ def _build_blocks() -> gr.Blocks:
             fn=_ref_image_change,
             inputs=[ref_image],
             outputs=[describe_btn, use_description_cb, desc_method_dd, desc_verbosity_dd],
+            queue=False,
         )
 
         def _describe_click(ref_value: Any, method: str, verbosity: str) -> tuple[str, str]:
             ref_source = _reference_source_for_process(ref_value)
             if ref_source is None:
                 return "", _format_status("No reference image.", "warning")
-            ui_to_method = {"Prose (Florence)": "prose", "Tags (JoyTag)": "tags"}
-            method_val = ui_to_method.get(method, "prose")
+            method_val = _DESCRIPTION_METHOD_BY_UI.get(method, "prose")
             try:
                 desc = describe_image(
                     ref_source, method=method_val, verbosity=verbosity or "detailed"
@@ -1746,6 +1818,9 @@ def _build_blocks() -> gr.Blocks:
             fn=_prompt_change_handler,
             inputs=[prompt_tb],
             outputs=[generate_btn, optimize_btn],
+            # Stays behind a running generate (so typing cannot re-enable Generate mid-run);
+            # keystrokes arriving while one is pending collapse into a single trailing run.
+            trigger_mode="always_last",
             concurrency_id=_UI_CONCURRENCY_ID,
         )
 
@@ -1753,27 +1828,10 @@ def _build_blocks() -> gr.Blocks:
             fn=_optimize_checkbox_handler,
             inputs=[optimize_cb],
             outputs=[optimized_tab],
+            queue=False,
         )
 
-        gr.HTML(f"""
-<div style="text-align: center; margin: 40px 0 20px 0; padding-top: 20px; border-top: 1px solid #e5e7eb;">
-    <p style="
-        font-size: 0.9em;
-        color: #9ca3af;
-        margin: 0 0 5px 0;
-    ">genimg v{__version__}</p>
-    <p style="
-        font-size: 0.9em;
-        color: #9ca3af;
-        margin: 0;
-    "><a href="https://github.com/codeprimate/genimg" target="_blank" style="
-        color: #667eea;
-        text-decoration: none;
-        font-weight: 500;
-        transition: color 0.2s;
-    " onmouseover="this.style.color='#764ba2'" onmouseout="this.style.color='#667eea'">GitHub Repository ↗</a></p>
-</div>
-""")
+        gr.HTML(_footer_html())
 
         app.load(js=_JS_REQUEST_NOTIFICATION_PERMISSION)
 
@@ -335,6 +335,38 @@ class TestOptimizeFormat:
         assert c.optimize_format == "json"
 
 
+@pytest.mark.unit
+class TestFuzzyCache:
+    def test_fuzzy_cache_enabled_by_default(self):
+        assert Config().fuzzy_cache_enabled is True
+
+    def test_from_env_genimg_fuzzy_cache_opt_out(self):
+        with patch.dict(os.environ, {"GENIMG_FUZZY_CACHE": "0"}, clear=False):
+            c = Config.from_env()
+        assert c.fuzzy_cache_enabled is False
+
+
+@pytest.mark.unit
+class TestReferenceResample:
+    def test_default_is_auto(self):
+        assert Config().reference_resample == "auto"
+
+    def test_from_env_reads_filter(self):
+        with patch.dict(os.environ, {"GENIMG_REFERENCE_RESAMPLE": " Lanczos "}, clear=False):
+            c = Config.from_env()
+        assert c.reference_resample == "lanczos"
+
+    def test_from_env_unknown_value_falls_back_to_default(self):
+        with patch.dict(os.environ, {"GENIMG_REFERENCE_RESAMPLE": "nearest"}, clear=False):
+            c = Config.from_env()
+        assert c.reference_resample == "auto"
+
+    def test_validate_rejects_unknown_value(self):
+        c = Config(openrouter_api_key="sk-ok", reference_resample="nearest")
+        with pytest.raises(ConfigurationError, match="reference_resample"):
+            c.validate()
+
+
 @pytest.mark.unit
 class TestConfigGlobals:
     def test_set_config_then_get_config_returns_set(self):
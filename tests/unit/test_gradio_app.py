@@ -43,6 +43,246 @@ class TestExceptionToMessage:
         assert msg == "Invalid format"
 
 
+@pytest.mark.unit
+class TestSaveOutputJpeg:
+    """Test writing the generated image to the UI output JPG."""
+
+    def _result(self, fmt: str, raw: bytes | None) -> gradio_app.GenerationResult:
+        return gradio_app.GenerationResult(
+            image=Image.new("RGB", (8, 8), color="blue"),
+            _format=fmt,
+            generation_time=1.0,
+            model_used="m",
+            prompt_used="p",
+            had_reference=False,
+            _raw_bytes=raw,
+        )
+
+    def test_jpeg_result_written_without_reencode(self, tmp_path: Path) -> None:
+        raw = b"\xff\xd8\xffprovider-jpeg"
+        with (
+            patch("genimg.ui.gradio_app._OUTPUT_DIR", tmp_path),
+            patch.object(Image.Image, "save", side_effect=AssertionError),
+        ):
+            out = gradio_app._save_output_jpeg(self._result("jpeg", raw))
+        assert Path(out).read_bytes() == raw
+        assert out in gradio_app._temp_image_paths
+
+    def test_png_result_encoded_as_jpeg(self, tmp_path: Path) -> None:
+        with patch("genimg.ui.gradio_app._OUTPUT_DIR", tmp_path):
+            out = gradio_app._save_output_jpeg(self._result("png", b"png-bytes"))
+        assert out.endswith(".jpg")
+        with Image.open(out) as img:
+            assert img.format == "JPEG"
+
+    def test_same_second_outputs_do_not_collide(self, tmp_path: Path) -> None:
+        with (
+            patch("genimg.ui.gradio_app._OUTPUT_DIR", tmp_path),
+            patch("genimg.ui.gradio_app.time.time", return_value=1_700_000_000.0),
+        ):
+            first = gradio_app._save_output_jpeg(self._result("jpeg", b"one"))
+            second = gradio_app._save_output_jpeg(self._result("jpeg", b"two"))
+        assert first != second
+        assert Path(first).read_bytes() == b"one"
+        assert Path(second).read_bytes() == b"two"
+
+    def test_existing_file_is_not_overwritten(self, tmp_path: Path) -> None:
+        with (
+            patch("genimg.ui.gradio_app._OUTPUT_DIR", tmp_path),
+            patch("genimg.ui.gradio_app._output_counter", iter([1, 2])),
+            patch("genimg.ui.gradio_app.time.time", return_value=5.0),
+        ):
+            (tmp_path / "5_1.jpg").write_bytes(b"other process")
+            out = gradio_app._save_output_jpeg(self._result("jpeg", b"mine"))
+        assert Path(out).name == "5_2.jpg"
+        assert (tmp_path / "5_1.jpg").read_bytes() == b"other process"
+
+    def test_failed_encode_removes_partial_file(self, tmp_path: Path) -> None:
+        with (
+            patch("genimg.ui.gradio_app._OUTPUT_DIR", tmp_path),
+            patch.object(Image.Image, "save", side_effect=OSError("encoder failed")),
+            pytest.raises(OSError, match="encoder failed"),
+        ):
+            gradio_app._save_output_jpeg(self._result("png", b"png-bytes"))
+        assert list(tmp_path.iterdir()) == []
+
+    def test_png_result_uses_shared_encoder_options(self, tmp_path: Path) -> None:
+        with (
+            patch("genimg.ui.gradio_app._OUTPUT_DIR", tmp_path),
+            patch.dict("os.environ", {"GENIMG_UI_JPEG_QUALITY": "75"}),
+            patch.object(Image.Image, "save") as mock_save,
+        ):
+            gradio_app._save_output_jpeg(self._result("png", b"png-bytes"))
+        kwargs = mock_save.call_args.kwargs
+        assert kwargs["quality"] == 75
+        assert kwargs["subsampling"] == 2
+        assert kwargs["optimize"] is False
+
+
+@pytest.mark.unit
+class TestOutputJpegQuality:
+    """Test GENIMG_UI_JPEG_QUALITY parsing."""
+
+    def test_default_when_unset(self) -> None:
+        with patch.dict("os.environ", {}, clear=True):
+            assert gradio_app._output_jpeg_quality() == gradio_app.DEFAULT_UI_JPEG_QUALITY
+
+    def test_valid_value(self) -> None:
+        with patch.dict("os.environ", {"GENIMG_UI_JPEG_QUALITY": "85"}):
+            assert gradio_app._output_jpeg_quality() == 85
+
+    @pytest.mark.parametrize("value", ["abc", "0", "100"])
+    def test_invalid_value_falls_back(self, value: str) -> None:
+        with patch.dict("os.environ", {"GENIMG_UI_JPEG_QUALITY": value}):
+            assert gradio_app._output_jpeg_quality() == gradio_app.DEFAULT_UI_JPEG_QUALITY
+
+
+@pytest.mark.unit
+class TestInteractiveUpdates:
+    """Test the shared button enable/disable updates."""
+
+    def test_match_fresh_updates(self) -> None:
+        import gradio as gr
+
+        assert gradio_app._interactive_update(True) == gr.update(interactive=True)
+        assert gradio_app._interactive_update(False) == gr.update(interactive=False)
+        assert gradio_app._interactive_update(True) is gradio_app._UPDATE_ENABLED
+
+    def test_gradio_postprocess_leaves_shared_update_intact(self) -> None:
+        import gradio as gr
+        from gradio import utils
+        from gradio.blocks import postprocess_update_dict
+
+        before = dict(gradio_app._UPDATE_DISABLED)
+        utils.delete_none(gradio_app._UPDATE_DISABLED, skip_value=True)
+        postprocess_update_dict(gr.Button(render=False), gradio_app._UPDATE_DISABLED)
+        assert before == gradio_app._UPDATE_DISABLED
+
+
+@pytest.mark.unit
+class TestLogPrompt:
+    """Test the prompt logging helper."""
+
+    def test_skipped_when_prompt_logging_off(self) -> None:
+        with (
+            patch("genimg.ui.gradio_app.log_prompts", return_value=False),
+            patch.object(gradio_app.logger, "info") as info,
+        ):
+            gradio_app._log_prompt("a cat")
+        info.assert_not_called()
+
+    def test_truncates_long_prompt(self) -> None:
+        long_prompt = "x" * (gradio_app._UI_PROMPT_LOG_MAX + 5)
+        with (
+            patch("genimg.ui.gradio_app.log_prompts", return_value=True),
+            patch.object(gradio_app.logger, "isEnabledFor", return_value=True),
+            patch.object(gradio_app.logger, "info") as info,
+        ):
+            gradio_app._log_prompt("short")
+            gradio_app._log_prompt(long_prompt)
+        assert info.call_args_list[0].args == ("Prompt: %s", "short")
+        logged = info.call_args_list[1].args[1]
+        assert logged == "x" * gradio_app._UI_PROMPT_LOG_MAX + "..."
+
+
+@pytest.mark.unit
+class TestFormatStatus:
+    """Test status box HTML."""
+
+    def test_each_type_has_icon_and_color(self) -> None:
+        for status_type, (icon, color, bg) in gradio_app._STATUS_STYLES.items():
+            out = gradio_app._format_status("Working", status_type)
+            assert icon in out and color in out and bg in out
+            assert out.endswith('font-weight: 500;">Working</span>\n</div>')
+
+    def test_idle_and_unknown_are_empty(self) -> None:
+        assert gradio_app._format_status("x", "idle") == ""
+        assert gradio_app._format_status("x", "bogus") == ""
+
+    def test_message_is_escaped(self) -> None:
+        out = gradio_app._format_status("<script>alert(1)</script> & more", "error")
+        assert "<script>" not in out
+        assert "&lt;script&gt;alert(1)&lt;/script&gt; &amp; more" in out
+
+
+@pytest.mark.unit
+class TestTempPaths:
+    """Test temp file registration and cleanup."""
+
+    def test_cleanup_temp_images_unlinks_and_forgets(self, tmp_path: Path) -> None:
+        out = tmp_path / "out.jpg"
+        out.write_bytes(b"jpg")
+        gradio_app._register_temp_image_path(str(out))
+        gradio_app._cleanup_temp_images()
+        assert not out.exists()
+        assert str(out) not in gradio_app._temp_image_paths
+        assert str(out) not in gradio_app._temp_paths
+
+    def test_concurrent_register_and_cleanup(self, tmp_path: Path) -> None:
+        import threading
+
+        def register(n: int) -> None:
+            for i in range(200):
+                gradio_app._register_temp_image_path(str(tmp_path / f"{n}_{i}.jpg"))
+
+        def cleanup() -> None:
+            for _ in range(200):
+                gradio_app._cleanup_temp_images()
+
+        threads = [threading.Thread(target=register, args=(n,)) for n in range(3)]
+        threads.append(threading.Thread(target=cleanup))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        gradio_app._cleanup_temp_images()
+        assert not gradio_app._temp_image_paths
+
+
+@pytest.mark.unit
+class TestLogoAssets:
+    """Test packaged logo/favicon lookups."""
+
+    def test_favicon_uses_packaged_file_without_copy(self) -> None:
+        gradio_app._get_favicon_path.cache_clear()
+        with patch("genimg.ui.gradio_app.tempfile.mkstemp", side_effect=AssertionError):
+            path = gradio_app._get_favicon_path()
+        assert path is not None
+        assert Path(path).name == "favicon.ico"
+        assert Path(path).is_file()
+        assert path not in gradio_app._temp_paths
+
+    def test_logo_data_url_is_memoized(self) -> None:
+        gradio_app._logo_data_url.cache_clear()
+        files = MagicMock()
+        ref = files.return_value.joinpath.return_value.joinpath.return_value.joinpath.return_value
+        ref.read_bytes.return_value = b"png"
+        try:
+            with patch("genimg.ui.gradio_app.importlib.resources.files", files):
+                url = gradio_app._logo_data_url(64)
+                assert gradio_app._logo_data_url(64) is url
+        finally:
+            gradio_app._logo_data_url.cache_clear()
+        assert url == "data:image/png;base64,cG5n"
+        ref.read_bytes.assert_called_once()
+
+    def test_header_html_built_once_with_logo(self) -> None:
+        gradio_app._header_html.cache_clear()
+        try:
+            with patch(
+                "genimg.ui.gradio_app._logo_data_url", return_value="data:image/png;base64,eA=="
+            ) as mock_logo:
+                html = gradio_app._header_html()
+                assert gradio_app._header_html() is html
+        finally:
+            gradio_app._header_html.cache_clear()
+        assert 'src="data:image/png;base64,eA=="' in html
+        mock_logo.assert_called_once_with(64)
+
+    def test_footer_html_has_version(self) -> None:
+        assert f"genimg v{gradio_app.__version__}" in gradio_app._footer_html()
+
+
 @pytest.mark.unit
 class TestReferenceSourceForProcess:
     """Test reference image value handling from Gradio."""
@@ -66,15 +306,21 @@ class TestReferenceSourceForProcess:
         data_url = "data:image/png;base64,iVBORw0KGgo="
         assert gradio_app._reference_source_for_process({"url": data_url}) == data_url
 
-    def test_pil_image_returns_path(self) -> None:
-        """PIL Image from Gradio is saved to temp file and path returned."""
+    def test_dict_falls_back_to_url_when_path_blank(self) -> None:
+        data_url = "data:image/png;base64,iVBORw0KGgo="
+        value = {"path": "  ", "url": data_url}
+        assert gradio_app._reference_source_for_process(value) == data_url
+        assert gradio_app._reference_source_for_process({"path": None, "url": ""}) is None
+
+    def test_path_object(self) -> None:
+        assert gradio_app._reference_source_for_process(Path("/tmp/r.png")) == "/tmp/r.png"
+
+    def test_pil_image_passed_through(self) -> None:
+        """PIL Image from Gradio is handed on as-is, without a temp file."""
         pil = Image.new("RGB", (2, 2), color="red")
-        out = gradio_app._reference_source_for_process(pil)
-        assert out is not None
-        assert isinstance(out, str)
-        assert out.endswith(".png")
-        assert Path(out).is_file()
-        Path(out).unlink()
+        with patch("genimg.ui.gradio_app.tempfile.mkstemp", side_effect=AssertionError):
+            out = gradio_app._reference_source_for_process(pil)
+        assert out is pil
 
 
 @pytest.mark.unit
@@ -519,6 +765,62 @@ class TestRunGenerate:
         assert mock_generate.call_args[1].get("reference_images_b64") is None
         assert any("Done" in (item[0] or "") for item in items)
 
+    @pytest.mark.parametrize(
+        ("optimize", "box", "state"),
+        [
+            (False, "", {"prompt": "", "ref_hash": None}),
+            (True, "edited prompt", {"prompt": "a cat", "ref_hash": "hash123"}),
+        ],
+    )
+    @patch("genimg.ui.gradio_app.generate_image")
+    @patch("genimg.ui.gradio_app.optimize_prompt")
+    @patch("genimg.ui.gradio_app.get_description")
+    @patch("genimg.ui.gradio_app.process_reference_image")
+    @patch("genimg.ui.gradio_app.validate_prompt")
+    @patch("genimg.ui.gradio_app.Config")
+    def test_use_description_skips_describe_when_not_optimizing(
+        self,
+        mock_config_cls: MagicMock,
+        _mock_validate: MagicMock,
+        mock_process_ref: MagicMock,
+        mock_get_description: MagicMock,
+        mock_optimize: MagicMock,
+        mock_generate: MagicMock,
+        optimize: bool,
+        box: str,
+        state: dict[str, str | None],
+        tmp_path: Path,
+    ) -> None:
+        """The description only feeds optimization; no optimize run means no describe run."""
+        config = MagicMock()
+        config.openrouter_api_key = "sk-test"
+        mock_config_cls.from_env.return_value = config
+        ref_file = tmp_path / "ref.png"
+        ref_file.write_bytes(b"\x89PNG\r\n\x1a\n")
+        mock_process_ref.return_value = ("b64data", "hash123")
+        result = MagicMock()
+        result.image = Image.new("RGB", (10, 10), color="blue")
+        result.generation_time = 1.0
+        mock_generate.return_value = result
+
+        items = list(
+            gradio_app._run_generate_stream(
+                "a cat",
+                optimize=optimize,
+                optimized_prompt_value=box,
+                reference_value=str(ref_file),
+                provider="openrouter",
+                model="test/model",
+                optimized_for_state=state,
+                use_description=True,
+            )
+        )
+
+        mock_get_description.assert_not_called()
+        mock_optimize.assert_not_called()
+        mock_generate.assert_called_once()
+        assert any("Done" in (item[0] or "") for item in items)
+
 
 @pytest.mark.unit
 class TestGenerateClickHandler:
@@ -562,6 +864,8 @@ class TestGenerateClickHandler:
         assert out[0][0] == "Generating…"
         assert out[1][0] == "Done in 1.0s"
         assert out[1][1] == "/tmp/123.jpg"
+        # Cancel polls go straight to the event's bound method (no lambda frame per poll)
+        assert mock_stream.call_args.kwargs["cancel_check"] == gradio_app._cancel_event.is_set
 
     def test_handler_on_genimg_error_yields_message_and_preserves_opt_text(self) -> None:
         """On GenimgError, handler yields error message and preserves optimized prompt box."""
@@ -640,6 +944,7 @@ class TestOptimizeClickHandler:
             out = list(gradio_app._optimize_click_handler("a dog", None, None, state))
         assert len(out) == 2
         assert out[1][1] == "optimized text"
+        assert mock_stream.call_args.kwargs["cancel_check"] == gradio_app._cancel_event.is_set
 
     def test_handler_passes_json_format_to_stream(self) -> None:
         gradio_app._cancel_event.clear()
@@ -791,6 +1096,58 @@ class TestDrawThingsLoraHelpers:
         assert ("Alpha", "a.ckpt") in choices
 
 
+@pytest.mark.unit
+class TestInstalledOllamaModels:
+    """Test the TTL cache around list_ollama_models used by the UI."""
+
+    def setup_method(self) -> None:
+        gradio_app._installed_ollama_models_cached.cache_clear()
+
+    def teardown_method(self) -> None:
+        gradio_app._installed_ollama_models_cached.cache_clear()
+
+    def test_reuses_result_within_ttl(self) -> None:
+        config = gradio_app.Config(ollama_base_url="http://ollama:11434")
+        with (
+            patch("genimg.ui.gradio_app.list_ollama_models", return_value=["x/a", "m"]) as m,
+            patch("genimg.ui.gradio_app.time.monotonic", return_value=100.0),
+        ):
+            assert gradio_app._installed_ollama_models(config) == ["x/a", "m"]
+            assert gradio_app._installed_ollama_models(config) == ["x/a", "m"]
+        m.assert_called_once()
+        assert m.call_args[0][0].ollama_base_url == "http://ollama:11434"
+
+    def test_refetches_after_ttl(self) -> None:
+        config = gradio_app.Config()
+        ttl = gradio_app._OLLAMA_MODELS_TTL_SECONDS
+        with (
+            patch("genimg.ui.gradio_app.list_ollama_models", side_effect=[["a"], ["a", "b"]]),
+            patch("genimg.ui.gradio_app.time.monotonic", side_effect=[0.0, ttl + 1.0]),
+        ):
+            assert gradio_app._installed_ollama_models(config) == ["a"]
+            assert gradio_app._installed_ollama_models(config) == ["a", "b"]
+
+    def test_load_model_choices_puts_defaults_first(self) -> None:
+        config = gradio_app.Config(
+            default_image_model="new/model", default_ollama_image_model="x/b"
+        )
+        with (
+            patch("genimg.ui.gradio_app.Config.from_env", return_value=config),
+            patch("genimg.ui.gradio_app.yaml_image_models", return_value=["a/m", "b/m"]),
+            patch("genimg.ui.gradio_app.list_ollama_models", return_value=["x/a", "x/b", "x/c"]),
+        ):
+            choices = gradio_app._load_model_choices()
+        assert choices[0] == ["new/model", "a/m", "b/m"]
+        assert choices[1] == ["x/b", "x/a", "x/c"]
+
+    def test_load_model_choices_queries_ollama_once(self) -> None:
+        with patch("genimg.ui.gradio_app.list_ollama_models", return_value=["x/img", "llm"]) as m:
+            choices = gradio_app._load_model_choices()
+        m.assert_called_once()
+        assert "x/img" in choices[1]
+        assert "llm" in choices[5]
+
+
 @pytest.mark.unit
 class TestBuildBlocksAndLaunch:
     """Test _build_blocks and launch (build UI, no server)."""
@@ -802,6 +1159,43 @@ class TestBuildBlocksAndLaunch:
         app = gradio_app._build_blocks()
         assert app is not None
 
+    def test_provider_change_does_not_reread_config(self) -> None:
+        app = gradio_app._build_blocks()
+        handler = next(
+            f.fn for f in app.fns.values() if f.fn and f.fn.__name__ == "_on_provider_change"
+        )
+        with patch("genimg.ui.gradio_app.Config.from_env", side_effect=AssertionError):
+            openrouter = handler("openrouter")
+            ollama = handler("ollama")
+        assert openrouter[1]["visible"] is False
+        assert ollama[1]["visible"] is True
+        assert ollama[1]["value"] is gradio_app._REF_NOT_SUPPORTED_HTML
+
+    def test_prompt_change_coalesces_keystrokes(self) -> None:
+        app = gradio_app._build_blocks()
+        dep = next(
+            f for f in app.fns.values() if f.fn and f.fn.__name__ == "_prompt_change_handler"
+        )
+        assert dep.trigger_mode == "always_last"
+
+    def test_ui_only_toggles_bypass_queue(self) -> None:
+        app = gradio_app._build_blocks()
+        queued = {f.fn.__name__: f.queue for f in app.fns.values() if f.fn}
+        assert queued["_on_desc_method_change"] is False
+        assert queued["_ref_image_change"] is False
+        assert queued["_optimize_checkbox_handler"] is False
+        assert queued["_generate_click_handler"] is True
+
+    def test_reference_image_passes_upload_path_through(self) -> None:
+        app = gradio_app._build_blocks()
+        ref = next(
+            b
+            for b in app.blocks.values()
+            if isinstance(b, gradio_app.gr.Image) and b.label == "Reference image"
+        )
+        assert ref.type == "filepath"
+        assert ref.image_mode is None
+
     def test_launch_calls_build_and_launch(self) -> None:
         """launch() builds app and calls app.launch with host/port/share/inbrowser."""
         with patch("genimg.ui.gradio_app._build_blocks") as mock_build:
@@ -26,6 +26,7 @@ from genimg.core.image_gen import (
 from genimg.core.providers.openrouter import (
     _format_from_content_type,
     _truncate_image_data_for_log,
+    _truncate_image_data_in_place,
 )
 from genimg.utils.exceptions import (
     APIError,
@@ -306,6 +307,11 @@ class TestGenerationResult:
         assert _format_from_content_type("image/PNG; charset=utf-8") == "png"
         assert _format_from_content_type("") == "png"
         assert _format_from_content_type("text/plain") == "png"
+        assert _format_from_content_type("image/jpg") == "jpeg"
+        assert _format_from_content_type("image/jpg; charset=binary") == "jpeg"
+        assert _format_from_content_type("image/JPEG") == "jpeg"
+        assert _format_from_content_type("image/webp") == "webp"
+        assert _format_from_content_type("image/avif") == "avif"
 
     def test_truncate_image_data_for_log_short_string_unchanged(self):
         assert _truncate_image_data_for_log("short") == "short"
@@ -355,6 +361,30 @@ class TestGenerationResult:
         assert out_r["error"]["message"] == long_error
         assert out_r["error"]["metadata"]["raw"] == long_raw
 
+    def test_truncate_image_data_for_log_does_not_mutate_and_shares_untouched(self):
+        untouched = {"type": "text", "text": "short"}
+        payload = {
+            "messages": [{"content": [untouched, {"image_url": {"url": "data:," + "q" * 300}}]}]
+        }
+        out = _truncate_image_data_for_log(payload)
+        assert payload["messages"][0]["content"][1]["image_url"]["url"].startswith("data:,q")
+        assert out["messages"][0]["content"][1]["image_url"]["url"] == "<data URL, 306 chars>"
+        assert out["messages"][0]["content"][0] is untouched
+        small = {"model": "m", "n": 1}
+        assert _truncate_image_data_for_log(small) is small
+
+    def test_truncate_image_data_in_place(self):
+        body = {
+            "choices": [{"message": {"images": [{"image_url": {"url": "data:," + "q" * 300}}]}}],
+            "error": {"message": "m" * 300},
+        }
+        assert _truncate_image_data_in_place(body) is body
+        assert body["choices"][0]["message"]["images"][0]["image_url"]["url"] == (
+            "<data URL, 306 chars>"
+        )
+        assert body["error"]["message"] == "m" * 300
+        assert _truncate_image_data_in_place("z" * 300) == "<string, 300 chars>"
+
 
 @pytest.mark.unit
 class TestGenerateImageValidation:
@@ -436,14 +466,14 @@ class TestGenerateImageValidation:
         mock_response.headers.get.return_value = "image/png"
         mock_response.content = MINIMAL_PNG
         with patch(
-            "genimg.core.providers.openrouter.requests.post", return_value=mock_response
+            "genimg.core.providers.openrouter._session.post", return_value=mock_response
         ) as m:
             result = generate_image(
                 "a cat",
                 config=config,
                 reference_images_b64=[],
             )
-        payload = m.call_args[1]["json"]
+        payload = json.loads(m.call_args[1]["data"])
         assert len(payload["messages"][0]["content"]) == 1
         assert result.had_reference is False
 
@@ -529,7 +559,7 @@ class TestGenerateImageValidation:
 
 @pytest.mark.unit
 class TestGenerateImageMocked:
-    """Tests for generate_image with mocked requests.post (OpenRouter provider)."""
+    """Tests for generate_image with mocked session POST (OpenRouter provider)."""
 
     def test_success_binary_image_response(self):
         config = Config(openrouter_api_key="sk-ok", default_image_provider="openrouter")
@@ -538,12 +568,13 @@ class TestGenerateImageMocked:
         mock_response.headers.get.return_value = "image/png"
         mock_response.content = MINIMAL_PNG
         mock_response.text = ""
-        with patch("genimg.core.providers.openrouter.requests.post", return_value=mock_response):
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
             result = generate_image("a cat", config=config)
         assert result.image is not None
         assert result.format == "png"
         assert len(result.image_data) > 0
         assert result.image_data[:8] == b"\x89PNG\r\n\x1a\n"
+        assert result.image_data is MINIMAL_PNG  # original body, not re-encoded
         assert result.model_used == config.default_image_model
         assert result.prompt_used == "a cat"
         assert result.had_reference is False
@@ -554,12 +585,18 @@ class TestGenerateImageMocked:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.headers.get.return_value = "application/json"
-        mock_response.json.return_value = {
-            "choices": [
-                {"message": {"images": [{"image_url": {"url": f"data:image/png;base64,{b64}"}}]}}
-            ]
-        }
-        with patch("genimg.core.providers.openrouter.requests.post", return_value=mock_response):
+        mock_response.content = json.dumps(
+            {
+                "choices": [
+                    {
+                        "message": {
+                            "images": [{"image_url": {"url": f"data:image/png;base64,{b64}"}}]
+                        }
+                    }
+                ]
+            }
+        ).encode()
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
             result = generate_image("a dog", config=config)
         assert result.image is not None
         assert result.format == "png"
@@ -572,15 +609,47 @@ class TestGenerateImageMocked:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.headers.get.return_value = "application/json"
-        mock_response.json.return_value = {
-            "choices": [{"message": {"images": [{"image_url": {"url": b64}}]}}]
-        }
-        with patch("genimg.core.providers.openrouter.requests.post", return_value=mock_response):
+        mock_response.content = json.dumps(
+            {"choices": [{"message": {"images": [{"image_url": {"url": b64}}]}}]}
+        ).encode()
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
             result = generate_image("bird", config=config)
         assert result.image is not None
         assert result.format == "png"
         assert len(result.image_data) > 0
 
+    def test_debug_api_skips_log_serialization_when_info_disabled(self):
+        import logging
+
+        config = Config(
+            openrouter_api_key="sk-ok", default_image_provider="openrouter", debug_api=True
+        )
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers.get.return_value = "image/png"
+        mock_response.content = MINIMAL_PNG
+        provider_logger = logging.getLogger("genimg.core.providers.openrouter")
+        with (
+            patch("genimg.core.providers.openrouter._session.post", return_value=mock_response),
+            patch.object(provider_logger, "isEnabledFor", return_value=False),
+            patch("genimg.core.providers.openrouter._truncate_image_data_for_log") as truncate,
+        ):
+            generate_image("a cat", config=config)
+        truncate.assert_not_called()
+
+    def test_invalid_base64_raises_api_error(self):
+        config = Config(openrouter_api_key="sk-ok", default_image_provider="openrouter")
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers.get.return_value = "application/json"
+        mock_response.content = json.dumps(
+            {"choices": [{"message": {"images": [{"image_url": {"url": "data:,abc"}}]}}]}
+        ).encode()
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
+            with pytest.raises(APIError) as exc_info:
+                generate_image("bird", config=config)
+        assert "Failed to extract image" in str(exc_info.value)
+
     def test_config_override_used(self):
         config = Config(
             openrouter_api_key="sk-ok",
@@ -593,13 +662,55 @@ class TestGenerateImageMocked:
         mock_response.headers.get.return_value = "image/jpeg"
         mock_response.content = MINIMAL_JPEG
         with patch(
-            "genimg.core.providers.openrouter.requests.post", return_value=mock_response
+            "genimg.core.providers.openrouter._session.post", return_value=mock_response
         ) as m:
             generate_image("x", config=config)
         call_kw = m.call_args[1]
-        assert call_kw["json"]["model"] == "custom/model"
+        assert json.loads(call_kw["data"])["model"] == "custom/model"
         assert "custom.example" in m.call_args[0][0]
 
+    def test_endpoint_url_and_headers_reused_across_calls(self):
+        config = Config(openrouter_api_key="sk-ok", default_image_provider="openrouter")
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers.get.return_value = "image/png"
+        mock_response.content = MINIMAL_PNG
+        with patch(
+            "genimg.core.providers.openrouter._session.post", return_value=mock_response
+        ) as m:
+            generate_image("first", config=config)
+            generate_image("second", config=config)
+        first, second = m.call_args_list
+        assert first[0][0] == f"{config.openrouter_base_url}/chat/completions"
+        assert first[1]["headers"]["Authorization"] == "Bearer sk-ok"
+        assert first[1]["headers"]["Content-Type"] == "application/json"
+        assert json.loads(first[1]["data"])["messages"][0]["content"][0]["text"] == "first"
+        with pytest.raises(TypeError):
+            first[1]["headers"]["Authorization"] = "Bearer other"
+
+    def test_endpoint_follows_api_key_override(self):
+        from genimg.core.providers.openrouter import OpenRouterProvider
+
+        provider = OpenRouterProvider()
+        _, headers = provider._resolve_endpoint("https://example.test/api/v1", "sk-one")
+        url, other = provider._resolve_endpoint("https://example.test/api/v1", "sk-two")
+        assert url == "https://example.test/api/v1/chat/completions"
+        assert headers["Authorization"] == "Bearer sk-one"
+        assert other["Authorization"] == "Bearer sk-two"
+
+    def test_generation_time_is_measured_request_time(self):
+        config = Config(openrouter_api_key="sk-ok", default_image_provider="openrouter")
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers.get.return_value = "image/png"
+        mock_response.content = MINIMAL_PNG
+        with (
+            patch("genimg.core.providers.openrouter._session.post", return_value=mock_response),
+            patch("genimg.core.providers.openrouter.time.time", side_effect=[100.0, 102.5]),
+        ):
+            result = generate_image("x", config=config)
+        assert result.generation_time == 2.5
+
     def test_reference_image_in_payload(self):
         config = Config(openrouter_api_key="sk-ok", default_image_provider="openrouter")
         mock_response = MagicMock()
@@ -607,10 +718,10 @@ class TestGenerateImageMocked:
         mock_response.headers.get.return_value = "image/png"
         mock_response.content = MINIMAL_PNG
         with patch(
-            "genimg.core.providers.openrouter.requests.post", return_value=mock_response
+            "genimg.core.providers.openrouter._session.post", return_value=mock_response
         ) as m:
             generate_image("same but blue", reference_image_b64="YXNk", config=config)
-        payload = m.call_args[1]["json"]
+        payload = json.loads(m.call_args[1]["data"])
         content = payload["messages"][0]["content"]
         assert len(content) == 2
         assert content[0]["type"] == "text"
@@ -624,14 +735,14 @@ class TestGenerateImageMocked:
         mock_response.content = MINIMAL_PNG
         refs = ["YQ==", "Yg==", "Yw=="]
         with patch(
-            "genimg.core.providers.openrouter.requests.post", return_value=mock_response
+            "genimg.core.providers.openrouter._session.post", return_value=mock_response
         ) as m:
             result = generate_image(
                 "prompt text",
                 reference_images_b64=refs,
                 config=config,
             )
-        payload = m.call_args[1]["json"]
+        payload = json.loads(m.call_args[1]["data"])
         content = payload["messages"][0]["content"]
         assert len(content) == 1 + len(refs)
         assert content[0] == {"type": "text", "text": "prompt text"}
@@ -655,7 +766,7 @@ class TestGenerateImageMocked:
         mock_response = MagicMock()
         mock_response.status_code = 401
         mock_response.text = "Unauthorized"
-        with patch("genimg.core.providers.openrouter.requests.post", return_value=mock_response):
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
             with pytest.raises(APIError) as exc_info:
                 generate_image("x", config=config)
         assert exc_info.value.status_code == 401
@@ -665,7 +776,7 @@ class TestGenerateImageMocked:
         mock_response = MagicMock()
         mock_response.status_code = 404
         mock_response.text = "Not found"
-        with patch("genimg.core.providers.openrouter.requests.post", return_value=mock_response):
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
             with pytest.raises(APIError) as exc_info:
                 generate_image("x", config=config)
         assert exc_info.value.status_code == 404
@@ -675,7 +786,7 @@ class TestGenerateImageMocked:
         mock_response = MagicMock()
         mock_response.status_code = 429
         mock_response.text = "Rate limit"
-        with patch("genimg.core.providers.openrouter.requests.post", return_value=mock_response):
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
             with pytest.raises(APIError) as exc_info:
                 generate_image("x", config=config)
         assert exc_info.value.status_code == 429
@@ -685,7 +796,7 @@ class TestGenerateImageMocked:
         mock_response = MagicMock()
         mock_response.status_code = 502
         mock_response.text = "Bad gateway"
-        with patch("genimg.core.providers.openrouter.requests.post", return_value=mock_response):
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
             with pytest.raises(APIError) as exc_info:
                 generate_image("x", config=config)
         assert exc_info.value.status_code == 502
@@ -695,7 +806,7 @@ class TestGenerateImageMocked:
         mock_response = MagicMock()
         mock_response.status_code = 418
         mock_response.text = "teapot"
-        with patch("genimg.core.providers.openrouter.requests.post", return_value=mock_response):
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
             with pytest.raises(APIError) as exc_info:
                 generate_image("x", config=config)
         assert exc_info.value.status_code == 418
@@ -705,9 +816,9 @@ class TestGenerateImageMocked:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.headers.get.return_value = "application/json"
-        mock_response.json.side_effect = ValueError("bad json")
+        mock_response.content = b"{invalid"
         mock_response.text = "{invalid"
-        with patch("genimg.core.providers.openrouter.requests.post", return_value=mock_response):
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
             with pytest.raises(APIError):
                 generate_image("x", config=config)
 
@@ -716,8 +827,8 @@ class TestGenerateImageMocked:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.headers.get.return_value = "application/json"
-        mock_response.json.return_value = {"choices": [{"message": {"images": []}}]}
-        with patch("genimg.core.providers.openrouter.requests.post", return_value=mock_response):
+        mock_response.content = json.dumps({"choices": [{"message": {"images": []}}]}).encode()
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
             with pytest.raises(APIError) as exc_info:
                 generate_image("x", config=config)
         assert "No images" in str(exc_info.value)
@@ -727,10 +838,10 @@ class TestGenerateImageMocked:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.headers.get.return_value = "application/json"
-        mock_response.json.return_value = {
-            "choices": [{"message": {"images": [{"image_url": {}}]}}]
-        }
-        with patch("genimg.core.providers.openrouter.requests.post", return_value=mock_response):
+        mock_response.content = json.dumps(
+            {"choices": [{"message": {"images": [{"image_url": {}}]}}]}
+        ).encode()
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
             with pytest.raises(APIError):
                 generate_image("x", config=config)
 
@@ -740,8 +851,8 @@ class TestGenerateImageMocked:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.headers.get.return_value = "application/json"
-        mock_response.json.return_value = {"choices": []}  # no [0] -> IndexError
-        with patch("genimg.core.providers.openrouter.requests.post", return_value=mock_response):
+        mock_response.content = json.dumps({"choices": []}).encode()  # no [0] -> IndexError
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
             with pytest.raises(APIError) as exc_info:
                 generate_image("x", config=config)
         assert "extract" in str(exc_info.value).lower() or "response" in str(exc_info.value).lower()
@@ -750,7 +861,7 @@ class TestGenerateImageMocked:
         import requests
 
         config = Config(openrouter_api_key="sk-ok", default_image_provider="openrouter")
-        with patch("genimg.core.providers.openrouter.requests.post") as m:
+        with patch("genimg.core.providers.openrouter._session.post") as m:
             m.side_effect = requests.exceptions.Timeout()
             with pytest.raises(RequestTimeoutError):
                 generate_image("x", config=config, timeout=30)
@@ -759,7 +870,7 @@ class TestGenerateImageMocked:
         import requests
 
         config = Config(openrouter_api_key="sk-ok", default_image_provider="openrouter")
-        with patch("genimg.core.providers.openrouter.requests.post") as m:
+        with patch("genimg.core.providers.openrouter._session.post") as m:
             m.side_effect = requests.exceptions.ConnectionError("refused")
             with pytest.raises(NetworkError):
                 generate_image("x", config=config)
@@ -768,7 +879,7 @@ class TestGenerateImageMocked:
         import requests
 
         config = Config(openrouter_api_key="sk-ok", default_image_provider="openrouter")
-        with patch("genimg.core.providers.openrouter.requests.post") as m:
+        with patch("genimg.core.providers.openrouter._session.post") as m:
             m.side_effect = requests.exceptions.RequestException("other")
             with pytest.raises(NetworkError):
                 generate_image("x", config=config)
@@ -783,9 +894,9 @@ class TestGenerateImageMocked:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.headers.get.return_value = "application/json"
-        mock_response.json.return_value = {"image": b64}
+        mock_response.content = json.dumps({"image": b64}).encode()
         with patch(
-            "genimg.core.providers.ollama.requests.post",
+            "genimg.core.providers.ollama._session.post",
             return_value=mock_response,
         ):
             result = generate_image(
@@ -816,7 +927,18 @@ class TestGenerateImageMocked:
             time.sleep(10)
             raise AssertionError("Should have been cancelled")
 
-        with patch("genimg.core.providers.openrouter.requests.post", side_effect=blocking_post):
+        with patch("genimg.core.providers.openrouter._session.post", side_effect=blocking_post):
             with pytest.raises(CancellationError) as exc_info:
                 generate_image("x", config=config, cancel_check=slow_then_cancel)
         assert "cancelled" in str(exc_info.value).lower()
+
+    def test_cancel_check_returns_result_when_not_cancelled(self):
+        """A cancellable generate returns the worker's result as soon as it finishes."""
+        config = Config(openrouter_api_key="sk-ok", default_image_provider="openrouter")
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers.get.return_value = "image/png"
+        mock_response.content = MINIMAL_PNG
+        with patch("genimg.core.providers.openrouter._session.post", return_value=mock_response):
+            result = generate_image("x", config=config, cancel_check=lambda: False)
+        assert result.image_data == MINIMAL_PNG
@@ -105,3 +105,9 @@ class TestGetLogger:
     def test_root_name_unchanged(self):
         log = get_logger("genimg")
         assert log.name == "genimg"
+
+    def test_repeated_calls_reuse_logger_without_lookup(self):
+        first = get_logger("core.memo_test")
+        with patch("genimg.logging_config.logging.getLogger") as lookup:
+            assert get_logger("core.memo_test") is first
+        lookup.assert_not_called()
@@ -2,6 +2,8 @@
 
 import base64
 import io
+import json
+from unittest.mock import MagicMock
 
 import pytest
 from PIL import Image
@@ -10,6 +12,7 @@ from genimg.core.providers.openrouter import (
     OpenRouterProvider,
     _extract_image_url_from_result,
 )
+from genimg.utils.exceptions import APIError
 
 _MINIMAL_PNG_BUF = io.BytesIO()
 Image.new("RGB", (1, 1), color=(0, 0, 0)).save(_MINIMAL_PNG_BUF, format="PNG")
@@ -79,3 +82,30 @@ def test_extract_image_url_from_content_parts() -> None:
         ]
     }
     assert _extract_image_url_from_result(result) == url
+
+
+def _json_response(url: str) -> MagicMock:
+    response = MagicMock()
+    response.status_code = 200
+    response.headers.get.return_value = "application/json"
+    response.content = json.dumps(
+        {"choices": [{"message": {"images": [{"image_url": {"url": url}}]}}]}
+    ).encode()
+    return response
+
+
+@pytest.mark.unit
+def test_parse_response_decodes_data_url_payload() -> None:
+    b64 = base64.b64encode(MINIMAL_PNG).decode("ascii")
+    result = OpenRouterProvider()._parse_response(
+        _json_response(f"data:image/png;base64,{b64}"), "m", "p", False, 0.1
+    )
+    assert result.image.size == (1, 1)
+
+
+@pytest.mark.unit
+def test_parse_response_data_url_without_comma_raises_api_error() -> None:
+    with pytest.raises(APIError):
+        OpenRouterProvider()._parse_response(
+            _json_response("data:image/png;base64"), "m", "p", False, 0.1
+        )
@@ -9,12 +9,14 @@ from genimg.core.config import Config
 from genimg.core.prompt import (
     OPTIMIZATION_TEMPLATE,
     _assemble_json_caption_prose,
+    _split_template,
     _strip_ollama_thinking,
     check_ollama_available,
     list_ollama_image_models,
     list_ollama_models,
     optimize_prompt,
     optimize_prompt_with_ollama,
+    optimize_prompts_batch,
     validate_prompt,
 )
 from genimg.utils.cache import get_cache
@@ -88,29 +90,30 @@ class TestStripOllamaThinking:
 
 @pytest.mark.unit
 class TestCheckOllamaAvailable:
-    def test_returns_true_when_api_tags_succeeds(self):
-        with patch("genimg.core.prompt.requests.get") as m:
+    def test_returns_true_when_api_version_succeeds(self):
+        with patch("genimg.core.prompt._session.get") as m:
             m.return_value = MagicMock(status_code=200)
             assert check_ollama_available() is True
             m.assert_called_once()
-            assert m.call_args[0][0].endswith("/api/tags")
+            assert m.call_args[0][0].endswith("/api/version")
+            assert m.call_args.kwargs["timeout"] == (0.5, 5)
 
-    def test_returns_false_when_api_tags_non_200(self):
-        with patch("genimg.core.prompt.requests.get") as m:
+    def test_returns_false_when_api_version_non_200(self):
+        with patch("genimg.core.prompt._session.get") as m:
             m.return_value = MagicMock(status_code=503)
             assert check_ollama_available() is False
 
     def test_returns_false_on_request_error(self):
         import requests
 
-        with patch("genimg.core.prompt.requests.get") as m:
+        with patch("genimg.core.prompt._session.get") as m:
             m.side_effect = requests.RequestException()
             assert check_ollama_available() is False
 
     def test_returns_false_on_timeout(self):
         import requests
 
-        with patch("genimg.core.prompt.requests.get") as m:
+        with patch("genimg.core.prompt._session.get") as m:
             m.side_effect = requests.exceptions.Timeout("read", 5)
             assert check_ollama_available() is False
 
@@ -130,7 +133,7 @@ class TestListOllamaModels:
             ]
         }
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.get") as m:
+            with patch("genimg.core.prompt._session.get") as m:
                 resp = MagicMock(status_code=200)
                 resp.json.return_value = body
                 m.return_value = resp
@@ -145,7 +148,7 @@ class TestListOllamaModels:
             ]
         }
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.get") as m:
+            with patch("genimg.core.prompt._session.get") as m:
                 resp = MagicMock(status_code=200)
                 resp.json.return_value = body
                 m.return_value = resp
@@ -154,13 +157,13 @@ class TestListOllamaModels:
 
     def test_returns_empty_list_on_non_200(self):
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.get") as m:
+            with patch("genimg.core.prompt._session.get") as m:
                 m.return_value = MagicMock(status_code=503)
                 assert list_ollama_models() == []
 
     def test_returns_empty_list_when_models_missing(self):
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.get") as m:
+            with patch("genimg.core.prompt._session.get") as m:
                 resp = MagicMock(status_code=200)
                 resp.json.return_value = {}
                 m.return_value = resp
@@ -170,7 +173,7 @@ class TestListOllamaModels:
         import requests
 
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.get") as m:
+            with patch("genimg.core.prompt._session.get") as m:
                 m.side_effect = requests.RequestException()
                 assert list_ollama_models() == []
 
@@ -178,7 +181,7 @@ class TestListOllamaModels:
         import requests
 
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.get") as m:
+            with patch("genimg.core.prompt._session.get") as m:
                 m.side_effect = requests.exceptions.Timeout("read", 5)
                 assert list_ollama_models() == []
 
@@ -217,6 +220,10 @@ class TestListOllamaImageModels:
         with patch("genimg.core.prompt.list_ollama_models", return_value=[]):
             assert list_ollama_image_models() == []
 
+    def test_filters_given_installed_list_without_querying(self):
+        with patch("genimg.core.prompt.list_ollama_models", side_effect=AssertionError):
+            assert list_ollama_image_models(["x/flux2-klein", "llama2"]) == ["x/flux2-klein"]
+
 
 @pytest.mark.unit
 class TestOptimizePrompt:
@@ -251,7 +258,7 @@ class TestOptimizePrompt:
         cache.clear()
         config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 resp = MagicMock(status_code=200)
                 resp.json.return_value = {"response": "  enhanced prompt  \n"}
                 post.return_value = resp
@@ -267,12 +274,76 @@ class TestOptimizePrompt:
         # Cache key must use same model as config.default_optimization_model for lookup to hit
         cache.set("cached", config.default_optimization_model, "from cache")
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 result = optimize_prompt_with_ollama("cached", config=config)
         assert result == "from cache"
         post.assert_not_called()
         cache.clear()
 
+    def test_optimize_prompt_validates_once(self):
+        """optimize_prompt validates up front; the Ollama path does not re-validate."""
+        from genimg.core import prompt as prompt_mod
+
+        cache = get_cache()
+        cache.clear()
+        config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
+        with patch("genimg.core.prompt.check_ollama_available", return_value=True):
+            with patch("genimg.core.prompt._session.post") as post:
+                resp = MagicMock(status_code=200)
+                resp.json.return_value = {"response": "enhanced"}
+                post.return_value = resp
+                with patch.object(
+                    prompt_mod, "validate_prompt", wraps=prompt_mod.validate_prompt
+                ) as validate:
+                    optimize_prompt("original", config=config, enable_cache=True)
+        assert validate.call_count == 1
+        cache.clear()
+
+    def test_optimize_prompt_consults_cache_once(self):
+        cache = get_cache()
+        cache.clear()
+        config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
+        with patch("genimg.core.prompt.check_ollama_available", return_value=True):
+            with patch("genimg.core.prompt._session.post") as post:
+                resp = MagicMock(status_code=200)
+                resp.json.return_value = {"response": "enhanced"}
+                post.return_value = resp
+                with patch.object(cache, "get", wraps=cache.get) as cache_get:
+                    optimize_prompt("original", config=config, enable_cache=True)
+        assert cache_get.call_count == 1
+        cache.clear()
+
+    def test_near_duplicate_prompt_hits_fuzzy_cache(self):
+        """Case, whitespace and trailing punctuation edits reuse the cached optimization."""
+        cache = get_cache()
+        cache.clear()
+        config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
+        with patch("genimg.core.prompt.check_ollama_available", return_value=True):
+            with patch("genimg.core.prompt._session.post") as post:
+                resp = MagicMock(status_code=200)
+                resp.json.return_value = {"response": "enhanced"}
+                post.return_value = resp
+                assert optimize_prompt("A red  car.", config=config) == "enhanced"
+                assert optimize_prompt("a red car!", config=config) == "enhanced"
+        assert post.call_count == 1
+        cache.clear()
+
+    def test_fuzzy_cache_disabled_requires_exact_match(self):
+        cache = get_cache()
+        cache.clear()
+        config = Config(
+            openrouter_api_key="sk-x", optimization_enabled=True, fuzzy_cache_enabled=False
+        )
+        with patch("genimg.core.prompt.check_ollama_available", return_value=True):
+            with patch("genimg.core.prompt._session.post") as post:
+                resp = MagicMock(status_code=200)
+                resp.json.return_value = {"response": "enhanced"}
+                post.return_value = resp
+                optimize_prompt("A red car.", config=config)
+                optimize_prompt("a red car", config=config)
+        assert post.call_count == 2
+        cache.clear()
+
     def test_optimize_prompt_with_ollama_timeout_raises(self):
         import requests
 
@@ -280,7 +351,7 @@ class TestOptimizePrompt:
         cache.clear()
         config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 post.side_effect = requests.exceptions.Timeout("read", 10)
                 with pytest.raises(RequestTimeoutError):
                     optimize_prompt_with_ollama("long prompt", config=config, timeout=10)
@@ -291,7 +362,7 @@ class TestOptimizePrompt:
         cache.clear()
         config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 post.return_value = MagicMock(status_code=500, text="error message")
                 with pytest.raises(APIError) as exc_info:
                     optimize_prompt_with_ollama("abc", config=config)
@@ -303,7 +374,7 @@ class TestOptimizePrompt:
         cache.clear()
         config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 resp = MagicMock(status_code=200)
                 resp.json.return_value = {"response": "   \n"}
                 post.return_value = resp
@@ -319,7 +390,7 @@ class TestOptimizePrompt:
         cache.clear()
         config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 post.side_effect = requests.exceptions.ConnectionError()
                 with pytest.raises(APIError) as exc_info:
                     optimize_prompt_with_ollama("abc", config=config)
@@ -333,7 +404,7 @@ class TestOptimizePrompt:
         config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
         assert config.optimize_thinking is False
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 resp = MagicMock(status_code=200)
                 resp.json.return_value = {"response": "optimized"}
                 post.return_value = resp
@@ -354,7 +425,7 @@ class TestOptimizePrompt:
             optimize_thinking=True,
         )
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 resp = MagicMock(status_code=200)
                 resp.json.return_value = {"response": "optimized"}
                 post.return_value = resp
@@ -364,6 +435,28 @@ class TestOptimizePrompt:
         assert payload["model"] == config.default_optimization_model
         cache.clear()
 
+    def test_optimize_prompt_with_ollama_reuses_shared_session(self):
+        """Availability probe and generate call go through the same keep-alive session."""
+        import requests
+
+        from genimg.core import prompt as prompt_mod
+
+        cache = get_cache()
+        cache.clear()
+        config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
+        assert isinstance(prompt_mod._session, requests.Session)
+        with patch.object(prompt_mod, "_session") as session:
+            session.get.return_value = MagicMock(status_code=200)
+            resp = MagicMock(status_code=200)
+            resp.json.return_value = {"response": "optimized"}
+            session.post.return_value = resp
+            assert optimize_prompt_with_ollama("a red car", config=config) == "optimized"
+            assert optimize_prompt_with_ollama("a blue car", config=config) == "optimized"
+        assert session.get.call_count == 2
+        assert session.post.call_count == 2
+        assert session.post.call_args[0][0].endswith("/api/generate")
+        cache.clear()
+
     def test_optimize_prompt_with_reference_description_uses_description_template(self):
         """When reference_description is set, description-based template is used and cached with description_key."""
         cache = get_cache()
@@ -376,7 +469,7 @@ class TestOptimizePrompt:
                 return_value="Use this: {reference_description}",
             ) as get_desc_tpl:
                 with patch("genimg.core.prompt.get_optimization_template") as get_std_tpl:
-                    with patch("genimg.core.prompt.requests.post") as post:
+                    with patch("genimg.core.prompt._session.post") as post:
                         resp = MagicMock(status_code=200)
                         resp.json.return_value = {"response": "  improved  \n"}
                         post.return_value = resp
@@ -428,7 +521,7 @@ class TestOptimizePrompt:
             return resp
 
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post", side_effect=slow_post):
+            with patch("genimg.core.prompt._session.post", side_effect=slow_post):
                 with pytest.raises(CancellationError) as exc_info:
                     optimize_prompt_with_ollama(
                         "original", config=config, cancel_check=cancel_after_two
@@ -449,7 +542,7 @@ class TestOptimizationHttpTimeout:
         config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
 
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 post.side_effect = requests.exceptions.ReadTimeout("read timed out")
                 with pytest.raises(RequestTimeoutError):
                     optimize_prompt_with_ollama("test", config=config, timeout=10)
@@ -483,7 +576,7 @@ class TestCancelCheckExceptionHandling:
             return resp
 
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post", side_effect=slow_post):
+            with patch("genimg.core.prompt._session.post", side_effect=slow_post):
                 # Suppress expected RuntimeWarning from buggy cancel_check (we are testing it is not raised)
                 with warnings.catch_warnings():
                     warnings.simplefilter("ignore", category=RuntimeWarning)
@@ -513,7 +606,7 @@ class TestCancelCheckExceptionHandling:
             return resp
 
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post", side_effect=blocking_post):
+            with patch("genimg.core.prompt._session.post", side_effect=blocking_post):
                 with pytest.raises(KeyboardInterrupt):
                     optimize_prompt_with_ollama(
                         "test", config=config, cancel_check=cancel_with_keyboard_interrupt
@@ -638,7 +731,7 @@ class TestJsonOptimizationFormat:
         """When optimize_format is 'json', Ollama payload includes format='json'."""
         config = Config(openrouter_api_key="sk-x", optimization_enabled=True, optimize_format="json")
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 resp = MagicMock(status_code=200)
                 resp.json.return_value = {"response": self._valid_caption_json()}
                 post.return_value = resp
@@ -650,7 +743,7 @@ class TestJsonOptimizationFormat:
         """When optimize_format is 'prose' (default), Ollama payload has no 'format' key."""
         config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 resp = MagicMock(status_code=200)
                 resp.json.return_value = {"response": "optimized prose"}
                 post.return_value = resp
@@ -664,7 +757,7 @@ class TestJsonOptimizationFormat:
 
         config = Config(openrouter_api_key="sk-x", optimization_enabled=True, optimize_format="json")
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 resp = MagicMock(status_code=200)
                 resp.json.return_value = {"response": self._valid_caption_json()}
                 post.return_value = resp
@@ -679,7 +772,7 @@ class TestJsonOptimizationFormat:
         """When JSON parse fails, raw Ollama text is returned (no exception raised)."""
         config = Config(openrouter_api_key="sk-x", optimization_enabled=True, optimize_format="json")
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 resp = MagicMock(status_code=200)
                 resp.json.return_value = {"response": "not valid json output"}
                 post.return_value = resp
@@ -693,7 +786,7 @@ class TestJsonOptimizationFormat:
             with patch("genimg.core.prompt.get_optimization_template_json") as mock_json_tpl:
                 mock_json_tpl.return_value = "json tpl {reference_image_instruction}"
                 with patch("genimg.core.prompt.get_optimization_template") as mock_prose_tpl:
-                    with patch("genimg.core.prompt.requests.post") as post:
+                    with patch("genimg.core.prompt._session.post") as post:
                         resp = MagicMock(status_code=200)
                         resp.json.return_value = {"response": self._valid_caption_json()}
                         post.return_value = resp
@@ -714,14 +807,14 @@ class TestJsonOptimizationFormat:
         model = config_prose.default_optimization_model
 
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 resp_prose = MagicMock(status_code=200)
                 resp_prose.json.return_value = {"response": "prose result"}
                 post.return_value = resp_prose
                 optimize_prompt_with_ollama("a red car", config=config_prose)
 
         with patch("genimg.core.prompt.check_ollama_available", return_value=True):
-            with patch("genimg.core.prompt.requests.post") as post:
+            with patch("genimg.core.prompt._session.post") as post:
                 resp_json = MagicMock(status_code=200)
                 resp_json.json.return_value = {"response": self._valid_caption_json()}
                 post.return_value = resp_json
@@ -732,3 +825,149 @@ class TestJsonOptimizationFormat:
         assert prose_cached is not None
         assert json_cached is not None
         assert prose_cached != json_cached
+
+
+@pytest.mark.unit
+class TestSplitTemplate:
+    """_split_template() must match str.format for the bundled templates."""
+
+    @pytest.mark.parametrize(
+        ("getter", "placeholder"),
+        [
+            ("get_optimization_template", "reference_image_instruction"),
+            ("get_optimization_template_json", "reference_image_instruction"),
+            ("get_optimization_template_with_description", "reference_description"),
+            ("get_optimization_template_with_description_json", "reference_description"),
+        ],
+    )
+    def test_matches_str_format(self, getter, placeholder):
+        from genimg.core import prompts_loader
+
+        template = getattr(prompts_loader, getter)()
+        head, tail = _split_template(template, placeholder)
+        assert head + "FILL {x}" + tail == template.format(**{placeholder: "FILL {x}"})
+
+    def test_user_prompt_braces_are_sent_verbatim(self):
+        cache = get_cache()
+        cache.clear()
+        config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
+        with patch("genimg.core.prompt.check_ollama_available", return_value=True):
+            with patch("genimg.core.prompt._session.post") as post:
+                resp = MagicMock(status_code=200)
+                resp.json.return_value = {"response": "optimized"}
+                post.return_value = resp
+                optimize_prompt_with_ollama("a sign reading {foo}", config=config)
+        sent_prompt = post.call_args[1]["json"]["prompt"]
+        assert sent_prompt.endswith("Original prompt: a sign reading {foo}\n\nImproved prompt:")
+        cache.clear()
+
+
+@pytest.mark.unit
+class TestOptimizePromptsBatch:
+    """Tests for optimize_prompts_batch() (concurrent cache misses)."""
+
+    def test_optimization_disabled_returns_originals(self):
+        config = Config(openrouter_api_key="sk-x", optimization_enabled=False)
+        assert optimize_prompts_batch(["a red car", "a blue car"], config=config) == [
+            "a red car",
+            "a blue car",
+        ]
+
+    def test_cache_hits_skip_ollama_and_order_is_preserved(self):
+        cache = get_cache()
+        cache.clear()
+        config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
+        model = config.default_optimization_model
+        cache.set("a red car", model, "cached red")
+        with patch("genimg.core.prompt.check_ollama_available", return_value=True):
+            with patch("genimg.core.prompt._session.post") as post:
+                resp = MagicMock(status_code=200)
+                resp.json.return_value = {"response": "fresh"}
+                post.return_value = resp
+                result = optimize_prompts_batch(
+                    ["a blue car", "a red car", "a blue car"], config=config
+                )
+        assert result == ["fresh", "cached red", "fresh"]
+        # Duplicate cache misses are only sent once.
+        assert post.call_count == 1
+        assert cache.get("a blue car", model) == "fresh"
+        cache.clear()
+
+    def test_cache_misses_run_concurrently(self):
+        import threading
+
+        cache = get_cache()
+        cache.clear()
+        config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
+        barrier = threading.Barrier(2, timeout=5)
+
+        def concurrent_post(*args, **kwargs):
+            # Both requests must be in flight at once for the barrier to release.
+            barrier.wait()
+            resp = MagicMock(status_code=200)
+            original = kwargs["json"]["prompt"].rsplit("Original prompt: ", 1)[1]
+            resp.json.return_value = {"response": "opt " + original.split("\n", 1)[0]}
+            return resp
+
+        with patch("genimg.core.prompt.check_ollama_available", return_value=True):
+            with patch("genimg.core.prompt._session.post", side_effect=concurrent_post):
+                result = optimize_prompts_batch(["first", "second"], config=config)
+        assert result == ["opt first", "opt second"]
+        cache.clear()
+
+    def test_max_workers_capped_at_session_pool_size(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from genimg.core import prompt as prompt_module
+
+        cache = get_cache()
+        cache.clear()
+        config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
+        resp = MagicMock(status_code=200)
+        resp.json.return_value = {"response": "opt"}
+        prompts = [f"prompt {i}" for i in range(10)]
+        with (
+            patch("genimg.core.prompt.check_ollama_available", return_value=True),
+            patch("genimg.core.prompt._session.post", return_value=resp),
+            patch(
+                "genimg.core.prompt.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+            ) as executor_cls,
+        ):
+            optimize_prompts_batch(prompts, config=config, max_workers=16)
+        assert executor_cls.call_args.kwargs["max_workers"] == prompt_module._BATCH_MAX_WORKERS
+        cache.clear()
+
+    def test_first_failure_does_not_wait_for_in_flight_requests(self):
+        import threading
+        import time
+
+        cache = get_cache()
+        cache.clear()
+        config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
+        release = threading.Event()
+
+        def post(*args, **kwargs):
+            if "Original prompt: slow" in kwargs["json"]["prompt"]:
+                release.wait(5)
+                resp = MagicMock(status_code=200)
+                resp.json.return_value = {"response": "late"}
+                return resp
+            return MagicMock(status_code=500, text="boom")
+
+        start = time.monotonic()
+        try:
+            with patch("genimg.core.prompt.check_ollama_available", return_value=True):
+                with patch("genimg.core.prompt._session.post", side_effect=post):
+                    with pytest.raises(APIError):
+                        optimize_prompts_batch(["fails", "slow"], config=config)
+            assert time.monotonic() - start < 4
+        finally:
+            release.set()
+        cache.clear()
+
+    def test_invalid_prompt_raises_before_any_request(self):
+        config = Config(openrouter_api_key="sk-x", optimization_enabled=True)
+        with patch("genimg.core.prompt._session.post") as post:
+            with pytest.raises(ValidationError):
+                optimize_prompts_batch(["a red car", ""], config=config)
+        post.assert_not_called()
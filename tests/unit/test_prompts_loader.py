@@ -1,11 +1,12 @@
 """Unit tests for prompts_loader (YAML-loaded prompt templates)."""
 
-from unittest.mock import mock_open, patch
+from unittest.mock import patch
 
 import pytest
 import yaml
 
 from genimg.core.prompts_loader import (
+    _YamlLoader,
     _load_prompts,
     get_character_turnaround_prompt,
     get_optimization_template,
@@ -15,6 +16,13 @@ from genimg.core.prompts_loader import (
 )
 from genimg.utils.exceptions import ConfigurationError
 
+_VALID_PROMPTS_YAML = yaml.dump(
+    {
+        "optimization": {"template": "Improve: {reference_image_instruction}"},
+        "character": {"template": "turnaround sheet"},
+    }
+)
+
 
 @pytest.mark.unit
 class TestPromptsLoader:
@@ -80,7 +88,7 @@ class TestYAMLValidation:
         """Clear the module-level cache before each test."""
         import genimg.core.prompts_loader
 
-        genimg.core.prompts_loader._prompts_data = None
+        genimg.core.prompts_loader._PROMPTS_CACHE.clear()
 
     def test_valid_yaml_loads_successfully(self):
         """Valid YAML with required structure should load without errors."""
@@ -92,88 +100,95 @@ class TestYAMLValidation:
         assert "template" in data["character"]
         assert "turnaround" in data["character"]["template"].lower()
 
-    def test_malformed_yaml_raises_configuration_error(self):
+    def test_malformed_yaml_raises_configuration_error(self, tmp_path):
         """Malformed YAML should raise ConfigurationError with helpful message."""
-        import genimg.core.prompts_loader
-
-        genimg.core.prompts_loader._prompts_data = None
-
-        invalid_yaml = "optimization:\n  template: |\n    foo\n  bar:\nbad indentation"
-
-        with patch("importlib.resources.files") as mock_files:
-            mock_file = mock_open(read_data=invalid_yaml)
-            mock_files.return_value.joinpath.return_value.open.return_value = mock_file()
+        path = tmp_path / "prompts.yaml"
+        path.write_text("optimization:\n  template: |\n    foo\n  bar:\nbad indentation")
 
-            with pytest.raises(ConfigurationError) as exc_info:
-                _load_prompts()
+        with pytest.raises(ConfigurationError) as exc_info:
+            _load_prompts(path)
 
-            assert "Failed to parse prompts.yaml" in str(exc_info.value)
+        assert "Failed to parse prompts.yaml" in str(exc_info.value)
 
-    def test_empty_yaml_raises_configuration_error(self):
+    def test_empty_yaml_raises_configuration_error(self, tmp_path):
         """Empty YAML file should raise ConfigurationError."""
-        import genimg.core.prompts_loader
-
-        genimg.core.prompts_loader._prompts_data = None
-
-        with patch("importlib.resources.files") as mock_files:
-            mock_file = mock_open(read_data="")
-            mock_files.return_value.joinpath.return_value.open.return_value = mock_file()
+        path = tmp_path / "prompts.yaml"
+        path.write_text("")
 
-            with pytest.raises(ConfigurationError) as exc_info:
-                _load_prompts()
+        with pytest.raises(ConfigurationError) as exc_info:
+            _load_prompts(path)
 
-            assert "empty" in str(exc_info.value).lower()
+        assert "empty" in str(exc_info.value).lower()
 
-    def test_missing_required_keys_raises_configuration_error(self):
+    def test_missing_required_keys_raises_configuration_error(self, tmp_path):
         """YAML without required 'optimization.template' should raise ConfigurationError."""
-        import genimg.core.prompts_loader
-
-        genimg.core.prompts_loader._prompts_data = None
-
         # Valid YAML but missing required structure
-        invalid_structure = yaml.dump({"some_other_key": "value"})
+        path = tmp_path / "prompts.yaml"
+        path.write_text(yaml.dump({"some_other_key": "value"}))
 
-        with patch("importlib.resources.files") as mock_files:
-            mock_file = mock_open(read_data=invalid_structure)
-            mock_files.return_value.joinpath.return_value.open.return_value = mock_file()
-
-            with pytest.raises(ConfigurationError) as exc_info:
-                _load_prompts()
+        with pytest.raises(ConfigurationError) as exc_info:
+            _load_prompts(path)
 
-            error_msg = str(exc_info.value)
-            assert "Invalid prompts.yaml structure" in error_msg
-            assert "optimization" in error_msg
-            assert "character" in error_msg
+        error_msg = str(exc_info.value)
+        assert "Invalid prompts.yaml structure" in error_msg
+        assert "optimization" in error_msg
+        assert "character" in error_msg
 
-    def test_file_not_found_raises_configuration_error(self):
+    def test_file_not_found_raises_configuration_error(self, tmp_path):
         """Missing prompts.yaml file should raise ConfigurationError."""
-        import genimg.core.prompts_loader
-
-        genimg.core.prompts_loader._prompts_data = None
-
+        with pytest.raises(ConfigurationError) as exc_info:
+            _load_prompts(tmp_path / "missing.yaml")
+
+        assert "prompts.yaml not found" in str(exc_info.value)
+
+    def test_caching_prevents_revalidation(self, tmp_path):
+        """Second call to _load_prompts should use cache without reparsing."""
+        path = tmp_path / "prompts.yaml"
+        path.write_text(_VALID_PROMPTS_YAML)
+
+        with patch("genimg.core.prompts_loader.yaml.load", wraps=yaml.load) as load:
+            data1 = _load_prompts(path)
+            data2 = _load_prompts(path)
+
+        assert data2 is data1
+        assert load.call_count == 1
+        assert load.call_args.kwargs["Loader"] is _YamlLoader
+
+    def test_changed_file_is_reparsed(self, tmp_path):
+        """A change in size or mtime invalidates the cached entry."""
+        path = tmp_path / "prompts.yaml"
+        path.write_text(_VALID_PROMPTS_YAML)
+        assert "extra" not in _load_prompts(path)
+
+        path.write_text(_VALID_PROMPTS_YAML + "extra: added\n")
+        assert _load_prompts(path)["extra"] == "added"
+
+    def test_cache_evicts_least_recently_used(self, tmp_path):
+        import genimg.core.prompts_loader as loader
+
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.yaml"
+            path.write_text(_VALID_PROMPTS_YAML)
+            paths.append(path)
+
+        with patch.object(loader, "_PROMPTS_CACHE_MAX", 2):
+            _load_prompts(paths[0])
+            _load_prompts(paths[1])
+            _load_prompts(paths[0])  # refresh a; b is now least recently used
+            _load_prompts(paths[2])
+
+        assert str(paths[0]) in loader._PROMPTS_CACHE
+        assert str(paths[1]) not in loader._PROMPTS_CACHE
+        assert str(paths[2]) in loader._PROMPTS_CACHE
+
+    def test_prompts_file_path_is_resolved_once(self):
+        """The package resource lookup runs once; later loads reuse the resolved path."""
+        import genimg.core.prompts_loader as loader
+
+        path = loader._prompts_file()
+        assert path.name == "prompts.yaml"
         with patch("importlib.resources.files") as mock_files:
-            mock_files.return_value.joinpath.return_value.open.side_effect = FileNotFoundError
-
-            with pytest.raises(ConfigurationError) as exc_info:
-                _load_prompts()
-
-            assert "prompts.yaml not found" in str(exc_info.value)
-
-    def test_caching_prevents_revalidation(self):
-        """Second call to _load_prompts should use cache without revalidation."""
-        import genimg.core.prompts_loader
-
-        # First load
-        _load_prompts()
-        assert genimg.core.prompts_loader._prompts_data is not None
-
-        # Modify the cache
-        original_cache = genimg.core.prompts_loader._prompts_data
-        genimg.core.prompts_loader._prompts_data = {"test": "cached"}
-
-        # Second load should return cached value
-        data2 = _load_prompts()
-        assert data2 == {"test": "cached"}
-
-        # Restore for other tests
-        genimg.core.prompts_loader._prompts_data = original_cache
+            assert loader._prompts_file() == path
+            assert "optimization" in _load_prompts()
+        mock_files.assert_not_called()
@@ -2,13 +2,14 @@
 
 import base64
 import io
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 from PIL import Image
 
 from genimg.core.config import Config
-from genimg.core.providers.ollama import OllamaProvider
+from genimg.core.providers.ollama import OllamaProvider, _format_from_content_type
 from genimg.utils.exceptions import APIError, ValidationError
 
 # Minimal valid image bytes for PIL
@@ -17,6 +18,25 @@ Image.new("RGB", (1, 1), color=(0, 0, 0)).save(_MINIMAL_PNG_BUF, format="PNG")
 MINIMAL_PNG = _MINIMAL_PNG_BUF.getvalue()
 
 
+@pytest.mark.unit
+class TestFormatFromContentType:
+    @pytest.mark.parametrize(
+        ("content_type", "expected"),
+        [
+            ("image/jpeg", "jpeg"),
+            ("image/jpg", "jpeg"),
+            ("image/PNG; charset=utf-8", "png"),
+            ("  Image/webp", "webp"),
+            ("image/svg+xml", "svg+xml"),
+            ("image/;q=1", "png"),
+            ("application/json", "png"),
+            ("", "png"),
+        ],
+    )
+    def test_subtype_or_png_default(self, content_type, expected):
+        assert _format_from_content_type(content_type) == expected
+
+
 @pytest.mark.unit
 class TestOllamaProvider:
     def test_supports_reference_image_false(self):
@@ -49,10 +69,10 @@ class TestOllamaProvider:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.headers.get.return_value = "application/json"
-        mock_response.json.return_value = {"image": b64}
+        mock_response.content = json.dumps({"image": b64}).encode()
         mock_response.text = ""
         provider = OllamaProvider()
-        with patch("genimg.core.providers.ollama.requests.post", return_value=mock_response) as m:
+        with patch("genimg.core.providers.ollama._session.post", return_value=mock_response) as m:
             result = provider.generate(
                 "a cat",
                 model="x/z-image-turbo",
@@ -69,6 +89,14 @@ class TestOllamaProvider:
         # Ollama image gen always sends think: false for speed
         assert m.call_args.kwargs["json"]["think"] is False
 
+    def test_generate_url_strips_whitespace_and_trailing_slash(self):
+        from genimg.core.providers.ollama import _resolve_generate_url
+
+        assert (
+            _resolve_generate_url(" http://gpu-box:11434/ ") == "http://gpu-box:11434/api/generate"
+        )
+        assert _resolve_generate_url("") == "http://127.0.0.1:11434/api/generate"
+
     def test_generate_success_json_with_response_key(self):
         """Some Ollama image models return base64 in 'response'."""
         config = Config(
@@ -79,10 +107,10 @@ class TestOllamaProvider:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.headers.get.return_value = "application/json"
-        mock_response.json.return_value = {"response": b64}
+        mock_response.content = json.dumps({"response": b64}).encode()
         mock_response.text = ""
         provider = OllamaProvider()
-        with patch("genimg.core.providers.ollama.requests.post", return_value=mock_response):
+        with patch("genimg.core.providers.ollama._session.post", return_value=mock_response):
             result = provider.generate(
                 "a dog",
                 model="flux",
@@ -93,6 +121,8 @@ class TestOllamaProvider:
             )
         assert result.image is not None
         assert result.prompt_used == "a dog"
+        assert result.image.format == "PNG"
+        assert result.image.size == (1, 1)
 
     def test_generate_success_binary_image_response(self):
         config = Config(
@@ -101,11 +131,12 @@ class TestOllamaProvider:
         )
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.headers.get.return_value = "image/png"
-        mock_response.content = MINIMAL_PNG
+        mock_response.headers = {"content-type": "image/png", "content-length": "8"}
+        # Body arrives in chunks larger than the Content-Length hint; buffer must grow.
+        mock_response.iter_content.return_value = [MINIMAL_PNG[:5], MINIMAL_PNG[5:]]
         mock_response.text = ""
         provider = OllamaProvider()
-        with patch("genimg.core.providers.ollama.requests.post", return_value=mock_response):
+        with patch("genimg.core.providers.ollama._session.post", return_value=mock_response):
             result = provider.generate(
                 "bird",
                 model="x/flux2-klein",
@@ -116,6 +147,77 @@ class TestOllamaProvider:
             )
         assert result.image is not None
         assert result.format == "png"
+        # Decoded in place (no .copy()), so PIL keeps the source format
+        assert result.image.format == "PNG"
+        # Body is kept, so image_data needs no re-encode
+        assert result.image_data == MINIMAL_PNG
+        assert type(result.image_data) is bytes
+        mock_response.close.assert_called_once()
+
+    def test_read_body_trims_preallocated_buffer(self):
+        """A Content-Length larger than the streamed body is trimmed, not zero-padded."""
+        from genimg.core.providers.ollama import _read_body
+
+        mock_response = MagicMock()
+        mock_response.headers = {"content-length": str(len(MINIMAL_PNG) + 100)}
+        mock_response.iter_content.return_value = [MINIMAL_PNG]
+        assert bytes(_read_body(mock_response)) == MINIMAL_PNG
+
+    def test_read_body_stops_when_aborted(self):
+        """A set abort event stops streaming before the next chunk is consumed."""
+        import threading
+
+        from genimg.core.providers.ollama import _read_body
+        from genimg.utils.exceptions import CancellationError
+
+        abort = threading.Event()
+        consumed: list[bytes] = []
+
+        def chunks():
+            for part in (b"a", b"b", b"c"):
+                consumed.append(part)
+                abort.set()
+                yield part
+
+        mock_response = MagicMock()
+        mock_response.headers = {}
+        mock_response.iter_content.return_value = chunks()
+        with pytest.raises(CancellationError):
+            _read_body(mock_response, abort)
+        assert consumed == [b"a"]
+
+    def test_generate_cancel_check_raises_and_sets_abort(self):
+        """Cancelling while the request is in flight raises and closes out the worker."""
+        import threading
+
+        from genimg.utils.exceptions import CancellationError
+
+        config = Config(
+            ollama_base_url="http://127.0.0.1:11434",
+            default_image_provider="ollama",
+        )
+        release = threading.Event()
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {"content-type": "image/png"}
+        mock_response.iter_content.return_value = [MINIMAL_PNG]
+
+        def blocking_post(*args, **kwargs):
+            release.wait(5)
+            return mock_response
+
+        provider = OllamaProvider()
+        with patch("genimg.core.providers.ollama._session.post", side_effect=blocking_post):
+            with pytest.raises(CancellationError):
+                provider.generate(
+                    "x",
+                    model="flux",
+                    reference_images_b64=None,
+                    timeout=60,
+                    config=config,
+                    cancel_check=lambda: True,
+                )
+            release.set()
 
     def test_generate_http_500_raises_api_error(self):
         config = Config(
@@ -126,7 +228,7 @@ class TestOllamaProvider:
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
         provider = OllamaProvider()
-        with patch("genimg.core.providers.ollama.requests.post", return_value=mock_response):
+        with patch("genimg.core.providers.ollama._session.post", return_value=mock_response):
             with pytest.raises(APIError) as exc_info:
                 provider.generate(
                     "x",
@@ -146,10 +248,10 @@ class TestOllamaProvider:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.headers.get.return_value = "application/json"
-        mock_response.json.return_value = {"done": True}
+        mock_response.content = json.dumps({"done": True}).encode()
         mock_response.text = "{}"
         provider = OllamaProvider()
-        with patch("genimg.core.providers.ollama.requests.post", return_value=mock_response):
+        with patch("genimg.core.providers.ollama._session.post", return_value=mock_response):
             with pytest.raises(APIError) as exc_info:
                 provider.generate(
                     "x",
@@ -161,6 +263,29 @@ class TestOllamaProvider:
                 )
         assert "No image" in str(exc_info.value)
 
+    def test_generate_invalid_base64_raises_api_error(self):
+        config = Config(
+            ollama_base_url="http://127.0.0.1:11434",
+            default_image_provider="ollama",
+        )
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers.get.return_value = "application/json"
+        mock_response.content = json.dumps({"image": "not*base64"}).encode()
+        mock_response.text = ""
+        provider = OllamaProvider()
+        with patch("genimg.core.providers.ollama._session.post", return_value=mock_response):
+            with pytest.raises(APIError) as exc_info:
+                provider.generate(
+                    "x",
+                    model="flux",
+                    reference_images_b64=None,
+                    timeout=60,
+                    config=config,
+                    cancel_check=None,
+                )
+        assert "Invalid base64" in str(exc_info.value)
+
     def test_generate_nonempty_reference_list_raises(self):
         """Protocol conformance: non-empty refs are invalid for Ollama."""
         config = Config(
@@ -178,3 +303,16 @@ class TestOllamaProvider:
                 cancel_check=None,
             )
         assert exc_info.value.field == "reference_image"
+
+
+@pytest.mark.unit
+class TestParseResponseJSON:
+    def test_malformed_json_raises_api_error(self):
+        provider = OllamaProvider()
+        mock_response = MagicMock()
+        mock_response.headers.get.return_value = "application/json"
+        mock_response.content = b"{not json"
+        mock_response.text = "{not json"
+        with pytest.raises(APIError) as exc_info:
+            provider._parse_response(mock_response, "m", "p", 0.1)
+        assert "parse Ollama response as JSON" in str(exc_info.value)
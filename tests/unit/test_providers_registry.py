@@ -1,5 +1,7 @@
 """Unit tests for the provider registry and built-in registration."""
 
+from unittest.mock import MagicMock
+
 import pytest
 
 from genimg.core.providers import (
@@ -7,6 +9,7 @@ from genimg.core.providers import (
     PROVIDER_DRAW_THINGS,
     PROVIDER_OLLAMA,
     PROVIDER_OPENROUTER,
+    ProviderRegistry,
     get_registry,
 )
 
@@ -47,3 +50,27 @@ class TestProviderRegistry:
         assert PROVIDER_OPENROUTER in KNOWN_IMAGE_PROVIDERS
         assert PROVIDER_OLLAMA in KNOWN_IMAGE_PROVIDERS
         assert PROVIDER_DRAW_THINGS in KNOWN_IMAGE_PROVIDERS
+
+
+@pytest.mark.unit
+class TestProviderFactories:
+    def test_factory_called_once_on_first_get(self):
+        reg = ProviderRegistry()
+        impl = MagicMock()
+        factory = MagicMock(return_value=impl)
+        reg.register_factory("lazy", factory)
+        assert reg.provider_ids() == ["lazy"]
+        factory.assert_not_called()
+        assert reg.get("lazy") is impl
+        assert reg.get("lazy") is impl
+        factory.assert_called_once_with()
+
+    def test_register_replaces_pending_factory(self):
+        reg = ProviderRegistry()
+        factory = MagicMock()
+        impl = MagicMock()
+        reg.register_factory("p", factory)
+        reg.register("p", impl)
+        assert reg.get("p") is impl
+        assert reg.provider_ids() == ["p"]
+        factory.assert_not_called()
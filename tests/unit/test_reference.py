@@ -2,9 +2,11 @@
 
 import base64
 import io
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
-from PIL import Image
+from PIL import Image, ImageChops
 
 from genimg.core.config import Config
 from genimg.core.reference import (
@@ -18,6 +20,7 @@ from genimg.core.reference import (
     load_image,
     merge_jpeg_base64_references_horizontally,
     process_reference_image,
+    process_reference_images,
     resize_image,
     validate_image_format,
 )
@@ -80,6 +83,14 @@ class TestInferFormatFromMagic:
         data = WEBP_MAGIC + b"\x00" * 20
         assert _infer_format_from_magic(data) == "WEBP"
 
+    @pytest.mark.parametrize("brand", [b"heic", b"heix", b"mif1"])
+    def test_heic_brands(self, brand):
+        data = b"\x00\x00\x00\x18ftyp" + brand + b"\x00" * 12
+        assert _infer_format_from_magic(data) == "HEIC"
+
+    def test_riff_without_webp_returns_none(self):
+        assert _infer_format_from_magic(b"RIFF\x00\x00\x00\x00WAVEfmt ") is None
+
     def test_short_data_returns_none(self):
         assert _infer_format_from_magic(b"\x89") is None
         assert _infer_format_from_magic(b"") is None
@@ -139,6 +150,43 @@ class TestLoadImageSource:
         assert "Unsupported" in str(exc_info.value) or "format" in str(exc_info.value).lower()
 
 
+@pytest.mark.unit
+class TestExifOrientation:
+    """Images tagged with an EXIF Orientation are loaded upright."""
+
+    @staticmethod
+    def _rotated_jpeg(mode: str = "L") -> bytes:
+        exif = Image.Exif()
+        exif[0x0112] = 6  # stored rotated: display needs a 90 degree clockwise turn
+        buf = io.BytesIO()
+        Image.new(mode, (40, 20)).save(buf, format="JPEG", exif=exif.tobytes())
+        return buf.getvalue()
+
+    def test_bytes_source_transposed(self):
+        image, _ = _load_image_source(self._rotated_jpeg(), "JPEG")
+        assert image.size == (20, 40)
+
+    def test_path_source_transposed(self, tmp_path):
+        path = tmp_path / "gray.jpg"
+        path.write_bytes(self._rotated_jpeg())
+        assert load_image(str(path)).size == (20, 40)
+
+    def test_untagged_image_not_copied(self, tmp_path):
+        path = tmp_path / "plain.png"
+        Image.new("RGB", (40, 20)).save(path)
+        with patch("genimg.core.reference.ImageOps.exif_transpose") as transpose:
+            assert load_image(str(path)).size == (40, 20)
+        transpose.assert_not_called()
+
+    def test_processed_reference_is_upright(self, tmp_path):
+        path = tmp_path / "cmyk.jpg"
+        path.write_bytes(self._rotated_jpeg("CMYK"))
+        config = Config(openrouter_api_key="", min_image_pixels=1, aspect_ratio=(1, 2))
+        encoded, _ = process_reference_image(path, config=config)
+        with Image.open(io.BytesIO(base64.b64decode(encoded))) as out:
+            assert out.size == (20, 40)
+
+
 @pytest.mark.unit
 class TestCreateImageDataUrl:
     def test_returns_data_url(self):
@@ -164,6 +212,58 @@ class TestResizeImage:
         assert out.size != (2000, 2000)
         assert out.size[0] * out.size[1] <= 100
 
+    @pytest.mark.parametrize(
+        ("side", "max_pixels", "expected_filter"),
+        [
+            (1000, 640_000, Image.Resampling.BILINEAR),  # 1000 -> 800 per side
+            (1000, 10_000, Image.Resampling.BILINEAR),  # thumbnail-sized output
+            (2000, 200_000, Image.Resampling.BICUBIC),  # 2000 -> 447 per side
+            (4000, 640_000, Image.Resampling.LANCZOS),  # 4000 -> 800 per side
+        ],
+    )
+    def test_auto_resample_filter_depends_on_scale_and_size(
+        self, side, max_pixels, expected_filter
+    ):
+        img = Image.new("RGB", (side, side))
+        with patch.object(Image.Image, "resize", autospec=True, return_value=img) as resize:
+            resize_image(
+                img, max_pixels=max_pixels, min_pixels=1, aspect_ratio=(1, 1), resample="auto"
+            )
+        assert resize.call_args.args[2] == expected_filter
+
+    def test_explicit_config_used_without_global_lookup(self):
+        config = Config(
+            openrouter_api_key="", min_image_pixels=1, max_image_pixels=100, aspect_ratio=(2, 1)
+        )
+        with patch("genimg.core.reference.get_config", side_effect=AssertionError):
+            out = resize_image(Image.new("RGB", (100, 100)), config=config)
+        assert out.size == (20, 10)
+
+    def test_matching_aspect_ratio_skips_padding(self):
+        img = Image.new("RGB", (160, 90))
+        with patch("genimg.core.reference._pad_to_aspect") as pad:
+            out = resize_image(img, max_pixels=1_000_000, min_pixels=1, aspect_ratio=(16, 9))
+        pad.assert_not_called()
+        assert out is img
+
+    def test_explicit_resample_filter_is_used(self):
+        img = Image.new("RGB", (1000, 1000))
+        with patch.object(Image.Image, "resize", autospec=True, return_value=img) as resize:
+            resize_image(
+                img, max_pixels=10_000, min_pixels=1, aspect_ratio=(1, 1), resample="lanczos"
+            )
+        assert resize.call_args.args[2] == Image.Resampling.LANCZOS
+
+    def test_unknown_resample_filter_raises(self):
+        with pytest.raises(ValidationError):
+            resize_image(
+                Image.new("RGB", (100, 100)),
+                max_pixels=100,
+                min_pixels=1,
+                aspect_ratio=(1, 1),
+                resample="nearest",
+            )
+
     def test_raises_when_below_min_pixels(self):
         img = Image.new("RGB", (10, 10))  # 100 pixels
         with pytest.raises(ValidationError) as exc_info:
@@ -214,6 +314,47 @@ class TestConvertToRgb:
         out = convert_to_rgb(img)
         assert out.mode == "RGB"
 
+    @pytest.mark.parametrize("mode", ["RGBA", "LA"])
+    def test_alpha_composite_matches_paste_on_white(self, mode):
+        from genimg.core.reference import convert_to_rgb
+
+        gradient = Image.linear_gradient("L").resize((64, 64))
+        img = Image.merge(
+            mode, [gradient.rotate(90)] * (len(mode) - 1) + [gradient]
+        )  # varying color and alpha
+        expected = Image.new("RGB", img.size, (255, 255, 255))
+        expected.paste(img.convert("RGBA"), mask=img.getchannel("A"))
+        out = convert_to_rgb(img)
+        assert out.mode == "RGB"
+        assert out.size == img.size
+        diff = ImageChops.difference(out, expected).getextrema()
+        assert max(high for _low, high in diff) <= 1
+
+    @pytest.mark.parametrize(("mode", "color"), [("RGBA", (10, 20, 30, 255)), ("LA", (40, 255))])
+    def test_opaque_alpha_skips_composite(self, mode, color):
+        from genimg.core.reference import convert_to_rgb
+
+        img = Image.new(mode, (4, 3), color)
+        with patch("genimg.core.reference._composite_on_white") as composite:
+            out = convert_to_rgb(img)
+        composite.assert_not_called()
+        assert out.mode == "RGB"
+        assert out.getpixel((0, 0)) == img.convert("RGB").getpixel((0, 0))
+
+    def test_alpha_composite_exact_for_every_color_alpha_pair(self):
+        from genimg.core.reference import convert_to_rgb
+
+        # 256x256: x is the color value, y is alpha; every combination in one image.
+        color = Image.linear_gradient("L").rotate(90).transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+        alpha = Image.linear_gradient("L")
+        out = convert_to_rgb(Image.merge("RGBA", [color, color, color, alpha]))
+        for y in range(0, 256, 15):
+            a = alpha.getpixel((0, y))
+            for x in range(0, 256, 15):
+                c = color.getpixel((x, y))
+                expected = (c * a + 255 * (255 - a) + 127) // 255
+                assert out.getpixel((x, y)) == (expected,) * 3
+
 
 @pytest.mark.unit
 class TestEncodeImageBase64:
@@ -223,6 +364,33 @@ class TestEncodeImageBase64:
         assert isinstance(enc, str)
         assert len(enc) > 0
 
+    def test_jpeg_uses_single_pass_baseline_params(self):
+        img = Image.new("RGB", (16, 16), color=(200, 10, 10))
+        with patch.object(Image.Image, "save", autospec=True) as save:
+            encode_image_base64(img, format="JPEG")
+        kwargs = save.call_args.kwargs
+        assert kwargs["format"] == "JPEG"
+        assert kwargs["quality"] == 85
+        assert kwargs["optimize"] is False
+        assert kwargs["progressive"] is False
+        raw = base64.b64decode(encode_image_base64(img, format="JPEG"))
+        assert raw[:2] == b"\xff\xd8"
+
+    def test_streamed_jpeg_matches_buffered_encoding(self):
+        # Noise compresses poorly, so the encoder writes several chunks of odd lengths.
+        img = Image.effect_noise((600, 400), 64).convert("RGB")
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=85, optimize=False, progressive=False, subsampling=2)
+        expected = base64.b64encode(buf.getvalue()).decode("ascii")
+        assert len(buf.getvalue()) > 65536
+        assert encode_image_base64(img, format="JPEG") == expected
+
+    def test_round_trips_to_png_bytes(self):
+        img = Image.new("RGB", (2, 2), color=(10, 20, 30))
+        raw = base64.b64decode(encode_image_base64(img, format="PNG"), validate=True)
+        assert raw[:8] == b"\x89PNG\r\n\x1a\n"
+        assert Image.open(io.BytesIO(raw)).getpixel((0, 0)) == (10, 20, 30)
+
 
 @pytest.mark.unit
 class TestValidateImageFormat:
@@ -246,6 +414,21 @@ class TestLoadImage:
         with pytest.raises((ImageProcessingError, OSError, FileNotFoundError)):
             load_image("/nonexistent.png")
 
+    def test_heif_opener_registered_once_on_first_load(self, tmp_path):
+        pytest.importorskip("pillow_heif")
+        from genimg.core.reference import _ensure_heif_opener
+
+        path = tmp_path / "x.png"
+        path.write_bytes(_minimal_png_bytes())
+        _ensure_heif_opener.cache_clear()
+        with patch("pillow_heif.register_heif_opener") as register:
+            load_image(str(path))
+            load_image(str(path))
+        register.assert_called_once_with()
+        _ensure_heif_opener.cache_clear()
+        assert _ensure_heif_opener() is True
+        assert "HEIF" in Image.OPEN
+
 
 @pytest.mark.unit
 class TestGetImageHash:
@@ -259,6 +442,19 @@ class TestGetImageHash:
         h = get_image_hash(str(f))
         assert len(h) == 64
         assert all(c in "0123456789abcdef" for c in h)
+        assert h == __import__("hashlib").sha256(b"content").hexdigest()
+
+    def test_chunked_fallback_matches_file_digest(self, tmp_path):
+        data = bytes(range(256)) * 41
+        f = tmp_path / "x.bin"
+        f.write_bytes(data)
+        with (
+            patch("genimg.core.reference.sys") as fake_sys,
+            patch("genimg.core.reference._HASH_CHUNK_SIZE", 1000),
+        ):
+            fake_sys.version_info = (3, 10)
+            h = get_image_hash(str(f))
+        assert h == __import__("hashlib").sha256(data).hexdigest()
 
 
 @pytest.mark.unit
@@ -277,10 +473,25 @@ class TestProcessReferenceImage:
         encoded, _ = process_reference_image(png, format_hint="PNG", config=config)
         assert isinstance(encoded, str)
 
+    def test_uses_passed_config_aspect_ratio(self):
+        config = Config(openrouter_api_key="", min_image_pixels=1, aspect_ratio=(3, 1))
+        with patch("genimg.core.reference.get_config", side_effect=AssertionError):
+            encoded, _ = process_reference_image(
+                _minimal_png_bytes(), format_hint="PNG", config=config
+            )
+        assert Image.open(io.BytesIO(base64.b64decode(encoded))).size == (3, 1)
+
     def test_from_path_requires_existing_file(self):
         with pytest.raises(FileNotFoundError):
             process_reference_image("/nonexistent.png")
 
+    def test_from_path_unreadable_raises_image_processing_error(self, tmp_path):
+        path = tmp_path / "ref.png"
+        path.mkdir()
+        with pytest.raises(ImageProcessingError, match="Failed to read image") as exc_info:
+            process_reference_image(path, config=Config(openrouter_api_key=""))
+        assert exc_info.value.image_path == str(path)
+
     def test_from_path_success_returns_encoded_and_hash(self, tmp_path):
         """Process from real file path to cover load_image, get_image_hash path."""
         png = _minimal_png_bytes()
@@ -292,6 +503,48 @@ class TestProcessReferenceImage:
         assert len(ref_hash) == 64
         assert ref_hash == get_image_hash(str(path))
 
+    def test_from_path_hashes_and_decodes_one_read(self, tmp_path):
+        png = _minimal_png_bytes()
+        path = tmp_path / "once.png"
+        path.write_bytes(png)
+        config = Config(openrouter_api_key="", min_image_pixels=1)
+        with (
+            patch("genimg.core.reference.get_image_hash", side_effect=AssertionError),
+            patch("genimg.core.reference.load_image", side_effect=AssertionError),
+        ):
+            _, ref_hash = process_reference_image(path, max_pixels=123_457, config=config)
+        assert ref_hash == __import__("hashlib").sha256(png).hexdigest()
+
+    def test_from_path_stats_file_once(self, tmp_path):
+        path = tmp_path / "stat.png"
+        path.write_bytes(_minimal_png_bytes())
+        config = Config(openrouter_api_key="", min_image_pixels=1)
+        with patch.object(Path, "exists", side_effect=AssertionError):
+            process_reference_image(path, max_pixels=123_459, config=config)
+
+    def test_from_path_corrupt_file_raises_processing_error(self, tmp_path):
+        path = tmp_path / "broken.png"
+        path.write_bytes(b"not really a png")
+        config = Config(openrouter_api_key="", min_image_pixels=1)
+        with pytest.raises(ImageProcessingError):
+            process_reference_image(path, max_pixels=123_458, config=config)
+
+    def test_from_path_reuses_result_until_file_changes(self, tmp_path):
+        path = tmp_path / "ref.png"
+        path.write_bytes(_minimal_png_bytes())
+        config = Config(openrouter_api_key="", min_image_pixels=1)
+        with patch("genimg.core.reference._load_image_source", wraps=_load_image_source) as load:
+            first = process_reference_image(path, config=config)
+            assert process_reference_image(str(path), config=config) == first
+            assert load.call_count == 1
+
+            buf = io.BytesIO()
+            Image.new("RGB", (3, 2), color=(9, 9, 9)).save(buf, format="PNG")
+            path.write_bytes(buf.getvalue())
+            second = process_reference_image(path, config=config)
+        assert load.call_count == 2
+        assert second[1] != first[1]
+
     def test_from_data_url_returns_encoded_and_hash(self):
         """Process from data URL (e.g. Gradio clipboard) so image is sent to API."""
         png = _minimal_png_bytes()
@@ -303,6 +556,64 @@ class TestProcessReferenceImage:
         assert len(ref_hash) == 64
         assert ref_hash == __import__("hashlib").sha256(png).hexdigest()
 
+    def test_large_jpeg_decoded_at_reduced_scale(self, tmp_path):
+        buf = io.BytesIO()
+        Image.new("RGB", (2000, 1600), color=(40, 90, 160)).save(buf, format="JPEG")
+        path = tmp_path / "big.jpg"
+        path.write_bytes(buf.getvalue())
+        assert load_image(str(path), max_pixels=100_000).size == (1000, 800)
+        assert load_image(str(path)).size == (2000, 1600)
+
+        config = Config(openrouter_api_key="", min_image_pixels=1, max_image_pixels=100_000)
+        encoded, _ = process_reference_image(buf.getvalue(), format_hint="JPEG", config=config)
+        out = Image.open(io.BytesIO(base64.b64decode(encoded)))
+        full = resize_image(Image.open(path), max_pixels=100_000, min_pixels=1)
+        assert out.size == full.size
+
+    @pytest.mark.parametrize("size", [(3001, 2001), (2049, 17), (1537, 1023), (4000, 2999)])
+    def test_draft_never_changes_resized_dimensions(self, size, tmp_path):
+        buf = io.BytesIO()
+        Image.new("RGB", size, color=(1, 2, 3)).save(buf, format="JPEG")
+        path = tmp_path / "odd.jpg"
+        path.write_bytes(buf.getvalue())
+        drafted = load_image(str(path), max_pixels=50_000)
+        full = load_image(str(path))
+        assert drafted.size[0] <= full.size[0]
+        assert (
+            resize_image(drafted, max_pixels=50_000, min_pixels=1, aspect_ratio=size).size
+            == resize_image(full, max_pixels=50_000, min_pixels=1, aspect_ratio=size).size
+        )
+
+    def test_bytes_results_cached_by_content(self):
+        config = Config(openrouter_api_key="", min_image_pixels=1, max_image_pixels=654_321)
+        png = _minimal_png_bytes()
+        first = process_reference_image(png, format_hint="PNG", config=config)
+        with patch("genimg.core.reference._load_image_source", side_effect=AssertionError):
+            assert process_reference_image(bytes(png), format_hint="PNG", config=config) == first
+            data_url = "data:image/png;base64," + base64.b64encode(png).decode()
+            assert process_reference_image(data_url, config=config) == first
+
+    def test_bytes_cache_keyed_by_settings(self):
+        png = _minimal_png_bytes()
+        wide = Config(openrouter_api_key="", min_image_pixels=1, aspect_ratio=(5, 1))
+        tall = Config(openrouter_api_key="", min_image_pixels=1, aspect_ratio=(1, 5))
+        enc_wide, _ = process_reference_image(png, format_hint="PNG", config=wide)
+        enc_tall, _ = process_reference_image(png, format_hint="PNG", config=tall)
+        assert Image.open(io.BytesIO(base64.b64decode(enc_wide))).size == (5, 1)
+        assert Image.open(io.BytesIO(base64.b64decode(enc_tall))).size == (1, 5)
+
+    def test_from_pil_image_skips_decode(self):
+        config = Config(openrouter_api_key="", min_image_pixels=1)
+        img = Image.new("RGBA", (8, 4), color=(10, 20, 30, 255))
+        with patch("genimg.core.reference._load_image_source", side_effect=AssertionError):
+            encoded, ref_hash = process_reference_image(img, config=config)
+        decoded = Image.open(io.BytesIO(base64.b64decode(encoded)))
+        assert decoded.mode == "RGB"
+        assert len(ref_hash) == 64
+        assert process_reference_image(img.copy(), config=config)[1] == ref_hash
+        other = Image.new("RGBA", (4, 8), color=(10, 20, 30, 255))
+        assert process_reference_image(other, config=config)[1] != ref_hash
+
     def test_raises_when_image_below_min_image_pixels(self):
         """Process rejects image with fewer pixels than config.min_image_pixels."""
         png = _minimal_png_bytes()  # 1x1
@@ -314,6 +625,56 @@ class TestProcessReferenceImage:
         assert exc_info.value.field == "image"
 
 
+@pytest.mark.unit
+class TestProcessReferenceImages:
+    def test_results_in_input_order(self, tmp_path):
+        config = Config(openrouter_api_key="", min_image_pixels=1)
+        sources: list = []
+        for i, color in enumerate([(255, 0, 0), (0, 255, 0), (0, 0, 255)]):
+            buf = io.BytesIO()
+            Image.new("RGB", (4, 4), color=color).save(buf, format="PNG")
+            path = tmp_path / f"ref{i}.png"
+            path.write_bytes(buf.getvalue())
+            sources.append(path)
+        sources.append(_minimal_png_bytes())
+        results = process_reference_images(sources, config=config, max_workers=2)
+        expected = [process_reference_image(s, config=config) for s in sources]
+        assert results == expected
+
+    def test_empty_returns_empty(self):
+        assert process_reference_images([], config=Config(openrouter_api_key="")) == []
+
+    def test_error_propagates(self):
+        config = Config(openrouter_api_key="", min_image_pixels=1)
+        with pytest.raises(FileNotFoundError):
+            process_reference_images([_minimal_png_bytes(), "/nonexistent.png"], config=config)
+
+    def test_first_error_does_not_wait_for_in_flight_images(self):
+        import threading
+        import time
+
+        from genimg.core import reference as reference_module
+
+        release = threading.Event()
+        real = reference_module.process_reference_image
+
+        def process(source, **kwargs):
+            if source == "slow":
+                release.wait(5)
+                return ("late", "hash")
+            return real(source, **kwargs)
+
+        config = Config(openrouter_api_key="", min_image_pixels=1)
+        start = time.monotonic()
+        try:
+            with patch("genimg.core.reference.process_reference_image", side_effect=process):
+                with pytest.raises(FileNotFoundError):
+                    process_reference_images(["/nonexistent.png", "slow"], config=config)
+            assert time.monotonic() - start < 4
+        finally:
+            release.set()
+
+
 @pytest.mark.unit
 class TestMergeJpegBase64ReferencesHorizontally:
     def test_two_images_wider_strip(self):